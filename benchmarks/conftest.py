@@ -0,0 +1,97 @@
+"""Synthetic catalogs for benchmarks.
+
+By default catalogs have 1,000 and 10,000 tables. Set the DBCOOPER_BENCH_SIZES
+environment variable to change this (e.g. DBCOOPER_BENCH_SIZES=1000,10000,100000).
+"""
+
+import os
+import sqlite3
+
+import pytest
+
+from sqlalchemy import create_engine, event
+
+N_SHARDS = 4
+N_WIDE_COLUMNS = 500
+
+BENCH_SIZES = [
+    int(x) for x in os.environ.get("DBCOOPER_BENCH_SIZES", "1000,10000").split(",")
+]
+
+
+def _table_names(n_tables):
+    # spread tables evenly across shards, e.g. shard_0.table_0, shard_1.table_1, ...
+    return [(f"shard_{ii % N_SHARDS}", f"table_{ii}") for ii in range(n_tables)]
+
+
+def _wide_columns():
+    return ", ".join(f"col_{ii} INTEGER" for ii in range(N_WIDE_COLUMNS))
+
+
+def create_sqlite_catalog(path, n_tables):
+    """Create one sqlite file per shard, and return an engine that attaches them all."""
+
+    path.mkdir(parents=True, exist_ok=True)
+    by_shard = {}
+    for schema, table in _table_names(n_tables):
+        by_shard.setdefault(schema, []).append(table)
+
+    for schema, tables in by_shard.items():
+        con = sqlite3.connect(path / f"{schema}.db")
+        with con:
+            for table in tables:
+                con.execute(f"CREATE TABLE {table} (id INTEGER, name TEXT, value REAL)")
+        con.close()
+
+    con = sqlite3.connect(path / "shard_0.db")
+    with con:
+        con.execute(f"CREATE TABLE wide ({_wide_columns()})")
+    con.close()
+
+    engine = create_engine(f"sqlite:///{path / 'main.db'}")
+
+    @event.listens_for(engine, "connect")
+    def attach_shards(dbapi_con, con_record):
+        for schema in by_shard:
+            dbapi_con.execute(f"ATTACH DATABASE '{path / schema}.db' AS {schema}")
+
+    return engine
+
+
+def create_duckdb_catalog(path, n_tables):
+    import duckdb
+
+    path.mkdir(parents=True, exist_ok=True)
+    db_path = path / "catalog.duckdb"
+
+    con = duckdb.connect(str(db_path))
+    for ii in range(N_SHARDS):
+        con.execute(f"CREATE SCHEMA shard_{ii}")
+
+    con.execute("BEGIN")
+    for schema, table in _table_names(n_tables):
+        con.execute(f"CREATE TABLE {schema}.{table} (id INTEGER, name VARCHAR, value DOUBLE)")
+    con.execute(f"CREATE TABLE shard_0.wide ({_wide_columns()})")
+    con.execute("COMMIT")
+    con.close()
+
+    return create_engine(f"duckdb:///{db_path}")
+
+
+@pytest.fixture(scope="session", params=BENCH_SIZES, ids=lambda n: f"{n}_tables")
+def catalog_size(request):
+    return request.param
+
+
+@pytest.fixture(scope="session", params=["sqlite", "duckdb"])
+def catalog_engine(request, catalog_size, tmp_path_factory):
+    path = tmp_path_factory.mktemp(f"{request.param}_{catalog_size}")
+
+    if request.param == "sqlite":
+        engine = create_sqlite_catalog(path, catalog_size)
+    else:
+        engine = create_duckdb_catalog(path, catalog_size)
+
+    yield engine
+
+    engine.dispose()
@@ -0,0 +1,110 @@
+"""Benchmark building accessors over large catalogs, and using them.
+
+Run with ``make bench``. Results are saved to .benchmarks/, so that runs on
+different commits can be compared with ``pytest benchmarks --benchmark-compare``.
+"""
+
+import pytest
+
+from dbcooper import DbCooper, AccessorHierarchyBuilder, DbcSimpleTable
+from dbcooper.collect import to_siuba
+
+
+def _to_expr(engine, expr):
+    # return the sqlalchemy table, so only probing columns is measured
+    return expr
+
+
+@pytest.mark.benchmark(group="init")
+@pytest.mark.parametrize("lazy", [False, True], ids=["eager", "lazy"])
+def test_bench_init(benchmark, catalog_engine, lazy):
+    dbc = benchmark(DbCooper, catalog_engine, lazy=lazy)
+    assert dbc._accessors is not None
+
+
+@pytest.mark.benchmark(group="list")
+def test_bench_list(benchmark, catalog_engine, catalog_size):
+    dbc = DbCooper(catalog_engine, initialize=False)
+
+    res = benchmark(dbc.list)
+    assert len(res) > catalog_size
+
+
+@pytest.mark.benchmark(group="reset")
+def test_bench_reset(benchmark, catalog_engine):
+    dbc = DbCooper(catalog_engine)
+
+    benchmark(dbc.reset)
+
+
+@pytest.mark.benchmark(group="create_accessors")
+def test_bench_hierarchy_create_accessors(benchmark, catalog_engine):
+    builder = AccessorHierarchyBuilder(omit_database=catalog_engine.name != "duckdb")
+    dbc = DbCooper(catalog_engine, initialize=False)
+    table_map = dbc._map_tables()
+
+    benchmark(builder.create_accessors, catalog_engine, DbcSimpleTable, table_map, to_siuba)
+
+
+@pytest.mark.benchmark(group="probe")
+@pytest.mark.parametrize("column_cache_size", [0, 1024], ids=["uncached", "cached"])
+def test_bench_accessor_probe(benchmark, catalog_engine, column_cache_size):
+    dbc = DbCooper(
+        catalog_engine,
+        table_factory=DbcSimpleTable,
+        to_frame=_to_expr,
+        column_cache_size=column_cache_size,
+    )
+    accessor = dbc[_wide_accessor_name(dbc)]
+
+    res = benchmark(accessor)
+    assert len(res.columns) == 500
+
+
+@pytest.mark.benchmark(group="documented_repr")
+@pytest.mark.parametrize("cached", [False, True], ids=["cold", "warm"])
+def test_bench_documented_repr(benchmark, catalog_engine, cached):
+    dbc = DbCooper(catalog_engine)
+    accessor = dbc[_wide_accessor_name(dbc)]
+
+    setup = None if cached else (lambda: dbc.invalidate())
+    res = benchmark.pedantic(repr, args=(accessor,), setup=setup, rounds=10)
+    assert "col_499" in res
+
+
+def _wide_accessor_name(dbc):
+    return next(name for name in dbc._accessors if name.endswith("shard_0_wide"))
+
+
+@pytest.mark.benchmark(group="search")
+@pytest.mark.parametrize("query", ["table_123", "tabel_12"], ids=["exact", "similar"])
+def test_bench_search(benchmark, catalog_engine, query):
+    dbc = DbCooper(catalog_engine)
+    dbc.search(query)
+
+    res = benchmark(dbc.search, query)
+    assert res
+
+
+@pytest.mark.benchmark(group="search_index")
+def test_bench_search_index_update(benchmark, catalog_engine):
+    # after reset, only tables that were added or removed are re-indexed
+    dbc = DbCooper(catalog_engine)
+    dbc.search("table")
+
+    def reset_and_search():
+        dbc.reset()
+        return dbc.search("table_123")
+
+    assert benchmark(reset_and_search)
+
+
+@pytest.mark.benchmark(group="tables_with_column")
+@pytest.mark.parametrize("cached", [False, True], ids=["cold", "warm"])
+def test_bench_tables_with_column(benchmark, catalog_engine, catalog_size, cached):
+    dbc = DbCooper(catalog_engine)
+    dbc.tables_with_column("id")
+
+    setup = None if cached else (lambda: dbc.invalidate())
+    res = benchmark.pedantic(dbc.tables_with_column, args=("id",), setup=setup, rounds=5)
+    assert len(res) == catalog_size
@@ -0,0 +1,73 @@
+"""Compare collectors on a local duckdb file.
+
+Run with ``make bench`` (or ``pytest benchmarks``).
+"""
+
+import pytest
+
+from sqlalchemy import create_engine
+
+from dbcooper.cache import ResultCache
+from dbcooper.collect import name_to_tbl, to_arrow, to_polars
+
+N_ROWS = 1_000_000
+
+
+@pytest.fixture(scope="module")
+def duckdb_engine(tmp_path_factory):
+    path = tmp_path_factory.mktemp("bench_collect") / "bench.duckdb"
+    engine = create_engine(f"duckdb:///{path}")
+
+    with engine.begin() as con:
+        con.exec_driver_sql(f"""
+            CREATE TABLE facts AS
+            SELECT
+                range AS id,
+                range % 100 AS category,
+                'row_' || range::VARCHAR AS label,
+                random() AS value
+            FROM range({N_ROWS})
+        """)
+
+    yield engine
+
+    engine.dispose()
+
+
+@pytest.mark.benchmark(group="collect-duckdb")
+def test_bench_to_polars(benchmark, duckdb_engine):
+    tbl = name_to_tbl(duckdb_engine, "facts")
+
+    res = benchmark(to_polars, duckdb_engine, tbl)
+    assert res.height == N_ROWS
+
+
+@pytest.mark.benchmark(group="collect-duckdb")
+def test_bench_to_arrow(benchmark, duckdb_engine):
+    tbl = name_to_tbl(duckdb_engine, "facts")
+
+    res = benchmark(to_arrow, duckdb_engine, tbl)
+    assert res.num_rows == N_ROWS
+
+
+@pytest.mark.benchmark(group="collect-duckdb")
+def test_bench_to_arrow_then_polars(benchmark, duckdb_engine):
+    import polars as pl
+
+    tbl = name_to_tbl(duckdb_engine, "facts")
+
+    res = benchmark(lambda: pl.from_arrow(to_arrow(duckdb_engine, tbl)))
+    assert res.height == N_ROWS
+
+
+@pytest.mark.benchmark(group="collect-duckdb")
+@pytest.mark.parametrize("collect", [to_arrow, to_polars], ids=["to_arrow", "to_polars"])
+def test_bench_result_cache_hit(benchmark, duckdb_engine, tmp_path, collect):
+    tbl = name_to_tbl(duckdb_engine, "facts")
+    cache = ResultCache(tmp_path / "results", ttl=None, max_size=None)
+
+    # store the result, so every benchmark round reads it from the cache
+    collect(duckdb_engine, tbl, result_cache=cache)
+
+    res = benchmark(collect, duckdb_engine, tbl, result_cache=cache)
+    assert len(res) == N_ROWS
@@ -0,0 +1,111 @@
+"""Benchmark the memory used, and time taken, to hold large catalogs of tables.
+
+These do not need a database, so run quickly even for large catalogs, e.g. with
+DBCOOPER_BENCH_SIZES=1000000 pytest benchmarks/test_bench_memory.py.
+
+Memory use (measured with tracemalloc) is saved in each benchmark's extra_info.
+"""
+
+import gc
+import tracemalloc
+
+import pytest
+
+from sqlalchemy import create_engine
+
+from dbcooper import TableFinder, AccessorBuilder, DbcSimpleTable
+from dbcooper.base import TableName
+from dbcooper.catalog import TableCatalog
+from dbcooper.collect import to_siuba
+
+
+N_SCHEMAS = 100
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return create_engine("sqlite://")
+
+
+@pytest.fixture(scope="module")
+def table_names(catalog_size):
+    return [
+        TableName(None, f"schema_{ii % N_SCHEMAS}", f"table_{ii}") for ii in range(catalog_size)
+    ]
+
+
+@pytest.fixture(scope="module")
+def table_items(engine, table_names):
+    finder = TableFinder()
+    return [(name, finder.identify_table(engine.dialect, name)) for name in table_names]
+
+
+def _memory_used(f, *args):
+    """Return the result of calling f, and the bytes allocated that it still holds."""
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        res = f(*args)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return res, current
+
+
+@pytest.mark.benchmark(group="catalog_memory")
+@pytest.mark.parametrize("store", [dict, TableCatalog], ids=["dict", "TableCatalog"])
+def test_bench_table_map(benchmark, engine, catalog_size, store):
+    finder = TableFinder()
+
+    def create():
+        # every name and identity is newly created, as when listing tables, so
+        # that memory used by the objects each store keeps is counted.
+        names = (
+            TableName(None, f"schema_{ii % N_SCHEMAS}", f"table_{ii}")
+            for ii in range(catalog_size)
+        )
+        return store((name, finder.identify_table(engine.dialect, name)) for name in names)
+
+    res, n_bytes = _memory_used(create)
+    benchmark.extra_info["memory_mb"] = n_bytes / 1e6
+
+    res = benchmark(create)
+    assert len(res) == catalog_size
+
+
+@pytest.mark.benchmark(group="catalog_map_tables")
+def test_bench_map_tables(benchmark, engine, table_names):
+    finder = TableFinder()
+    finder._list_tables = lambda dialect, conn: table_names
+
+    with engine.connect() as conn:
+        res = benchmark(finder.map_tables, engine.dialect, conn)
+
+    assert len(res) == len(table_names)
+
+
+@pytest.mark.benchmark(group="accessors_memory")
+@pytest.mark.parametrize("lazy", [False, True], ids=["eager", "lazy"])
+def test_bench_accessors(benchmark, engine, table_items, lazy):
+    builder = AccessorBuilder()
+    table_map = TableCatalog(table_items)
+
+    def create():
+        if lazy:
+            accessors = builder.create_lazy_accessors(
+                engine, DbcSimpleTable, lambda: table_map, to_siuba
+            )
+
+            # list and format every table name (e.g. for tab completion)
+            len(accessors)
+            return accessors
+
+        return builder.create_accessors(engine, DbcSimpleTable, table_map, to_siuba)
+
+    res, n_bytes = _memory_used(create)
+    benchmark.extra_info["memory_mb"] = n_bytes / 1e6
+
+    res = benchmark(create)
+    assert len(res) == len(table_items)
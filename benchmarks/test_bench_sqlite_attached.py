@@ -0,0 +1,67 @@
+"""Benchmark listing tables across many attached sqlite databases.
+
+Tables in all attached databases are listed with one UNION ALL query. This is
+compared to listing each database with its own query (how tables used to be
+listed).
+"""
+
+import sqlite3
+
+import pytest
+
+from sqlalchemy import create_engine, event
+
+from dbcooper.base import TableName
+from dbcooper.inspect import list_tables
+
+
+N_TABLES = 20
+
+
+def _list_tables_per_schema(dialect, conn):
+    results = []
+    for schema in dialect.get_schema_names(conn):
+        qschema = dialect.identifier_preparer.quote_identifier(schema)
+        q = conn.exec_driver_sql(
+            f"SELECT name FROM {qschema}.sqlite_master WHERE type IN ('table', 'view') ORDER BY name"
+        )
+        results.extend(TableName(None, schema, row[0]) for row in q)
+
+    return results
+
+
+# sqlite allows 10 attached databases by default (and at most 125, if compiled
+# with a higher SQLITE_MAX_ATTACHED)
+@pytest.fixture(scope="module", params=[2, 10], ids=lambda n: f"{n}_attached")
+def attached_engine(request, tmp_path_factory):
+    path = tmp_path_factory.mktemp(f"attached_{request.param}")
+    schemas = [f"shard_{ii}" for ii in range(request.param)]
+
+    for schema in schemas:
+        con = sqlite3.connect(path / f"{schema}.db")
+        with con:
+            for jj in range(N_TABLES):
+                con.execute(f"CREATE TABLE table_{jj} (x INTEGER)")
+        con.close()
+
+    engine = create_engine(f"sqlite:///{path / 'main.db'}")
+
+    @event.listens_for(engine, "connect")
+    def attach_shards(dbapi_con, con_record):
+        for schema in schemas:
+            dbapi_con.execute(f"ATTACH DATABASE '{path / schema}.db' AS {schema}")
+
+    yield engine
+
+    engine.dispose()
+
+
+@pytest.mark.benchmark(group="sqlite_attached")
+@pytest.mark.parametrize(
+    "f", [list_tables, _list_tables_per_schema], ids=["union_all", "per_schema"]
+)
+def test_bench_list_tables_attached(benchmark, attached_engine, f):
+    with attached_engine.connect() as conn:
+        res = benchmark(f, attached_engine.dialect, conn)
+
+    assert len(res) >= N_TABLES * 2
@@ -1,22 +1,67 @@
-from importlib.metadata import version as _v
-
-# Set version -----------------------------------------------------------------
-
-__version__ = _v("dbcooper")
-
-del _v
+from typing import TYPE_CHECKING
 
 # Main imports ----------------------------------------------------------------
+#
+# These are loaded on first use (see __getattr__ below), so that importing
+# dbcooper does not import sqlalchemy and the other modules dbcooper needs.
 
-from .dbcooper import DbCooper    # noqa
-from .finder import TableFinder, AccessorBuilder, AccessorHierarchyBuilder
-from .tables import DbcDocumentedTable, DbcSimpleTable
+_lazy_imports = {
+    "DbCooper": ".dbcooper",
+    "FederatedDbCooper": ".federated",
+    "TableFinder": ".finder",
+    "AccessorBuilder": ".finder",
+    "AccessorHierarchyBuilder": ".finder",
+    "DbcDocumentedTable": ".tables",
+    "DbcSimpleTable": ".tables",
+    "CatalogCache": ".cache",
+    "ResultCache": ".cache",
+    "UsageTracker": ".prefetch",
+    "Tracer": ".trace",
+    "StatsTracer": ".trace",
+}
+
+if TYPE_CHECKING:
+    from .dbcooper import DbCooper    # noqa
+    from .federated import FederatedDbCooper
+    from .finder import TableFinder, AccessorBuilder, AccessorHierarchyBuilder
+    from .tables import DbcDocumentedTable, DbcSimpleTable
+    from .cache import CatalogCache, ResultCache
+    from .prefetch import UsageTracker
+    from .trace import Tracer, StatsTracer
 
 __all__ = (
     "DbCooper",
+    "FederatedDbCooper",
     "TableFinder",
     "AccessorBuilder",
     "AccessorHierarchyBuilder",
     "DbcDocumentedTable",
     "DbcSimpleTable",
-)
\ No newline at end of file
+    "CatalogCache",
+    "ResultCache",
+    "UsageTracker",
+    "Tracer",
+    "StatsTracer",
+)
+
+
+def __getattr__(name):
+    import importlib
+
+    if name == "__version__":
+        from importlib.metadata import version
+
+        value = version("dbcooper")
+    elif name in _lazy_imports:
+        module = importlib.import_module(_lazy_imports[name], __name__)
+        value = getattr(module, name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # cache the value, so __getattr__ is only called once per name
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return [*globals(), "__version__", *__all__]
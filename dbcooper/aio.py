@@ -0,0 +1,274 @@
+"""Asyncio versions of DbCooper, its table accessors, and collectors.
+
+These use a sqlalchemy AsyncEngine, so that listing tables and discovering columns
+do not block the event loop. Since attribute access can't be awaited, tables are
+listed by awaiting AsyncDbCooper.create() (or reset() on an existing instance).
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import sql
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from .collect import (
+    _as_select,
+    _describe_query_columns,
+    _pinned_connections,
+    _probe_table_columns,
+    _query_with_columns,
+)
+from .dbcooper import DbCooper
+from .finder import TableFinder, AccessorBuilder, _refresh_kwargs, _schema_finder
+from .inspect import normalize_query, sample_table
+from .reflect import SchemaReflector
+from .tables import DbcSimpleTable
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sqlalchemy.sql.expression import TextClause
+    from polars import DataFrame as PlDataFrame
+
+    from .cache import LRUCache
+
+
+# Collectors ==================================================================
+
+async def query_to_tbl(engine: AsyncEngine, query: str, cache: LRUCache | None = None) -> TextClause:
+    """Async version of collect.query_to_tbl."""
+
+    key = normalize_query(query)
+    col_names = cache.get(key) if cache is not None else None
+
+    if col_names is None:
+        async with engine.connect() as con:
+            col_names = await con.run_sync(_describe_query_columns, query)
+
+        if cache is not None:
+            cache.set(key, col_names)
+
+    return _query_with_columns(query, col_names)
+
+
+async def name_to_tbl(
+    engine: AsyncEngine,
+    table_name: str,
+    schema: str | None = None,
+    cache: LRUCache | None = None,
+) -> sql.TableClause:
+    """Async version of collect.name_to_tbl."""
+
+    key = (schema, table_name)
+    col_names = cache.get(key) if cache is not None else None
+
+    if col_names is None:
+        async with engine.connect() as con:
+            col_names = await con.run_sync(_probe_table_columns, table_name, schema)
+
+        if cache is not None:
+            cache.set(key, col_names)
+
+    columns = [sql.column(k) for k in col_names]
+    return sql.table(table_name, *columns, schema=schema)
+
+
+async def to_polars(engine: AsyncEngine, expr: str | TextClause | sql.TableClause) -> PlDataFrame:
+    """Async version of collect.to_polars."""
+
+    from polars import read_database
+
+    expr = await query_to_tbl(engine, expr) if isinstance(expr, str) else expr
+    expr = _as_select(expr)
+
+    async with engine.connect() as con:
+        return await con.run_sync(lambda sync_con: read_database(expr, sync_con))
+
+
+# Tables and DbCooper =========================================================
+
+async def _run_sync(engine: AsyncEngine, f, *args):
+    """Call f in a greenlet, with connect() reusing a single async connection.
+
+    The connection is used for both engine, and its sync_engine (e.g. as used by
+    a SchemaReflector).
+    """
+
+    def call(sync_conn):
+        pinned = _pinned_connections.get() or {}
+        engines = {engine: sync_conn, engine.sync_engine: sync_conn}
+
+        token = _pinned_connections.set({**pinned, **engines})
+        try:
+            return f(*args)
+        finally:
+            _pinned_connections.reset(token)
+
+    async with engine.connect() as conn:
+        return await conn.run_sync(call)
+
+
+class AsyncDbcSimpleTable(DbcSimpleTable):
+    """Represent a database table, which is fetched by awaiting a call."""
+
+    async def __call__(self):
+        sqla_tbl = await self._create_table()
+        return await self.to_frame(self.engine, sqla_tbl)
+
+    async def head(self, n: int = 5):
+        """Fetch the first n rows of the table."""
+
+        self._record_use()
+        sqla_tbl = await self._create_table()
+        return await self.to_frame(self.engine, sqla_tbl.select().limit(n).subquery())
+
+    async def sample(
+        self,
+        fraction: "float | None" = None,
+        n: "int | None" = None,
+        seed: "int | None" = None,
+    ):
+        """Fetch a random sample of rows. See DbcSimpleTable.sample for details."""
+
+        self._record_use()
+        sqla_tbl = await self._create_table()
+
+        if fraction is None and n is not None:
+            # row counts are fetched by the same code as DbcSimpleTable
+            fraction = await _run_sync(self.engine, self._sample_fraction, n)
+
+        expr = sample_table(self.engine.dialect, sqla_tbl, fraction, n, seed)
+        return await self.to_frame(self.engine, expr)
+
+    async def _create_table(self) -> sql.TableClause:
+        return await name_to_tbl(self.engine, self.table_name, self.schema, self.column_cache)
+
+
+class AsyncDbCooper(DbCooper):
+    """A DbCooper that uses a sqlalchemy AsyncEngine.
+
+    Use ``await AsyncDbCooper.create(engine)`` to create an instance with its table
+    accessors set up. The reset, list, query, tbl, search, tables_with_column, and
+    stats_for methods must be awaited, as must calls to table accessors (e.g.
+    ``await dbc.some_table()``).
+
+    Catalog queries and reflection are run by the same code as DbCooper, over the
+    synchronous connection of an AsyncConnection (see AsyncConnection.run_sync).
+    """
+
+    def __init__(
+        self,
+        engine: "str | AsyncEngine",
+        table_finder=TableFinder(),
+        table_factory=AsyncDbcSimpleTable,
+        accessor_builder=AccessorBuilder(),
+        to_frame=to_polars,
+        column_cache_size=1024,
+    ):
+        if isinstance(engine, str):
+            engine = create_async_engine(engine)
+
+        super().__init__(
+            engine,
+            table_finder=table_finder,
+            table_factory=table_factory,
+            accessor_builder=accessor_builder,
+            to_frame=to_frame,
+            initialize=False,
+            column_cache_size=column_cache_size,
+        )
+
+        # the reflector only connects inside _run_sync, where its engine's
+        # connection is pinned to that of an AsyncConnection
+        self._reflector = SchemaReflector(
+            engine.sync_engine, stats_kwargs=table_finder._dialect_kwargs(engine.dialect)
+        )
+
+    def __dir__(self):
+        unsupported = {"session", "prefetch"}
+        return [k for k in super().__dir__() if k not in unsupported]
+
+    @classmethod
+    async def create(cls, *args, **kwargs) -> "AsyncDbCooper":
+        dbc = cls(*args, **kwargs)
+        await dbc.reset()
+
+        return dbc
+
+    async def _run_sync(self, f, *args):
+        return await _run_sync(self._engine, f, *args)
+
+    async def _map_tables(self, refresh=False, schemas=None):
+        finder = _schema_finder(self._table_finder, schemas)
+        async with self._engine.connect() as conn:
+            return await conn.run_sync(
+                lambda sync_conn: finder.map_tables(
+                    sync_conn.dialect, sync_conn, **_refresh_kwargs(refresh)
+                )
+            )
+
+    def _get_table_map(self):
+        if self._table_map is None:
+            raise RuntimeError(
+                "Tables have not been listed yet. Use `await dbc.reset()`, or create "
+                "the object with `await AsyncDbCooper.create(...)`."
+            )
+
+        return self._table_map
+
+    async def reset(self, refresh=False, schemas=None):
+        """Update table accessors to match the tables in the database.
+
+        See DbCooper.reset for details.
+        """
+
+        self._apply_table_map(await self._map_tables(refresh, schemas), schemas)
+
+    async def list(self, raw=False, refresh=False):
+        async with self._engine.connect() as conn:
+            return await conn.run_sync(
+                lambda sync_conn: self._list(sync_conn, raw, refresh)
+            )
+
+    async def query(self, query):
+        expr = await query_to_tbl(self._engine, query, self._query_cache)
+        return await self._to_frame(self._engine, expr)
+
+    async def tbl(self, name, schema=None):
+        expr = await name_to_tbl(self._engine, name, schema, self._column_cache)
+        return await self._to_frame(self._engine, expr)
+
+    async def search(self, text, limit=10, columns=False):
+        """Return names of table accessors matching text, best match first.
+
+        See DbCooper.search for details.
+        """
+
+        if columns:
+            await self._run_sync(self._update_search_index, columns)
+
+        return super().search(text, limit, columns=False)
+
+    async def tables_with_column(self, name, case_sensitive=False):
+        """Return names of table accessors for tables that have a column.
+
+        See DbCooper.tables_with_column for details.
+        """
+
+        if self._column_catalog is None:
+            await self._run_sync(self._get_column_catalog)
+
+        return super().tables_with_column(name, case_sensitive)
+
+    async def stats_for(self, name, schema=None):
+        """Return a table's approximate row count and size, from catalog statistics.
+
+        See DbCooper.stats_for for details.
+        """
+
+        return await self._run_sync(self._reflector.get_stats, name, schema)
+
+    def session(self):
+        raise NotImplementedError("AsyncDbCooper does not support session().")
+
+    def prefetch(self, tables=None, n=None):
+        raise NotImplementedError("AsyncDbCooper does not support prefetch().")
@@ -1,13 +1,15 @@
-from dataclasses import dataclass, astuple
+from dataclasses import dataclass
 
-@dataclass(frozen=True)
+# slots keep instances small, since there is one per table in large catalogs
+@dataclass(frozen=True, slots=True)
 class TableName:
     database: "str | None"
     schema: "str | None"
     table: "str"
 
     def to_tuple(self, exists=False):
-        tup = astuple(self)
+        # note that dataclasses.astuple is much slower, since it deep copies fields
+        tup = (self.database, self.schema, self.table)
 
         if exists:
             return tuple(x for x in tup if x is not None)
@@ -27,8 +29,29 @@ class TableName:
         tup = self.to_tuple()
         return self.__class__(*[f(x) if x is not None else x for x in tup])
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TableIdentity:
     schema: "str | quoted_name | None"
     table: "str | quoted_name"
 
+
+@dataclass(frozen=True)
+class ColumnInfo:
+    schema: "str | None"
+    table: "str"
+    name: "str"
+    type: "str"
+    comment: "str | None" = None
+    table_comment: "str | None" = None
+    # only set when tables are listed across databases (e.g. snowflake, without
+    # a default database)
+    database: "str | None" = None
+
+
+# approximate sizes, from catalog statistics. Fields are None when unknown.
+@dataclass(frozen=True)
+class TableStats:
+    schema: "str | None"
+    table: "str"
+    rows: "int | None" = None
+    bytes: "int | None" = None
@@ -0,0 +1,402 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from collections import OrderedDict
+from contextlib import closing
+
+from .base import TableName
+
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Sequence
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import URL
+    from pyarrow import Table as PaTable
+
+
+def _default_cache_dir():
+    default = os.path.join(os.path.expanduser("~"), ".cache", "dbcooper")
+    return os.environ.get("DBCOOPER_CACHE_DIR", default)
+
+
+def _hash_key(url: URL, *settings) -> str:
+    # credentials should never end up in a cache file. Note that URL is a
+    # named tuple, and url.set(password=None) leaves the password unchanged.
+    url_str = url._replace(password=None).render_as_string(hide_password=False)
+    raw = json.dumps([url_str, *map(repr, settings)])
+
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class CatalogCache:
+    """Store table listings on disk, so that new processes can skip listing tables.
+
+    Listings are stored in a sqlite file, keyed by the engine url (without its
+    password) and any settings that change which tables get listed.
+
+    Parameters
+    ----------
+    path:
+        Location of the sqlite file. Defaults to "catalog.db", inside the directory
+        set by the DBCOOPER_CACHE_DIR environment variable (or ~/.cache/dbcooper).
+    ttl:
+        Number of seconds a listing is used for, before tables are listed again.
+        If None, listings never expire.
+    timeout:
+        Number of seconds to wait on other processes writing to the cache.
+    """
+
+    def __init__(self, path: "str | None" = None, ttl: "float | None" = 3600, timeout: float = 30):
+        if path is None:
+            path = os.path.join(_default_cache_dir(), "catalog.db")
+
+        self.path = os.fspath(path)
+        self.ttl = ttl
+        self.timeout = timeout
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.path!r}, ttl={self.ttl!r})"
+
+    @staticmethod
+    def make_key(url: URL, *settings) -> str:
+        return _hash_key(url, *settings)
+
+    def _connect(self):
+        dirname = os.path.dirname(self.path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+        # isolation_level=None means we manage transactions ourselves.
+        con = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute(
+            "CREATE TABLE IF NOT EXISTS catalog"
+            " (key TEXT PRIMARY KEY, created REAL NOT NULL, tables TEXT NOT NULL)"
+        )
+        return con
+
+    def get(self, key: str) -> "list[TableName] | None":
+        """Return the cached listing for key, or None if it is missing or expired."""
+
+        with closing(self._connect()) as con:
+            row = con.execute(
+                "SELECT created, tables FROM catalog WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        created, tables = row
+        if self.ttl is not None and time.time() - created > self.ttl:
+            return None
+
+        return [TableName(*entry) for entry in json.loads(tables)]
+
+    def set(self, key: str, tables: Sequence[TableName]):
+        """Store a listing of tables for key, replacing any existing entry."""
+
+        data = json.dumps([table.to_tuple() for table in tables])
+
+        with closing(self._connect()) as con:
+            # BEGIN IMMEDIATE takes the write lock up front, so concurrent
+            # writers wait on each other (up to timeout) instead of failing.
+            con.execute("BEGIN IMMEDIATE")
+            con.execute(
+                "INSERT OR REPLACE INTO catalog (key, created, tables) VALUES (?, ?, ?)",
+                (key, time.time(), data),
+            )
+            con.execute("COMMIT")
+
+    def invalidate(self, key: "str | None" = None):
+        """Remove the listing for key, or every listing if key is None."""
+
+        with closing(self._connect()) as con:
+            if key is None:
+                con.execute("DELETE FROM catalog")
+            else:
+                con.execute("DELETE FROM catalog WHERE key = ?", (key,))
+
+
+class ResultCache:
+    """Store query results on disk as arrow files, so repeated queries skip the database.
+
+    Each result is an uncompressed arrow IPC file, which is memory-mapped when read,
+    so reading a cached result does not copy it into memory up front. A sqlite
+    file in the same directory tracks when each result was stored and last used.
+    Once results take up more than max_size bytes, the least recently used are
+    removed.
+
+    Results are keyed by the engine url (without its password), the compiled sql,
+    and its parameters. Use with the to_arrow, to_polars, and to_duckdb functions,
+    by passing them a result_cache argument.
+
+    Parameters
+    ----------
+    path:
+        Directory to store results in. Defaults to "results", inside the directory
+        set by the DBCOOPER_CACHE_DIR environment variable (or ~/.cache/dbcooper).
+    ttl:
+        Number of seconds a result is used for, before it is fetched again.
+        If None, results never expire.
+    max_size:
+        Maximum number of bytes used by stored results. If None, results are
+        never removed to save space.
+    timeout:
+        Number of seconds to wait on other processes writing to the cache.
+
+    Examples
+    --------
+    >>> from functools import partial
+    >>> from dbcooper.collect import to_polars
+    >>> cache = ResultCache(ttl=600, max_size=10 * 1024 ** 3)
+    >>> dbc = DbCooper(engine, to_frame=partial(to_polars, result_cache=cache)) # doctest: +SKIP
+
+    Pass result_cache=None to skip the cache for a single call.
+
+    >>> dbc.some_table(result_cache=None) # doctest: +SKIP
+    """
+
+    def __init__(
+        self,
+        path: "str | None" = None,
+        ttl: "float | None" = 3600,
+        max_size: "int | None" = 1024 ** 3,
+        timeout: float = 30,
+    ):
+        if path is None:
+            path = os.path.join(_default_cache_dir(), "results")
+
+        self.path = os.fspath(path)
+        self.ttl = ttl
+        self.max_size = max_size
+        self.timeout = timeout
+
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}({self.path!r}, ttl={self.ttl!r}, max_size={self.max_size!r})"
+        )
+
+    @staticmethod
+    def make_key(url: URL, query: str, params) -> str:
+        return _hash_key(url, query, params)
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.arrow")
+
+    def _connect(self):
+        os.makedirs(self.path, exist_ok=True)
+
+        con = sqlite3.connect(
+            os.path.join(self.path, "index.db"), timeout=self.timeout, isolation_level=None
+        )
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, created REAL NOT NULL,"
+            " accessed REAL NOT NULL, size INTEGER NOT NULL)"
+        )
+        return con
+
+    def get(self, key: str) -> "PaTable | None":
+        """Return the cached result for key, or None if it is missing or expired."""
+
+        import pyarrow as pa
+
+        with closing(self._connect()) as con:
+            row = con.execute("SELECT created FROM results WHERE key = ?", (key,)).fetchone()
+
+            expired = row is not None and self.ttl is not None and time.time() - row[0] > self.ttl
+            if row is None or expired:
+                self.misses += 1
+                if expired:
+                    self._remove(con, [key])
+                return None
+
+            try:
+                source = pa.memory_map(self._file(key), "r")
+            except FileNotFoundError:
+                # removed by another process
+                self.misses += 1
+                self._remove(con, [key])
+                return None
+
+            con.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+
+        self.hits += 1
+        return pa.ipc.open_file(source).read_all()
+
+    def set(self, key: str, table: PaTable):
+        """Store a result for key, replacing any existing entry."""
+
+        import pyarrow as pa
+
+        os.makedirs(self.path, exist_ok=True)
+
+        # write to a temporary file first, so that readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        os.close(fd)
+        try:
+            with pa.OSFile(tmp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+            size = os.path.getsize(tmp_path)
+            if self.max_size is not None and size > self.max_size:
+                os.remove(tmp_path)
+                return
+
+            os.replace(tmp_path, self._file(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with closing(self._connect()) as con:
+            now = time.time()
+
+            # BEGIN IMMEDIATE takes the write lock up front, so concurrent
+            # writers wait on each other (up to timeout) instead of failing.
+            con.execute("BEGIN IMMEDIATE")
+            con.execute(
+                "INSERT OR REPLACE INTO results (key, created, accessed, size) VALUES (?, ?, ?, ?)",
+                (key, now, now, size),
+            )
+            evicted = self._find_evictions(con)
+            self._delete_rows(con, evicted)
+            con.execute("COMMIT")
+
+        self._delete_files(evicted)
+
+    def _find_evictions(self, con) -> list[str]:
+        """Return the least recently used keys to remove, for results to fit in max_size."""
+
+        if self.max_size is None:
+            return []
+
+        (total,) = con.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()
+
+        evicted = []
+        rows = con.execute("SELECT key, size FROM results ORDER BY accessed")
+        for key, size in rows:
+            if total <= self.max_size:
+                break
+
+            evicted.append(key)
+            total -= size
+
+        return evicted
+
+    def _remove(self, con, keys):
+        self._delete_rows(con, keys)
+        self._delete_files(keys)
+
+    def _delete_rows(self, con, keys):
+        con.executemany("DELETE FROM results WHERE key = ?", [(key,) for key in keys])
+
+    def _delete_files(self, keys):
+        for key in keys:
+            try:
+                os.remove(self._file(key))
+            except OSError:
+                # already removed, or (on windows) still memory-mapped by a reader
+                pass
+
+    def size(self) -> int:
+        """Return the number of bytes used by stored results."""
+
+        with closing(self._connect()) as con:
+            (total,) = con.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()
+
+        return total
+
+    def invalidate(self, key: "str | None" = None):
+        """Remove the result for key, or every result if key is None."""
+
+        with closing(self._connect()) as con:
+            if key is None:
+                keys = [row[0] for row in con.execute("SELECT key FROM results")]
+            else:
+                keys = [key]
+
+            self._remove(con, keys)
+
+
+class LRUCache:
+    """A bounded, thread-safe, in-memory cache that evicts least recently used entries.
+
+    Parameters
+    ----------
+    maxsize:
+        Maximum number of entries kept in the cache.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._d = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(maxsize={self.maxsize!r})"
+
+    def __len__(self):
+        return len(self._d)
+
+    def __contains__(self, key):
+        return key in self._d
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            if key not in self._d:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            self._d.move_to_end(key)
+            return self._d[key]
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._d[key] = value
+            self._d.move_to_end(key)
+
+            while len(self._d) > self.maxsize:
+                self._d.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *keys: Hashable):
+        """Remove entries for keys, or every entry if no keys are passed."""
+
+        with self._lock:
+            if not keys:
+                self._d.clear()
+
+            for key in keys:
+                self._d.pop(key, None)
+
+    def invalidate_if(self, predicate: Callable[[Hashable], bool]):
+        """Remove every entry whose key satisfies predicate."""
+
+        with self._lock:
+            for key in [k for k in self._d if predicate(k)]:
+                del self._d[key]
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._d),
+            "maxsize": self.maxsize,
+        }
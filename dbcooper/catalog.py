@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Mapping
+
+from .base import ColumnInfo, TableName, TableIdentity
+
+from typing import Iterable, Iterator
+
+
+def _string_key(x):
+    # strings of different types (e.g. a str and an equal sqlalchemy quoted_name)
+    # get different keys, so that they are not conflated.
+    if x is None or type(x) is str:
+        return x
+
+    return (x, type(x), getattr(x, "quote", None))
+
+
+class _StringPool:
+    """Store each distinct string once, and refer to strings by an integer id.
+
+    Note that id 0 is always None.
+    """
+
+    def __init__(self):
+        self.strings = [None]
+        self._ids = {None: 0}
+
+    def __len__(self):
+        return len(self.strings)
+
+    def intern(self, x: "str | None") -> int:
+        key = _string_key(x)
+        id_ = self._ids.get(key)
+        if id_ is None:
+            id_ = self._ids[key] = len(self.strings)
+            self.strings.append(x)
+
+        return id_
+
+    def get_id(self, x: "str | None") -> "int | None":
+        return self._ids.get(_string_key(x))
+
+
+class TableCatalog(Mapping):
+    """A compact mapping of TableName to TableIdentity, for catalogs with many tables.
+
+    This is what TableFinder.map_tables returns. Rather than keeping a TableName
+    and TableIdentity object for every table, database and schema names are kept
+    once each (as ids in arrays), and table names are only stored as strings.
+    Table identities usually repeat these names, so only those that differ are
+    kept. Keys and values are created when they are accessed.
+
+    Parameters
+    ----------
+    items:
+        Pairs of TableName and TableIdentity, e.g. from a dict's items method.
+    """
+
+    def __init__(self, items: Iterable[tuple[TableName, TableIdentity]] = ()):
+        self._pool = _StringPool()
+
+        self._databases = array("I")
+        self._schemas = array("I")
+        self._tables = []
+
+        # id of each identity's schema. Identity tables are only stored when they
+        # are not the same string as the table name, keyed by row.
+        self._ident_schemas = array("I")
+        self._ident_tables = {}
+
+        # (database, schema) -> (database id, schema id, {table name: row})
+        self._groups = {}
+
+        for table, ident in items:
+            self[table] = ident
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(<{len(self)} tables>)"
+
+    def __len__(self):
+        return len(self._tables)
+
+    def _find_row(self, table: TableName) -> "int | None":
+        if not isinstance(table, TableName):
+            return None
+
+        group = self._groups.get((_string_key(table.database), _string_key(table.schema)))
+        if group is None:
+            return None
+
+        return group[2].get(table.table)
+
+    def _key(self, row: int) -> TableName:
+        strings = self._pool.strings
+        return TableName(
+            strings[self._databases[row]], strings[self._schemas[row]], self._tables[row]
+        )
+
+    def _value(self, row: int) -> TableIdentity:
+        ident_table = self._ident_tables.get(row, self._tables[row])
+        return TableIdentity(self._pool.strings[self._ident_schemas[row]], ident_table)
+
+    def __getitem__(self, table: TableName) -> TableIdentity:
+        row = self._find_row(table)
+        if row is None:
+            raise KeyError(table)
+
+        return self._value(row)
+
+    def __contains__(self, table):
+        return self._find_row(table) is not None
+
+    def __iter__(self) -> Iterator[TableName]:
+        return (self._key(row) for row in range(len(self._tables)))
+
+    def __setitem__(self, table: TableName, ident: TableIdentity):
+        group_key = (_string_key(table.database), _string_key(table.schema))
+        group = self._groups.get(group_key)
+        if group is None:
+            group_ids = self._pool.intern(table.database), self._pool.intern(table.schema)
+            group = self._groups[group_key] = (*group_ids, {})
+
+        db_id, schema_id, rows = group
+        row = rows.get(table.table)
+
+        if row is None:
+            row = rows[table.table] = len(self._tables)
+
+            self._databases.append(db_id)
+            self._schemas.append(schema_id)
+            self._tables.append(table.table)
+            self._ident_schemas.append(0)
+
+        self._ident_schemas[row] = self._pool.intern(ident.schema)
+
+        if ident.table is self._tables[row]:
+            self._ident_tables.pop(row, None)
+        else:
+            self._ident_tables[row] = ident.table
+
+    def items(self) -> Iterator[tuple[TableName, TableIdentity]]:
+        # faster than looking up each key, which Mapping.items would do
+        return ((self._key(row), self._value(row)) for row in range(len(self._tables)))
+
+    def values(self) -> Iterator[TableIdentity]:
+        return (self._value(row) for row in range(len(self._tables)))
+
+
+class ColumnCatalog:
+    """Store the database, schema, table, name, and type of many columns, compactly.
+
+    Each of these fields is kept in its own array of integer ids, which index into
+    a shared list of distinct strings. Since schema names, table names, and types
+    repeat across many columns, this uses far less memory than a list of
+    ColumnInfo objects. Column names are also indexed (case insensitively), so that
+    finding the tables with a given column does not scan every column.
+
+    Parameters
+    ----------
+    columns:
+        Columns to store, e.g. the result of inspect.list_columns.
+    """
+
+    def __init__(self, columns: Iterable[ColumnInfo] = ()):
+        self._pool = _StringPool()
+
+        self._databases = array("I")
+        self._schemas = array("I")
+        self._tables = array("I")
+        self._names = array("I")
+        self._types = array("I")
+
+        # casefolded column name -> row numbers
+        self._by_name = {}
+
+        for col in columns:
+            self.add(col)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(<{len(self)} columns>)"
+
+    def __len__(self):
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[ColumnInfo]:
+        return (self._row(ii) for ii in range(len(self)))
+
+    def _row(self, ii: int) -> ColumnInfo:
+        strings = self._pool.strings
+        return ColumnInfo(
+            strings[self._schemas[ii]],
+            strings[self._tables[ii]],
+            strings[self._names[ii]],
+            strings[self._types[ii]],
+            database=strings[self._databases[ii]],
+        )
+
+    def add(self, col: ColumnInfo):
+        row = len(self._names)
+
+        intern = self._pool.intern
+
+        self._databases.append(intern(col.database))
+        self._schemas.append(intern(col.schema))
+        self._tables.append(intern(col.table))
+        self._names.append(intern(col.name))
+        self._types.append(intern(col.type))
+
+        self._by_name.setdefault(col.name.casefold(), []).append(row)
+
+    def _lookup_rows(self, name, case_sensitive):
+        rows = self._by_name.get(name.casefold(), [])
+
+        if case_sensitive:
+            name_id = self._pool.get_id(name)
+            return [ii for ii in rows if self._names[ii] == name_id]
+
+        return rows
+
+    def lookup(self, name: str, case_sensitive: bool = False) -> list[ColumnInfo]:
+        """Return every column with a name, in the order they were added."""
+
+        return [self._row(ii) for ii in self._lookup_rows(name, case_sensitive)]
+
+    def tables_with_column(self, name: str, case_sensitive: bool = False) -> list[tuple]:
+        """Return (database, schema, table) tuples for tables with a column, without duplicates."""
+
+        strings, databases = self._pool.strings, self._databases
+        schemas, tables = self._schemas, self._tables
+        rows = self._lookup_rows(name, case_sensitive)
+
+        return list(dict.fromkeys(
+            (strings[databases[ii]], strings[schemas[ii]], strings[tables[ii]]) for ii in rows
+        ))
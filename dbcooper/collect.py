@@ -1,43 +1,141 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from sqlalchemy import sql
 from sqlalchemy.engine import Engine
 from sqlalchemy.sql.expression import TextClause
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterator
+
+from .inspect import describe_query, normalize_query
+from .trace import span
 
 
 if TYPE_CHECKING:
+    from .cache import LRUCache, ResultCache
     from siuba.sql import LazyTbl
     from duckdb import DuckDBPyConnection
     from polars import DataFrame as PlDataFrame
+    from pyarrow import RecordBatch, Table as PaTable
+
+
+# maps engines to connections pinned by pin_connection. A context variable keeps
+# pins local to the current thread (or asyncio task).
+_pinned_connections: ContextVar["dict | None"] = ContextVar("_pinned_connections", default=None)
 
 
-def query_to_tbl(engine: Engine, query: str) -> TextClause:
+@contextmanager
+def pin_connection(engine: Engine):
+    """Within a with block, have connect(engine) reuse a single connection.
 
-    full_query = f"""
-        SELECT * FROM (\n{query}\n) WHERE 1 = 0
+    This applies to every function in this module, as well as DbCooper catalog
+    queries and table reflection. Note that the pin only applies to the current
+    thread, so work done in other threads uses separate connections.
     """
 
+    pinned = _pinned_connections.get() or {}
+    if engine in pinned:
+        # already pinned by an outer block
+        yield pinned[engine]
+        return
+
     with engine.connect() as con:
-        q = con.execute(sql.text(full_query))
-    
-    columns = [sql.column(k) for k in q.keys()]
+        token = _pinned_connections.set({**pinned, engine: con})
+        try:
+            yield con
+        finally:
+            _pinned_connections.reset(token)
+
+
+@contextmanager
+def connect(engine: Engine):
+    """Connect to engine, or reuse its connection if one is pinned."""
+
+    pinned = _pinned_connections.get()
+    if pinned is not None and engine in pinned:
+        yield pinned[engine]
+    else:
+        with engine.connect() as con:
+            yield con
+
+
+def query_to_tbl(engine: Engine, query: str, cache: LRUCache | None=None) -> TextClause:
+    """Return a selectable for a query, with the columns it returns.
+
+    If cache is specified, column names are looked up in it by the query text
+    (with whitespace normalized), and only discovered from the database when missing.
+    """
+
+    key = normalize_query(query)
+
+    with span(engine, "describe_query", sql=query) as attrs:
+        col_names = cache.get(key) if cache is not None else None
+
+        if col_names is None:
+            with connect(engine) as con:
+                col_names = _describe_query_columns(con, query)
+
+            if cache is not None:
+                cache.set(key, col_names)
+                attrs["cache"] = "miss"
+        else:
+            attrs["cache"] = "hit"
+
+    return _query_with_columns(query, col_names)
+
+
+def _describe_query_columns(con, query: str) -> tuple:
+    return tuple(describe_query(con.dialect, con, query))
+
+
+def _query_with_columns(query: str, col_names) -> TextClause:
+    columns = [sql.column(k) for k in col_names]
     text_as_from = sql.text(query).columns(*columns).alias()
 
     return text_as_from
 
 
-def name_to_tbl(engine: Engine, table_name: str, schema: str | None=None) -> sql.TableClause:
+def name_to_tbl(
+    engine: Engine,
+    table_name: str,
+    schema: str | None=None,
+    cache: LRUCache | None=None,
+) -> sql.TableClause:
+    """Return a table with the columns of a database table.
+
+    If cache is specified, column names are looked up in it by (schema, table_name),
+    and only discovered from the database when missing.
+    """
+
+    key = (schema, table_name)
+
+    with span(engine, "probe", table=table_name, schema=schema) as attrs:
+        col_names = cache.get(key) if cache is not None else None
+
+        if col_names is None:
+            with connect(engine) as con:
+                col_names = _probe_table_columns(con, table_name, schema)
+
+            if cache is not None:
+                cache.set(key, col_names)
+                attrs["cache"] = "miss"
+        else:
+            attrs["cache"] = "hit"
+
+    columns = [sql.column(k) for k in col_names]
+    return sql.table(table_name, *columns, schema=schema)
+
+
+def _probe_table_columns(con, table_name: str, schema: str | None) -> tuple:
     # sql dialects like snowflake do not have great reflection capabilities,
     # so we execute a trivial query to discover the column names
     explore_table = sql.table(table_name, schema=schema)
     trivial = explore_table.select(sql.text("0 = 1")).add_columns(sql.text("*"))
 
-    with engine.connect() as con:
-        q = con.execute(trivial)
+    q = con.execute(trivial)
 
-    columns = [sql.column(k) for k in q.keys()]
-    return sql.table(table_name, *columns, schema=schema)
+    return tuple(q.keys())
 
 
 def to_siuba(engine: Engine, expr: str | TextClause | sql.TableClause) -> LazyTbl:
@@ -48,30 +146,324 @@ def to_siuba(engine: Engine, expr: str | TextClause | sql.TableClause) -> LazyTb
     return LazyTbl(engine, expr)
 
 
-def to_polars(engine: Engine, expr: str | TextClause | sql.TableClause) -> PlDataFrame:
-    from polars import read_database
+def to_polars(
+    engine: Engine,
+    expr: str | TextClause | sql.TableClause,
+    partition_on: str | None = None,
+    partitions: int = 4,
+    max_workers: int | None = None,
+    result_cache: ResultCache | None = None,
+) -> PlDataFrame:
+    """Return results as a polars DataFrame.
+
+    Parameters
+    ----------
+    partition_on:
+        Name of a numeric or date column. If specified, the range of this column
+        is split into partitions, which are read concurrently over separate
+        connections from the engine's pool, and then concatenated.
+    partitions:
+        Number of partitions to split the range of partition_on into.
+    max_workers:
+        Number of partitions to read at once. Defaults to partitions.
+    result_cache:
+        If specified, results are looked up in (or stored in) this cache.
+    """
+
+    import polars as pl
 
     expr = query_to_tbl(engine, expr) if isinstance(expr, str) else expr
 
-    if isinstance(expr, sql.TableClause):
-        expr = expr.select().add_columns()
+    # tables and subqueries (e.g. from DbcSimpleTable.sample) are selected from
+    expr = _as_select(expr)
 
-    with engine.connect() as con:
-        return read_database(expr, con)
+    def read():
+        if partition_on is not None:
+            return _read_partitioned_polars(engine, expr, partition_on, partitions, max_workers)
+
+        with connect(engine) as con:
+            return pl.read_database(expr, con)
+
+    if result_cache is not None:
+        query, params = _compile_with_params(engine, expr)
+        results = _cached_arrow(engine, query, params, result_cache, lambda: read().to_arrow())
+        return pl.from_arrow(results)
+
+    return read()
+
+
+def _read_partitioned_polars(engine: Engine, expr, column: str, partitions: int, max_workers: int | None):
+    import polars as pl
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    def read(query):
+        with engine.connect() as con:
+            return pl.read_database(query, con)
+
+    queries = _partition_queries(engine, expr, column, partitions)
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(queries)) as executor:
+        frames = list(executor.map(read, queries))
+
+    # partitions with no (or only null) values may infer different dtypes
+    return pl.concat(frames, how="vertical_relaxed")
+
+
+def _partition_queries(engine: Engine, expr, column: str, partitions: int) -> list:
+    """Split a query into queries over ranges of a column, with min and max discovered.
+
+    Ranges include their lower bound, and exclude their upper bound (except for the
+    last range). A final query fetches rows where the column is null.
+    """
+
+    subquery = _as_select(expr).subquery()
+    col = subquery.c[column]
+
+    with connect(engine) as con:
+        lo, hi = con.execute(sql.select(sql.func.min(col), sql.func.max(col))).one()
+
+    if lo is None:
+        # no rows, or only nulls
+        return [sql.select(subquery)]
+
+    bounds = _split_range(lo, hi, partitions)
+
+    queries = []
+    for ii, (lower, upper) in enumerate(zip(bounds[:-1], bounds[1:])):
+        is_last = ii == len(bounds) - 2
+        upper_cond = col <= upper if is_last else col < upper
+        queries.append(sql.select(subquery).where(col >= lower, upper_cond))
+
+    queries.append(sql.select(subquery).where(col.is_(None)))
+
+    return queries
+
+
+def _split_range(lo, hi, n: int) -> list:
+    if isinstance(lo, int) and isinstance(hi, int):
+        bounds = [lo + (hi - lo) * ii // n for ii in range(n + 1)]
+    else:
+        # floats, decimals, dates, and datetimes
+        try:
+            bounds = [lo + (hi - lo) * ii / n for ii in range(n)] + [hi]
+        except TypeError:
+            raise TypeError(
+                "Partition column must be numeric or a date, but its minimum value "
+                f"was {lo!r}, of type {type(lo).__name__}."
+            ) from None
+
+    # small ranges may produce repeated bounds
+    deduped = sorted(set(bounds))
+    if len(deduped) == 1:
+        return [lo, hi]
 
+    return deduped
+
+
+def to_arrow(
+    engine: Engine,
+    expr: str | TextClause | sql.TableClause,
+    result_cache: ResultCache | None = None,
+) -> PaTable:
+    """Return results as a pyarrow Table.
+
+    For drivers that can fetch arrow data directly (e.g. duckdb and ADBC drivers),
+    results are never converted to python objects. Other drivers fall back to
+    fetching rows.
+
+    Parameters
+    ----------
+    result_cache:
+        If specified, results are looked up in (or stored in) this cache.
+    """
+
+    import pyarrow as pa
+
+    expr = query_to_tbl(engine, expr) if isinstance(expr, str) else expr
+    query, params = _compile_with_params(engine, _as_select(expr))
+
+    if result_cache is not None:
+        return _cached_arrow(engine, query, params, result_cache, lambda: to_arrow(engine, expr))
+
+    with connect(engine) as con:
+        cursor = con.connection.cursor()
+        try:
+            cursor.execute(query, params)
+
+            if hasattr(cursor, "fetch_arrow_table"):
+                return cursor.fetch_arrow_table()
+
+            names = [entry[0] for entry in cursor.description]
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+
+    if not rows:
+        return pa.table({name: [] for name in names})
+
+    return pa.Table.from_batches([_rows_to_arrow(names, rows)])
+
+
+def to_duckdb(
+    engine: Engine,
+    expr: str | TextClause | sql.TableClause,
+    result_cache: ResultCache | None = None,
+) -> DuckDBPyConnection:
+    """Return a duckdb connection, with results ready to be fetched.
+
+    Parameters
+    ----------
+    result_cache:
+        If specified, results are looked up in (or stored in) this cache. Cached
+        results are returned from a new in-memory duckdb connection.
+    """
 
-def to_duckdb(engine: Engine, expr: str | TextClause | sql.TableClause) -> DuckDBPyConnection:
     import duckdb
 
     if engine.name != "duckdb":
         raise ValueError("This function only works with duckdb engines")
 
     expr = query_to_tbl(engine, expr) if isinstance(expr, str) else expr
+    query, params = _compile_with_params(engine, _as_select(expr))
 
-    if isinstance(expr, sql.TableClause):
-        expr = expr.select().add_columns()
+    if result_cache is not None:
+        def fetch():
+            with connect(engine) as con:
+                return con.connection.execute(query, params).fetch_arrow_table()
 
-    with engine.connect() as con:
+        results = _cached_arrow(engine, query, params, result_cache, fetch)
+
+        # the connection keeps a reference to the registered results
+        cached_con = duckdb.connect()
+        cached_con.register("results", results)
+        return cached_con.execute("SELECT * FROM results")
+
+    with connect(engine) as con:
         # assumes we are using duckdb_engine
-        # TODO: expr should be compiled?
-        return con.connection.execute(str(expr))
+        return con.connection.execute(query, params)
+
+
+def _cached_arrow(engine: Engine, query: str, params, result_cache: ResultCache, fetch) -> PaTable:
+    """Return results from result_cache, or store the result of calling fetch in it."""
+
+    key = result_cache.make_key(engine.url, query, params)
+
+    with span(engine, "result_cache", sql=query) as attrs:
+        table = result_cache.get(key)
+
+        if table is None:
+            table = fetch()
+            result_cache.set(key, table)
+            attrs["cache"] = "miss"
+        else:
+            attrs["cache"] = "hit"
+
+    return table
+
+
+def _as_select(expr):
+    # tables, and queries from query_to_tbl, need to be selected from
+    if isinstance(expr, sql.FromClause):
+        return expr.select()
+
+    return expr
+
+
+def _compile_with_params(engine: Engine, expr) -> tuple:
+    """Compile an expression for engine, returning the sql string and its parameters.
+
+    Parameters are returned in the format used by the engine's DBAPI driver.
+    """
+
+    compiled = expr.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.construct_params()
+
+    if engine.dialect.positional:
+        return str(compiled), [params[name] for name in compiled.positiontup]
+
+    return str(compiled), params
+
+
+def to_batches(
+    engine: Engine,
+    expr: str | TextClause | sql.TableClause,
+    batch_size: int = 10_000,
+    kind: str = "arrow",
+) -> Iterator[RecordBatch]:
+    """Yield results in chunks of batch_size rows, without fetching all rows at once.
+
+    Rows are fetched using a server-side cursor, where the database driver
+    supports it. Note that the connection stays open until every chunk has been
+    consumed (or the generator is closed).
+
+    To use with DbCooper, set the batch size with functools.partial. For example,
+    ``DbCooper(engine, to_frame=partial(to_batches, batch_size=1000))``.
+
+    Parameters
+    ----------
+    kind:
+        The type of each chunk. Either "arrow" (pyarrow RecordBatch), "pandas", or
+        "polars" (DataFrames).
+    """
+
+    if kind == "arrow":
+        convert = _rows_to_arrow
+    elif kind == "pandas":
+        convert = _rows_to_pandas
+    elif kind == "polars":
+        convert = _rows_to_polars
+    else:
+        raise ValueError(f"Unknown kind argument: {kind}")
+
+    expr = query_to_tbl(engine, expr) if isinstance(expr, str) else expr
+
+    # tables and subqueries (e.g. from DbcSimpleTable.sample) are selected from
+    expr = _as_select(expr)
+
+    with connect(engine) as con:
+        result = (
+            con
+            .execution_options(stream_results=True, max_row_buffer=batch_size)
+            .execute(expr)
+        )
+
+        names = list(result.keys())
+        prev = None
+        for rows in result.partitions(batch_size):
+            prev = convert(names, rows, prev)
+            yield prev
+
+
+def _rows_to_arrow(names, rows, prev=None):
+    import pyarrow as pa
+
+    arrays = [pa.array(col) for col in zip(*rows)]
+    batch = pa.RecordBatch.from_arrays(arrays, names=names)
+
+    if prev is None or batch.schema.equals(prev.schema):
+        return batch
+
+    # later rows may need a wider type than earlier batches (e.g. decimals with
+    # more digits, or floats after integers), so each batch is cast to a schema
+    # that fits both it and the previous batch.
+    schema = pa.unify_schemas([prev.schema, batch.schema], promote_options="permissive")
+    return batch.cast(schema)
+
+
+def _rows_to_pandas(names, rows, prev=None):
+    import pandas as pd
+
+    return pd.DataFrame.from_records(rows, columns=names)
+
+
+def _rows_to_polars(names, rows, prev=None):
+    import polars as pl
+
+    df = pl.DataFrame([tuple(row) for row in rows], schema=names, orient="row")
+
+    if prev is None or df.schema == prev.schema:
+        return df
+
+    # as with arrow batches, cast to types that fit this and the previous batch
+    return pl.concat([prev.clear(), df], how="vertical_relaxed")
@@ -2,15 +2,28 @@ from __future__ import annotations
 
 from sqlalchemy import create_engine
 
-from .finder import TableFinder, AccessorBuilder
-from .tables import DbcDocumentedTable
-from .collect import query_to_tbl, name_to_tbl, to_siuba
+from .cache import LRUCache
+from .catalog import ColumnCatalog
+from .finder import TableFinder, AccessorBuilder, _refresh_kwargs, _schema_finder
+from .reflect import SchemaReflector, _table_key
+from .prefetch import Prefetcher
+from .search import SearchIndex
+from .tables import DbcDocumentedTable, DbcSimpleTable
+from .inspect import list_columns
+from .collect import connect, pin_connection, query_to_tbl, name_to_tbl, to_siuba
+from .trace import set_tracer, span
 
+import threading
 import typing
 
+from contextlib import contextmanager
+from functools import partial
+
 if typing.TYPE_CHECKING:
     from sqlalchemy.engine import Engine
 
+    from .base import TableStats
+
 
 class DbCooper:
     def __init__(
@@ -21,10 +34,32 @@ class DbCooper:
         accessor_builder=AccessorBuilder(),
         to_frame=to_siuba,
         initialize=True,
+        lazy=False,
+        column_cache_size=1024,
+        pool_size=None,
+        max_overflow=None,
+        pool_pre_ping=None,
+        tracer=None,
+        usage_tracker=None,
+        prefetch=None,
+        prefetch_workers=2,
     ):
 
+        pool_options = {
+            k: v
+            for k, v in dict(
+                pool_size=pool_size, max_overflow=max_overflow, pool_pre_ping=pool_pre_ping
+            ).items()
+            if v is not None
+        }
+
         if isinstance(engine, str):
-            engine = create_engine(engine)
+            engine = create_engine(engine, **pool_options)
+        elif pool_options:
+            raise ValueError(
+                "Pool options can only be set when engine is a url string, but received "
+                f"an engine and these options: {list(pool_options)}"
+            )
 
         self._engine: Engine = engine
         self._accessors = {}
@@ -32,10 +67,61 @@ class DbCooper:
         self._table_factory = table_factory
         self._accessor_builder = accessor_builder
         self._to_frame = to_frame
+        self._lazy = lazy
+
+        # column names discovered by tbl() and table accessors, keyed by
+        # (schema, table name).
+        self._column_cache = LRUCache(column_cache_size) if column_cache_size else None
+
+        # column names of queries passed to query(), keyed by normalized query text.
+        self._query_cache = LRUCache(column_cache_size) if column_cache_size else None
+
+        # tables reflected by documented table accessors, fetched a schema at a time
+        self._reflector = SchemaReflector(
+            engine, stats_kwargs=table_finder._dialect_kwargs(engine.dialect)
+        )
+
+        # tables found by the table finder, and whether to refresh the listing
+        # when it is next needed (see _get_table_map).
+        self._table_map = None
+        self._refresh_table_map = False
+        # held while tables are listed, since prefetch threads may also list them
+        self._table_map_lock = threading.RLock()
+
+        # table and column names, for search(). This is kept across resets, and
+        # only updated for tables that were added or removed.
+        self._search_index = SearchIndex()
+        self._search_names = {}
+        # the table map that search names were last updated from
+        self._search_table_map = None
+        # tables whose column names are in the search index, and their identity
+        self._search_columns = {}
+
+        # every column in the database, for tables_with_column(). This is loaded
+        # with a single catalog query when first needed, along with a mapping of
+        # (schema, table) to the accessor name for each table.
+        self._column_catalog = None
+        self._column_catalog_names = None
+
+        # spans are reported for work done with this engine, including by accessors
+        self._tracer = tracer
+        if tracer is not None:
+            set_tracer(engine, tracer)
+
+        # counts table use across sessions, for prefetching the most used tables
+        self._usage_tracker = usage_tracker
+        self._prefetch_workers = prefetch_workers
+        self._prefetcher = None
 
         if initialize:
             self._init()
 
+            if prefetch is not None:
+                if isinstance(prefetch, int):
+                    self.prefetch(n=prefetch)
+                else:
+                    self.prefetch(prefetch)
+
     def __getattr__(self, k):
         if k in self._accessors:
             return self._accessors[k]
@@ -50,31 +136,250 @@ class DbCooper:
 
 
     def __dir__(self):
-        dbc_methods = ["reset", "query", "list", "tbl"]
+        dbc_methods = [
+            "reset", "query", "list", "tbl", "invalidate", "cache_info", "session", "stats",
+            "search", "tables_with_column", "stats_for", "prefetch",
+        ]
         return dbc_methods + list(self._accessors.keys())
 
     def _ipython_key_completions_(self):
         return list(self._accessors)
 
-    def _init(self):
-        with self._engine.connect() as conn:
-            table_map = self._table_finder.map_tables(self._engine.dialect, conn)
+    def _create_table(self, engine, table_name, schema, to_frame):
+        # custom table factories may only take these four arguments, so caches
+        # are set on the table afterwards
+        table = self._table_factory(engine, table_name, schema, to_frame)
+
+        if isinstance(table, DbcSimpleTable):
+            table.column_cache = self._column_cache
+            table.reflector = self._reflector
+            table.usage_tracker = self._usage_tracker
+
+        return table
+
+    def _map_tables(self, refresh=False, schemas=None):
+        finder = _schema_finder(self._table_finder, schemas)
+        with connect(self._engine) as conn:
+            return finder.map_tables(self._engine.dialect, conn, **_refresh_kwargs(refresh))
+
+    def _get_table_map(self):
+        with self._table_map_lock:
+            if self._table_map is None:
+                self._table_map = self._map_tables(self._refresh_table_map)
+                self._refresh_table_map = False
+
+            return self._table_map
+
+    def _init(self, refresh=False, table_map=None):
+        # table_map may be passed if tables were already listed
+        self._table_map = table_map
+        self._refresh_table_map = refresh
+
+        if self._lazy:
+            # tables are listed when an accessor is first used
+            accessors = self._accessor_builder.create_lazy_accessors(
+                self._engine,
+                self._create_table,
+                self._get_table_map,
+                self._to_frame,
+            )
+        else:
+            table_map = self._get_table_map()
+
+            with span(self._engine, "create_accessors", rows=len(table_map)):
+                accessors = self._accessor_builder.create_accessors(
+                    self._engine,
+                    self._create_table,
+                    table_map,
+                    self._to_frame,
+                )
 
-        accessors = self._accessor_builder.create_accessors(
-            self._engine,
-            self._table_factory,
-            table_map,
-            self._to_frame,
-        )
         self._accessors = accessors
 
-    def reset(self):
-        self._init()
+    @contextmanager
+    def session(self):
+        """Run all queries inside a with block over a single connection.
+
+        This includes listing tables, discovering columns, reflection, and
+        collecting data with the functions in dbcooper.collect, whether they are
+        run by this object or its table accessors. Note that to_siuba returns lazy
+        tables, which connect on their own when collected.
+
+        Examples
+        --------
+        >>> with dbc.session(): # doctest: +SKIP
+        ...     dbc.reset()
+        ...     df = dbc.some_table()
+        """
+
+        with pin_connection(self._engine):
+            yield self
+
+    def reset(self, refresh=False, schemas=None):
+        """Update table accessors to match the tables in the database.
+
+        Tables are listed again, and compared to the tables found last time. Only
+        accessors for tables that were added or removed are created or removed, and
+        cached columns are kept for all other tables. (Use invalidate to clear them.)
+
+        Parameters
+        ----------
+        refresh:
+            Whether to list tables from the database, even if the table finder has
+            a cached listing.
+        schemas:
+            If specified, only update tables in these schemas. Columns cached for
+            tables in these schemas are also cleared.
+        """
+
+        self._stop_prefetch()
+
+        if self._table_map is None:
+            # accessors were never created (or lazy ones never used)
+            self.invalidate()
+            self._init(refresh)
+        else:
+            self._apply_table_map(self._map_tables(refresh, schemas), schemas)
+
+    def _apply_table_map(self, new_map, schemas=None):
+        """Update accessors to match new_map, a result of _map_tables."""
+
+        old_map = self._table_map
+        if old_map is None:
+            self.invalidate()
+            self._init(table_map=new_map)
+            return
+
+        if schemas is not None:
+            schemas = set(schemas)
+            new_map = {
+                **{k: v for k, v in old_map.items() if k.schema not in schemas},
+                **{k: v for k, v in new_map.items() if k.schema in schemas},
+            }
+
+        removed = [table for table, ident in old_map.items() if new_map.get(table) != ident]
+        added = {table: ident for table, ident in new_map.items() if old_map.get(table) != ident}
+
+        # query results may depend on any table, so their columns are always dropped
+        if self._query_cache is not None:
+            self._query_cache.invalidate()
+
+        self._invalidate_tables([old_map[table] for table in removed])
+
+        for ident_schema in {ident.schema for ident in added.values()}:
+            if ident_schema is not None:
+                self._reflector.expire_schema(ident_schema)
+
+        if schemas is not None:
+            stale = {ident.schema for table, ident in old_map.items() if table.schema in schemas}
+            for ident_schema in stale:
+                self.invalidate(schema=ident_schema)
+
+        self._table_map = new_map
+
+        if added or removed:
+            self._column_catalog = None
+            self._column_catalog_names = None
+
+        if self._lazy:
+            # lazy accessors are cheap to create, and only format the tables used
+            self._accessors = self._accessor_builder.create_lazy_accessors(
+                self._engine,
+                self._create_table,
+                self._get_table_map,
+                self._to_frame,
+            )
+        elif added or removed:
+            with span(self._engine, "create_accessors", rows=len(added) + len(removed)):
+                self._accessor_builder.update_accessors(
+                    self._accessors,
+                    self._engine,
+                    self._create_table,
+                    added,
+                    removed,
+                    self._to_frame,
+                )
+
+    def invalidate(self, name=None, schema=None):
+        """Remove cached columns for a table, or for all tables in a schema.
+
+        This clears both column names and reflected tables. If neither name nor
+        schema are specified, everything cached is cleared. Any prefetch running
+        is cancelled first, so that it does not cache what was just cleared.
+        """
+
+        self._stop_prefetch()
+
+        self._reflector.invalidate(name, schema)
+        self._invalidate_search_columns(name, schema)
+
+        # the column catalog is loaded in one query, so is always fully reloaded
+        self._column_catalog = None
+        self._column_catalog_names = None
+
+        if self._column_cache is None:
+            return
+
+        # query results may depend on any table, so their columns are always dropped
+        self._query_cache.invalidate()
+
+        if name is not None:
+            self._column_cache.invalidate((schema, name))
+        elif schema is not None:
+            self._column_cache.invalidate_if(lambda key: key[0] == schema)
+        else:
+            self._column_cache.invalidate()
+
+    def _invalidate_tables(self, idents):
+        """Like invalidate, but for many tables at once (e.g. those removed by reset)."""
+
+        if not idents:
+            return
+
+        self._stop_prefetch()
+
+        keys = {(ident.schema, ident.table) for ident in idents}
+        self._reflector.invalidate_tables((table, schema) for schema, table in keys)
+
+        for table, ident in list(self._search_columns.items()):
+            if (ident.schema, ident.table) in keys:
+                self._search_index.remove(table, "column")
+                del self._search_columns[table]
+
+        self._column_catalog = None
+        self._column_catalog_names = None
+
+        if self._column_cache is not None:
+            self._column_cache.invalidate(*keys)
+
+    def _invalidate_search_columns(self, name=None, schema=None):
+        for table, ident in list(self._search_columns.items()):
+            if name is not None and (ident.table, ident.schema) != (name, schema):
+                continue
+            elif schema is not None and ident.schema != schema:
+                continue
+
+            self._search_index.remove(table, "column")
+            del self._search_columns[table]
+
+    def cache_info(self):
+        """Return hit, miss, and eviction counts for the column name caches."""
 
-    def list(self, raw=False):
-        dialect = self._engine.dialect
-        with self._engine.connect() as conn:
-            tables = self._table_finder.list_tables(dialect, conn)
+        if self._column_cache is None:
+            return {}
+
+        return {
+            "columns": self._column_cache.stats(),
+            "queries": self._query_cache.stats(),
+        }
+
+    def list(self, raw=False, refresh=False):
+        with connect(self._engine) as conn:
+            return self._list(conn, raw, refresh)
+
+    def _list(self, conn, raw=False, refresh=False):
+        dialect = conn.dialect
+        tables = self._table_finder.list_tables(dialect, conn, **_refresh_kwargs(refresh))
 
         if raw:
             return tables
@@ -86,10 +391,229 @@ class DbCooper:
 
             return results
 
-    def query(self, query):
-        expr = query_to_tbl(self._engine, query)
-        return self._to_frame(self._engine, expr)
+    def query(self, query, **kwargs):
+        """Fetch the results of a query, passing any keyword arguments to to_frame."""
+
+        expr = query_to_tbl(self._engine, query, self._query_cache)
+
+        with span(self._engine, "collect", sql=query):
+            return self._to_frame(self._engine, expr, **kwargs)
+
+    def tbl(self, name, schema=None, **kwargs):
+        """Fetch a table, passing any keyword arguments to to_frame."""
+
+        expr = name_to_tbl(self._engine, name, schema, self._column_cache)
+
+        with span(self._engine, "collect", table=name, schema=schema):
+            return self._to_frame(self._engine, expr, **kwargs)
+
+    def stats(self):
+        """Summarize the spans received by this object's tracer, by span name.
+
+        This requires a tracer with a summary method, like StatsTracer.
+        """
+
+        if self._tracer is None or not hasattr(self._tracer, "summary"):
+            raise ValueError(
+                "stats() requires a tracer with a summary method. For example, "
+                "DbCooper(..., tracer=StatsTracer())."
+            )
+
+        return self._tracer.summary()
+
+    def search(self, text, limit=10, columns=False):
+        """Return names of table accessors matching text, best match first.
+
+        Matching is fuzzy, so that "salary" finds tables named salaries. Set columns
+        to True to also match tables by their column names and descriptions. This
+        fetches columns a schema at a time (using the same queries as documented
+        table accessors), for dialects that support it.
+
+        Examples
+        --------
+        >>> dbc.search("salary") # doctest: +SKIP
+        ['lahman_salaries']
+        """
+
+        self._update_search_index(columns)
+
+        return [self._search_names[table] for table, score in self._search_index.search(text, limit)]
+
+    def _update_search_index(self, columns=False):
+        table_map = self._get_table_map()
+        index = self._search_index
+
+        if table_map is not self._search_table_map:
+            # remove tables that no longer exist, and add new ones
+            for table in [t for t in self._search_names if t not in table_map]:
+                index.remove(table)
+                del self._search_names[table]
+                self._search_columns.pop(table, None)
+
+            dialect = self._engine.dialect
+            for table in table_map:
+                if table not in self._search_names:
+                    self._search_names[table] = self._accessor_builder.accessor_path(dialect, table)
+                    index.add(table, table.to_tuple(exists=True))
+
+            self._search_table_map = table_map
+
+        if not columns or len(self._search_columns) == len(table_map):
+            return
+
+        for table, ident in table_map.items():
+            if table in self._search_columns:
+                continue
+
+            self._search_columns[table] = ident
+
+            if ident.schema is None:
+                continue
+
+            self._reflector.reflect_schema(ident.schema)
+            sqla_table = self._reflector.metadata.tables.get(_table_key(ident.table, ident.schema))
+            if sqla_table is None:
+                continue
+
+            text = [col.name for col in sqla_table.columns]
+            text.extend(col.comment for col in sqla_table.columns if col.comment)
+            if sqla_table.comment:
+                text.append(sqla_table.comment)
+
+            index.add(table, text, "column")
+
+    def prefetch(self, tables=None, n=None) -> Prefetcher:
+        """Fetch the columns of tables in background threads, before they are used.
+
+        This warms the caches used by table accessors (columns for simple tables,
+        or reflected schemas for documented ones), without blocking other calls.
+        Any prefetch already running is cancelled. Call cancel on the result to stop.
+
+        Parameters
+        ----------
+        tables:
+            Names of table accessors to prefetch (e.g. "main_batting").
+        n:
+            Number of most used tables to prefetch. This requires a usage_tracker.
+
+        Examples
+        --------
+        >>> from dbcooper import UsageTracker
+        >>> dbc = DbCooper(engine, usage_tracker=UsageTracker(), prefetch=20) # doctest: +SKIP
+        >>> dbc.prefetch(["lahman_batting", "lahman_salaries"]) # doctest: +SKIP
+        """
+
+        if tables is None and n is None:
+            raise ValueError("Either tables or n must be specified.")
+
+        if n is not None and self._usage_tracker is None:
+            raise ValueError("Prefetching the most used tables requires a usage_tracker.")
+
+        if self._prefetcher is not None:
+            self._prefetcher.cancel()
+
+        self._prefetcher = Prefetcher(
+            self._engine,
+            self._prefetch_table,
+            partial(self._prefetch_items, tables, n),
+            workers=self._prefetch_workers,
+        )
+        return self._prefetcher.start()
+
+    def _stop_prefetch(self):
+        """Cancel any running prefetch, and wait for items being warmed to finish."""
+
+        if self._prefetcher is not None:
+            self._prefetcher.cancel()
+            self._prefetcher.wait()
+            self._prefetcher = None
+
+    def _prefetch_items(self, tables, n):
+        """Return (schema, table name) pairs to prefetch. Called in a background thread."""
+
+        items = []
+        if tables is not None:
+            dialect = self._engine.dialect
+            wanted = set(tables)
+
+            for table, ident in self._get_table_map().items():
+                if self._accessor_builder.accessor_path(dialect, table) in wanted:
+                    items.append((ident.schema, ident.table))
+
+        if n is not None:
+            items.extend(self._usage_tracker.most_used(self._engine, n))
+
+        return list(dict.fromkeys(items))
+
+    def _prefetch_table(self, item):
+        schema, table_name = item
+
+        factory = self._table_factory
+        if isinstance(factory, type) and issubclass(factory, DbcDocumentedTable):
+            if schema is None:
+                # these are reflected a table at a time, while holding the
+                # reflector's lock, which would block foreground reflection
+                return False
+
+            self._reflector.prefetch_schema(schema)
+        elif self._column_cache is not None and (schema, table_name) not in self._column_cache:
+            name_to_tbl(self._engine, table_name, schema, self._column_cache)
+
+    def stats_for(self, name, schema=None) -> TableStats | None:
+        """Return a table's approximate row count and size, from catalog statistics.
+
+        Statistics for every table in the schema are fetched with a single catalog
+        query (table data is never scanned), and kept until the next invalidate.
+        Returns None if the database has no statistics for the table.
+
+        Examples
+        --------
+        >>> dbc.stats_for("batting", "lahman") # doctest: +SKIP
+        TableStats(schema='lahman', table='batting', rows=110495, bytes=18415616)
+        """
+
+        return self._reflector.get_stats(name, schema)
+
+    def tables_with_column(self, name, case_sensitive=False):
+        """Return names of table accessors for tables that have a column.
+
+        The first call fetches every column in the database with a single catalog
+        query. Later calls use these results, until the next reset or invalidate.
+
+        Examples
+        --------
+        >>> dbc.tables_with_column("playerID") # doctest: +SKIP
+        ['lahman_batting', 'lahman_salaries', ...]
+        """
+
+        catalog, names = self._get_column_catalog()
+
+        return [
+            names[key] for key in catalog.tables_with_column(name, case_sensitive)
+            if key in names
+        ]
+
+    def _get_column_catalog(self):
+        if self._column_catalog is None:
+            dialect = self._engine.dialect
+
+            with span(self._engine, "list_columns") as attrs:
+                with connect(self._engine) as conn:
+                    kwargs = self._table_finder._dialect_kwargs(dialect)
+                    catalog = ColumnCatalog(list_columns(dialect, conn, **kwargs))
+
+                attrs["rows"] = len(catalog)
+
+            # catalog rows hold plain schema and table names, so match them to the
+            # listed tables (whose identities may be quoted or include the database).
+            # Rows only have a database when tables span databases, so tables are
+            # also matched without one.
+            names = {}
+            for table in self._get_table_map():
+                path = self._accessor_builder.accessor_path(dialect, table)
+                names[(table.database, table.schema, table.table)] = path
+                names.setdefault((None, table.schema, table.table), path)
+
+            self._column_catalog, self._column_catalog_names = catalog, names
 
-    def tbl(self, name, schema=None):
-        expr = name_to_tbl(self._engine, name, schema)
-        return self._to_frame(self._engine, expr)
+        return self._column_catalog, self._column_catalog_names
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import time
+import warnings
+
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from .dbcooper import DbCooper
+from .finder import AccessorHierarchyBuilder
+
+from typing import TYPE_CHECKING, Mapping
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+
+class FederatedDbCooper:
+    """Table accessors for several databases, whose tables are listed concurrently.
+
+    Each database gets its own DbCooper, accessed by name. For example, a postgres
+    engine named "pg" has accessors like ``dbc.pg.sales.orders``.
+
+    Parameters
+    ----------
+    engines:
+        Mapping of name to a sqlalchemy engine (or url string), or a DbCooper.
+    timeout:
+        Seconds to wait for each database's tables to be listed. This may be a
+        mapping of name to timeout. Databases that take longer (or fail) are left
+        without accessors, and their errors recorded in the errors attribute.
+    max_workers:
+        Number of threads used to list tables. Defaults to the number of engines.
+    **kwargs:
+        Passed to DbCooper, for engines that are not already a DbCooper. By default,
+        accessors are nested by schema (using AccessorHierarchyBuilder).
+
+    Examples
+    --------
+    >>> dbc = FederatedDbCooper({"pg": pg_engine, "lake": duckdb_engine}) # doctest: +SKIP
+    >>> dbc.pg.sales.orders() # doctest: +SKIP
+    """
+
+    def __init__(
+        self,
+        engines: "Mapping[str, str | Engine | DbCooper]",
+        timeout: "float | Mapping[str, float] | None" = None,
+        max_workers: "int | None" = None,
+        initialize=True,
+        **kwargs,
+    ):
+        kwargs.setdefault("accessor_builder", AccessorHierarchyBuilder())
+
+        self._members = {
+            name: engine if isinstance(engine, DbCooper) else DbCooper(engine, initialize=False, **kwargs)
+            for name, engine in engines.items()
+        }
+        self._timeout = timeout
+        self._max_workers = max_workers
+
+        # name -> exception raised (or TimeoutError) the last time tables were listed
+        self.errors = {}
+
+        if initialize:
+            self.reset()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({list(self._members)})"
+
+    def __getattr__(self, k):
+        if k.startswith("_"):
+            raise AttributeError(k)
+
+        if k in self._members:
+            return self._members[k]
+
+        raise AttributeError("No such attribute %s" % k)
+
+    def __getitem__(self, k):
+        return self._members[k]
+
+    def __dir__(self):
+        return ["reset", "errors"] + list(self._members)
+
+    def _ipython_key_completions_(self):
+        return list(self._members)
+
+    def _get_timeout(self, name):
+        if isinstance(self._timeout, Mapping):
+            return self._timeout.get(name)
+
+        return self._timeout
+
+    def reset(self, refresh=False, names=None):
+        """List the tables in each database concurrently, and update accessors.
+
+        Parameters
+        ----------
+        refresh:
+            Whether to list tables from the database, even if a table finder has
+            a cached listing.
+        names:
+            If specified, only reset the databases with these names.
+        """
+
+        names = list(self._members) if names is None else list(names)
+        if not names:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=self._max_workers or len(names))
+        start = time.monotonic()
+
+        try:
+            futures = {
+                name: executor.submit(self._members[name]._map_tables, refresh)
+                for name in names
+            }
+
+            for name, future in futures.items():
+                timeout = self._get_timeout(name)
+                remaining = None if timeout is None else max(0, start + timeout - time.monotonic())
+
+                try:
+                    table_map = future.result(timeout=remaining)
+                except TimeoutError:
+                    self.errors[name] = TimeoutError(
+                        f"Listing tables for {name!r} took longer than {timeout} seconds."
+                    )
+                    continue
+                except Exception as err:
+                    self.errors[name] = err
+                    continue
+
+                # accessors are created here, rather than in the worker threads,
+                # so a member is never updated by a listing that timed out.
+                self._members[name]._apply_table_map(table_map)
+                self.errors.pop(name, None)
+        finally:
+            # don't wait on threads still listing tables for a stalled database
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        failed = [name for name in names if name in self.errors]
+        if failed:
+            warnings.warn(
+                f"Could not list tables for {failed}. See the errors attribute for details."
+            )
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 from collections.abc import Mapping
+from copy import copy
+from functools import partial
 
+from .catalog import TableCatalog
 from .inspect import TableName, TableIdentity, list_tables, format_table, identify_table
+from .trace import span
 
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Callable, Iterable, Sequence
 
 
 if TYPE_CHECKING:
+    from .cache import CatalogCache
     from .tables import DbcSimpleTable
 
 
@@ -47,6 +52,9 @@ class AttributeDict(Mapping):
     def __setitem__(self, k, v):
         self._d[k] = v
 
+    def __delitem__(self, k):
+        del self._d[k]
+
     def __dir__(self):
         return list(self._d.keys())
 
@@ -55,6 +63,81 @@ class AttributeDict(Mapping):
         return f"{self.__class__.__name__}({repr_d})"
 
 
+class LazyAttributeDict(AttributeDict):
+    """An AttributeDict whose keys are loaded, and items created, on first use.
+
+    Parameters
+    ----------
+    load:
+        A function with no arguments. It should return a dictionary mapping each
+        key to a function with no arguments that creates the item for that key.
+    create:
+        If specified, the dictionary returned by load may map keys to any value,
+        and items are created by passing that value to create.
+    """
+
+    def __init__(self, load, create=None):
+        self._load = load
+        self._create = create
+        self._factories = None
+        self._d = {}
+
+    @property
+    def is_loaded(self):
+        return self._factories is not None
+
+    def _get_factories(self):
+        if self._factories is None:
+            self._factories = self._load()
+
+        return self._factories
+
+    def __getitem__(self, k):
+        if k not in self._d:
+            factory = self._get_factories()[k]
+            self._d[k] = factory() if self._create is None else self._create(factory)
+
+        return self._d[k]
+
+    def __contains__(self, k):
+        return k in self._get_factories()
+
+    def __iter__(self):
+        return iter(self._get_factories())
+
+    def __len__(self):
+        return len(self._get_factories())
+
+    def __getattr__(self, k):
+        if k.startswith("__"):
+            raise AttributeError(k)
+
+        if k in self._get_factories():
+            return self[k]
+
+        raise AttributeError("No attribute %s" % k)
+
+    def __setitem__(self, k, v):
+        # items already created are never recreated, so no factory is needed
+        self._get_factories()[k] = None
+        self._d[k] = v
+
+    def __dir__(self):
+        return list(self._get_factories())
+
+    def __repr__(self):
+        if not self.is_loaded:
+            return f"{self.__class__.__name__}(<not loaded>)"
+
+        return f"{self.__class__.__name__}({list(self._factories)})"
+
+
+
+def _refresh_kwargs(refresh):
+    # refresh is only passed when set, so that custom list_tables and map_tables
+    # implementations without it keep working
+    return {"refresh": True} if refresh else {}
+
 
 class TableFinder:
     # TODO: rename exclude_schemas
@@ -62,14 +145,72 @@ class TableFinder:
     def __init__(self,
         exclude_schemas=None,
         identify_from_part=None,
+        cache: "CatalogCache | None" = None,
+        max_workers: "int | None" = None,
+        include_schemas: "Sequence[str] | None" = None,
+        table_like: "str | None" = None,
+        table_regex: "str | None" = None,
     ):
-        # TODO: filter method
+        # schema and table filters are applied in the catalog query, where the
+        # dialect supports it (see inspect.list_tables)
         self.exclude_schemas = exclude_schemas
+        self.include_schemas = include_schemas
+        self.table_like = table_like
+        self.table_regex = table_regex
+
         self.identify_from_part = identify_from_part
+        self.cache = cache
+        # threads used by dialects that list tables concurrently (e.g. bigquery)
+        self.max_workers = max_workers
+
+    def _cache_key(self, dialect, conn):
+        return self.cache.make_key(
+            conn.engine.url,
+            dialect.name,
+            self.exclude_schemas,
+            *self._filter_kwargs().items(),
+        )
+
+    def _filter_kwargs(self):
+        filters = dict(include=self.include_schemas, like=self.table_like, regex=self.table_regex)
+
+        # only filters that are set are passed, so that custom list_tables
+        # implementations without them keep working
+        return {k: v for k, v in filters.items() if v is not None}
+
+    def _dialect_kwargs(self, dialect):
+        # only dialects that list concurrently (bigquery) take max_workers
+        if self.max_workers is not None and dialect.name == "bigquery":
+            return {"max_workers": self.max_workers}
+
+        return {}
+
+    def _list_tables(self, dialect, conn):
+        kwargs = {**self._filter_kwargs(), **self._dialect_kwargs(dialect)}
 
-    def list_tables(self, dialect, conn):
         # first use generic method that dispatches on dialect name
-        return list_tables(dialect, conn, self.exclude_schemas)
+        return list_tables(dialect, conn, self.exclude_schemas, **kwargs)
+
+    def list_tables(self, dialect, conn, refresh=False):
+        with span(conn.engine, "list_tables") as attrs:
+            if self.cache is None:
+                tables = self._list_tables(dialect, conn)
+                attrs["rows"] = len(tables)
+                return tables
+
+            key = self._cache_key(dialect, conn)
+
+            if not refresh:
+                tables = self.cache.get(key)
+                if tables is not None:
+                    attrs.update(rows=len(tables), cache="hit")
+                    return tables
+
+            tables = self._list_tables(dialect, conn)
+            self.cache.set(key, tables)
+            attrs.update(rows=len(tables), cache="miss")
+
+            return tables
 
 
     def identify_table(self, dialect, table: TableName):
@@ -78,17 +219,34 @@ class TableFinder:
     def join_identifiers(self, ident: TableIdentity):
         return f"{ident.schema}.{ident.table}"
 
-    def map_tables(self, dialect, conn) -> Mapping[TableName, TableIdentity]:
-        table_map = {}
-        table_names = self.list_tables(dialect, conn)
+    def map_tables(self, dialect, conn, refresh=False) -> Mapping[TableName, TableIdentity]:
+        table_map = TableCatalog()
+        table_names = self.list_tables(dialect, conn, **_refresh_kwargs(refresh))
 
-        for name in table_names:
-            ident_table = self.identify_table(dialect, name)
-            table_map[name] = ident_table
+        with span(conn.engine, "identify_tables", rows=len(table_names)):
+            for name in table_names:
+                ident_table = self.identify_table(dialect, name)
+                table_map[name] = ident_table
 
         return table_map
 
 
+def _schema_finder(finder, schemas):
+    """Return a copy of finder that only lists tables in schemas (e.g. for a reset)."""
+
+    if schemas is None or not isinstance(finder, TableFinder):
+        # custom finders are used as is, and their results filtered afterwards
+        return finder
+
+    new_finder = copy(finder)
+    if finder.include_schemas is None:
+        new_finder.include_schemas = list(schemas)
+    else:
+        new_finder.include_schemas = [s for s in schemas if s in finder.include_schemas]
+
+    return new_finder
+
+
 class AccessorBuilder:
     def __init__(
         self,
@@ -114,18 +272,87 @@ class AccessorBuilder:
                 "Unknown name_format argument type: {type(self.name_format)}"
             )
 
-    def create_accessors(self, engine, table_factory: DbcSimpleTable, table_map: Mapping[TableName, TableIdentity], to_frame):
-        accessors = AttributeDict()
+    def accessor_path(self, dialect, table: TableName) -> str:
+        """Return the name used to access a table, e.g. "some_schema_some_table"."""
+
+        return self.format_table(dialect, table)
+
+    def _format_names(self, dialect, tables: Iterable[TableName]) -> dict[str, TableName]:
+        """Return a dictionary mapping each formatted name to its table."""
+
+        names = {}
+
+        for table in tables:
+            fmt_name = self.format_table(dialect, table)
+            if fmt_name in names:
+                raise Exception("multiple tables w/ formatted name: %s" % fmt_name)
+
+            names[fmt_name] = table
+
+        return names
+
+    def _create_factories(self, engine, table_factory: DbcSimpleTable, table_map: Mapping[TableName, TableIdentity], to_frame):
+        """Return a dictionary mapping each formatted name to a table constructor."""
+
+        factories = {}
 
         for table, ident in table_map.items():
             fmt_name = self.format_table(engine.dialect, table)
+            if fmt_name in factories:
+                raise Exception("multiple tables w/ formatted name: %s" % fmt_name)
+
+            factories[fmt_name] = partial(table_factory, engine, ident.table, ident.schema, to_frame)
+
+        return factories
+
+    def create_accessors(self, engine, table_factory: DbcSimpleTable, table_map: Mapping[TableName, TableIdentity], to_frame):
+        factories = self._create_factories(engine, table_factory, table_map, to_frame)
+
+        return AttributeDict({k: create_table() for k, create_table in factories.items()})
+
+    def update_accessors(self, accessors, engine, table_factory: DbcSimpleTable, added: Mapping[TableName, TableIdentity], removed: Iterable[TableName], to_frame):
+        """Add and remove tables from the result of create_accessors, in place.
+
+        Accessors for all other tables are left as they are.
+        """
+
+        for table in removed:
+            fmt_name = self.format_table(engine.dialect, table)
+            if fmt_name in accessors:
+                del accessors[fmt_name]
+
+        factories = self._create_factories(engine, table_factory, added, to_frame)
+        for fmt_name, create_table in factories.items():
             if fmt_name in accessors:
                 raise Exception("multiple tables w/ formatted name: %s" % fmt_name)
 
-            accessors[fmt_name] = table_factory(engine, ident.table, ident.schema, to_frame)
+            accessors[fmt_name] = create_table()
 
         return accessors
 
+    def create_lazy_accessors(self, engine, table_factory: DbcSimpleTable, load_table_map: Callable[[], Mapping[TableName, TableIdentity]], to_frame):
+        """Return accessors that only list tables, and create table objects, on first use.
+
+        Note that load_table_map is a function with no arguments, returning the
+        same mapping that create_accessors takes as its table_map argument.
+        """
+
+        # only the table for each name is kept, rather than a table constructor,
+        # so that catalogs with many tables need less memory.
+        table_map = None
+
+        def load():
+            nonlocal table_map
+            table_map = load_table_map()
+
+            return self._format_names(engine.dialect, table_map)
+
+        def create(table):
+            ident = table_map[table]
+            return table_factory(engine, ident.table, ident.schema, to_frame)
+
+        return LazyAttributeDict(load, create)
+
 
 class AccessorHierarchyBuilder(AccessorBuilder):
     def __init__(
@@ -135,6 +362,15 @@ class AccessorHierarchyBuilder(AccessorBuilder):
         self.format_from_part="table"
         self.omit_database = omit_database
 
+    def accessor_path(self, dialect, table: TableName) -> str:
+        """Return the attributes used to access a table, e.g. "some_schema.some_table"."""
+
+        levels = [table.schema, self.format_table(dialect, table)]
+        if not self.omit_database:
+            levels.insert(0, table.database)
+
+        return ".".join(str(level) for level in levels)
+
     def _group_by_level(self, table_map):
         from itertools import groupby
 
@@ -146,13 +382,10 @@ class AccessorHierarchyBuilder(AccessorBuilder):
         grouped = groupby(sorted_items, lambda x: (x[0].database, x[0].schema))
         return {group_key: dict(iter_) for group_key, iter_ in grouped}
 
-    def create_accessors(self, engine, table_factory, table_map, to_frame):
-
-        grouped = self._group_by_level(table_map)
-
+    def _nest_by_level(self, grouped, create_node):
         res = AttributeDict()
         for (db, schema), sub_map in grouped.items():
-            sub_accessors = super().create_accessors(engine, table_factory, sub_map, to_frame)
+            sub_accessors = create_node(sub_map)
             acc_db = _set_default(res, db, AttributeDict())
             if schema in acc_db:
                 raise ValueError(
@@ -174,3 +407,65 @@ class AccessorHierarchyBuilder(AccessorBuilder):
 
         return res
 
+    def create_accessors(self, engine, table_factory, table_map, to_frame):
+        create_node = super().create_accessors
+
+        grouped = self._group_by_level(table_map)
+
+        return self._nest_by_level(
+            grouped,
+            lambda sub_map: create_node(engine, table_factory, sub_map, to_frame)
+        )
+
+    def update_accessors(self, accessors, engine, table_factory, added, removed, to_frame):
+        update_node = super().update_accessors
+        create_node = super().create_accessors
+
+        def get_schema_nodes(db, create=False):
+            if self.omit_database:
+                return accessors
+            elif create:
+                return _set_default(accessors, db, AttributeDict())
+
+            return accessors.get(db, {})
+
+        # remove tables, and then any schema (or database) left without tables
+        for (db, schema), sub_map in self._group_by_level(dict.fromkeys(removed)).items():
+            schema_nodes = get_schema_nodes(db)
+            if schema not in schema_nodes:
+                continue
+
+            node = update_node(schema_nodes[schema], engine, table_factory, {}, sub_map, to_frame)
+            if not node:
+                del schema_nodes[schema]
+
+            if not schema_nodes and not self.omit_database:
+                del accessors[db]
+
+        # add tables to existing schema nodes, or create new nodes
+        for (db, schema), sub_map in self._group_by_level(added).items():
+            schema_nodes = get_schema_nodes(db, create=True)
+
+            if schema in schema_nodes:
+                update_node(schema_nodes[schema], engine, table_factory, sub_map, [], to_frame)
+            else:
+                schema_nodes[schema] = create_node(engine, table_factory, sub_map, to_frame)
+
+        return accessors
+
+    def create_lazy_accessors(self, engine, table_factory, load_table_map, to_frame):
+        # the catalog is listed when the top level is first used, but the tables
+        # in each schema node are only formatted and created when that node is used.
+        create_node = super().create_lazy_accessors
+
+        def load():
+            grouped = self._group_by_level(load_table_map())
+            nested = self._nest_by_level(
+                grouped,
+                lambda sub_map: create_node(engine, table_factory, lambda: sub_map, to_frame)
+            )
+
+            return {k: (lambda v=v: v) for k, v in nested.items()}
+
+        return LazyAttributeDict(load)
+
@@ -1,100 +1,208 @@
 import itertools
+import json
+import re
+
+from concurrent.futures import ThreadPoolExecutor
+from inspect import signature
 
 from sqlalchemy import sql
+from sqlalchemy.sql import sqltypes
+from sqlalchemy.types import NullType
 from sqlalchemy.sql.elements import quoted_name
 from sqlalchemy.engine import Dialect
 
 from .utils import SingleGeneric
-from .base import TableName, TableIdentity
+from .base import TableName, TableIdentity, ColumnInfo, TableStats
 
 from typing import Sequence
 
 
 
 # list_tables generic =========================================================
+#
+# Each implementation takes these optional filters, and applies as many as it can
+# in the catalog query (or API calls), so that unused rows are never fetched:
+#
+# * exclude: schemas to leave out (each dialect has a default).
+# * include: if specified, the only schemas to list.
+# * like: a SQL LIKE pattern table names must match (with the database's case
+#   sensitivity rules).
+# * regex: a regular expression table names must contain a match for.
+#
+# Filters that can't be pushed down are applied to the results in python, using
+# _filter_result.
 
 list_tables = SingleGeneric("list_tables")
 
+
+def _like_to_regex(pattern: str) -> str:
+    parts = [".*" if c == "%" else "." if c == "_" else re.escape(c) for c in pattern]
+    return "^" + "".join(parts) + "$"
+
+
+def _filter_result(
+    result: Sequence[TableName],
+    exclude: "Sequence | set" = (),
+    include: "Sequence | set | None" = None,
+    like: "str | None" = None,
+    regex: "str | None" = None,
+) -> Sequence[TableName]:
+    exclude_set = set(exclude or ())
+    include_set = set(include) if include is not None else None
+    like_re = re.compile(_like_to_regex(like), re.DOTALL) if like is not None else None
+    search_re = re.compile(regex) if regex is not None else None
+
+    return [
+        entry for entry in result
+        if entry.schema not in exclude_set
+        and (include_set is None or entry.schema in include_set)
+        and (like_re is None or like_re.match(entry.table))
+        and (search_re is None or search_re.search(entry.table))
+    ]
+
+
+def _filter_clauses(schema_col, table_col, exclude=None, include=None, like=None, regex=None, regex_op=None):
+    """Return sql conditions filtering tables, and the parameters they use.
+
+    Conditions are joined with AND (and start with one), so they can be added to
+    an existing WHERE clause. regex_op formats the condition for a regex, using
+    the column and a :table_regex parameter. If it is None, the regex is not used.
+    """
+
+    conds, params = [], {}
+
+    if exclude:
+        conds.append(f"{schema_col} NOT IN :exclude_schemas")
+        params["exclude_schemas"] = list(exclude)
+    if include is not None:
+        conds.append(f"{schema_col} IN :include_schemas")
+        params["include_schemas"] = list(include)
+    if like is not None:
+        conds.append(f"{table_col} LIKE :table_like")
+        params["table_like"] = like
+    if regex is not None and regex_op is not None:
+        conds.append(regex_op.format(table_col))
+        params["table_regex"] = regex
+
+    return "".join(f"\n AND {cond}" for cond in conds), params
+
+
+def _text_with_params(query_str, params):
+    query = sql.text(query_str)
+
+    expanding = [k for k in params if k in ("exclude_schemas", "include_schemas")]
+    if expanding:
+        query = query.bindparams(*[sql.bindparam(k, expanding=True) for k in expanding])
+
+    return query
+
+
 @list_tables.register("sqlite")
-def _list_tables_sqlite(self: Dialect, conn, exclude=None) -> Sequence[TableName]:
+def _list_tables_sqlite(self: Dialect, conn, exclude=None, include=None, like=None, regex=None) -> Sequence[TableName]:
     if exclude is None:
         exclude = ("INFORMATION_SCHEMA",)
 
-    schemas = self.get_schema_names(conn)
-    query_str = """SELECT name FROM {0} WHERE type='table' ORDER BY name"""
+    schemas = [
+        schema for schema in self.get_schema_names(conn)
+        if schema not in exclude and (include is None or schema in include)
+    ]
 
-    results = []
-    for schema in schemas:
-        if schema in exclude:
-            continue
+    if not schemas:
+        return []
+
+    # each attached database has its own sqlite_master table, so query them all at
+    # once with UNION ALL. Note that sqlite allows at most 125 attached databases
+    # (10 by default), well below its limit of 500 SELECTs in a compound query.
+    like_clause = "AND name LIKE :like" if like is not None else ""
 
+    queries = []
+    for ii, schema in enumerate(schemas):
         qschema = self.identifier_preparer.quote_identifier(schema)
-        qmaster = f"{qschema}.sqlite_master"
-        q = conn.exec_driver_sql(query_str.format(qmaster))
+        queries.append(f"""
+            SELECT {ii} AS schema_pos, name FROM {qschema}.sqlite_master
+            WHERE type IN ('table', 'view') {like_clause}
+        """)
 
-        for row in q:
-            results.append(TableName(None, schema, row[0]))
+    q = conn.exec_driver_sql(
+        " UNION ALL ".join(queries) + " ORDER BY schema_pos, name",
+        {"like": like} if like is not None else {},
+    )
+
+    results = [TableName(None, schemas[pos], name) for pos, name in q]
+
+    # sqlite has no regex function by default
+    if regex is not None:
+        return _filter_result(results, regex=regex)
 
     return results
 
 
 @list_tables.register("mysql")
-def _list_tables_mysql(self: Dialect, conn, exclude=None) -> Sequence[TableName]:
+def _list_tables_mysql(self: Dialect, conn, exclude=None, include=None, like=None, regex=None) -> Sequence[TableName]:
     if exclude is None:
         exclude = tuple()
 
-    q = conn.execute("""
+    filters, params = _filter_clauses(
+        "TABLE_SCHEMA", "TABLE_NAME", exclude, include, like, regex, "{} REGEXP :table_regex"
+    )
+
+    q = conn.execute(_text_with_params(f"""
         SELECT table_schema AS "schema", table_name as "name"
         FROM INFORMATION_SCHEMA.TABLES
         WHERE
             TABLE_TYPE='BASE TABLE'
             AND TABLE_SCHEMA NOT IN ('mysql', 'performance_schema', 'sys')
-    """)
+            {filters}
+    """, params), params)
 
-    results = [TableName(None, row[0], row[1]) for row in q]
-    return _filter_result(results, exclude)
+    return [TableName(None, row[0], row[1]) for row in q]
         
 
 
 @list_tables.register("postgresql")
 @list_tables.register("duckdb")
-def _list_tables_pg(self: Dialect, conn, exclude=None) -> Sequence[TableName]:
+def _list_tables_pg(self: Dialect, conn, exclude=None, include=None, like=None, regex=None) -> Sequence[TableName]:
     if exclude is None:
         exclude = ("information_schema", "pg_catalog")
 
-    q = conn.execute(sql.text("""
+    filters, params = _filter_clauses(
+        "nspname", "relname", exclude, include, like, regex, "{} ~ :table_regex"
+    )
+
+    q = conn.execute(_text_with_params(f"""
         SELECT db.db_name, nspname, relname  FROM pg_class c
         JOIN pg_namespace n ON n.oid = c.relnamespace
         CROSS JOIN (SELECT current_database() AS db_name) db
         WHERE
             c.relkind in ('r', 'p', 'v')
-    """))
-
-    result = [TableName(*row) for row in q]
+            {filters}
+    """, params), params)
 
-    return _filter_result(result, exclude)
+    return [TableName(*row) for row in q]
 
 
 @list_tables.register("duckdb")
-def _list_tables_pg(self: Dialect, conn, exclude=None) -> Sequence[TableName]:
+def _list_tables_pg(self: Dialect, conn, exclude=None, include=None, like=None, regex=None) -> Sequence[TableName]:
     if exclude is None:
         exclude = ("information_schema", "pg_catalog")
 
-    q = conn.execute(sql.text("""
+    filters, params = _filter_clauses(
+        "table_schema", "table_name", exclude, include, like, regex,
+        "regexp_matches({}, :table_regex)",
+    )
+
+    q = conn.execute(_text_with_params(f"""
         SELECT db.db_name, table_schema, table_name FROM information_schema.tables c
         CROSS JOIN (SELECT current_database() AS db_name) db
-    """))
+        WHERE 1 = 1
+            {filters}
+    """, params), params)
 
-    result = [TableName(*row) for row in q]
+    return [TableName(*row) for row in q]
 
-    return _filter_result(result, exclude)
-
-
-@list_tables.register("snowflake")
-def _list_tables_sf(self: Dialect, conn, exclude=None) -> Sequence[TableName]:
 
-    if exclude is None:
-        exclude = ("INFORMATION_SCHEMA",)
+def _snowflake_scope(conn, schema=None):
+    """Return the default database name, and an IN clause for SHOW commands."""
 
     # snowflake sql supports urls with .../<database>/<schema>,
     # so we need to parse them out.
@@ -103,7 +211,10 @@ def _list_tables_sf(self: Dialect, conn, exclude=None) -> Sequence[TableName]:
     _, opts = engine.dialect.create_connect_args(engine.url)
     db_name, schema_name = opts.get("database"), opts.get("schema")
 
-    if schema_name:
+    if schema is not None:
+        full_name = schema if "." in schema or not db_name else ".".join([db_name, schema])
+        in_clause = f"IN SCHEMA {full_name}"
+    elif schema_name:
         full_name = ".".join([db_name, schema_name])
         in_clause = f"IN SCHEMA {full_name}"
     elif db_name:
@@ -111,54 +222,667 @@ def _list_tables_sf(self: Dialect, conn, exclude=None) -> Sequence[TableName]:
     else:
         in_clause = "IN ACCOUNT"
 
-    tables = conn.execute(sql.text(
-        "SHOW TERSE TABLES " + in_clause
-    ))
+    return db_name, in_clause
+
+
+@list_tables.register("snowflake")
+def _list_tables_sf(self: Dialect, conn, exclude=None, include=None, like=None, regex=None) -> Sequence[TableName]:
+
+    if exclude is None:
+        exclude = ("INFORMATION_SCHEMA",)
+
+    # included schemas are each listed with IN SCHEMA, rather than listing the
+    # whole database (or account).
+    if include is not None:
+        scopes = [_snowflake_scope(conn, schema) for schema in include]
+    else:
+        scopes = [_snowflake_scope(conn)]
 
-    views = conn.execute(sql.text(
-        "SHOW TERSE VIEWS " + in_clause
-    ))
+    # note that snowflake's LIKE in SHOW commands is case insensitive
+    like_clause = "LIKE :table_like " if like is not None else ""
+    params = {"table_like": like} if like is not None else {}
 
     result = []
-    for row in itertools.chain(tables, views):
-        if db_name:
-            # a default database is set. snowflake's dialect automatically prepends
-            # the default database name everywhere, so we need to set database
-            # to None in our results
-            result.append(TableName(None, row[4], row[1]))
-        else:
-            # no default database, so return database in results. this allows
-            # us to specify sqlalchemy.Table(..., schema="<database>.<schema>")
-            result.append(TableName(row[3], row[4], row[1]))
+    for db_name, in_clause in scopes:
+        tables = conn.execute(sql.text(
+            "SHOW TERSE TABLES " + like_clause + in_clause
+        ), params)
+
+        views = conn.execute(sql.text(
+            "SHOW TERSE VIEWS " + like_clause + in_clause
+        ), params)
 
-    return _filter_result(result, exclude)
+        for row in itertools.chain(tables, views):
+            if db_name:
+                # a default database is set. snowflake's dialect automatically prepends
+                # the default database name everywhere, so we need to set database
+                # to None in our results
+                result.append(TableName(None, row[4], row[1]))
+            else:
+                # no default database, so return database in results. this allows
+                # us to specify sqlalchemy.Table(..., schema="<database>.<schema>")
+                result.append(TableName(row[3], row[4], row[1]))
 
+    # SHOW commands can't exclude schemas, or match a regex
+    return _filter_result(result, exclude, regex=regex)
+
+
+# default number of threads used to list the tables in bigquery datasets
+BIGQUERY_LIST_WORKERS = 8
 
 @list_tables.register("bigquery")
-def _list_tables_bq(self: Dialect, conn, schema=None, exclude=None) -> Sequence[TableName]:
+def _list_tables_bq(self: Dialect, conn, exclude=None, include=None, like=None, regex=None, max_workers=None) -> Sequence[TableName]:
     if exclude is None:
         exclude = ("information_schema",)
 
+    if max_workers is None:
+        max_workers = BIGQUERY_LIST_WORKERS
+
     from google.api_core import exceptions
 
     client = conn.connection._client
-    datasets = client.list_datasets()
 
-    result = []
-    for dataset in datasets:
+    # excluded datasets are skipped, and included ones listed without listing
+    # every dataset, so only the tables in datasets that are used get listed.
+    if include is not None:
+        datasets = [name for name in include if name not in exclude]
+    else:
+        datasets = [ds.reference for ds in client.list_datasets() if ds.dataset_id not in exclude]
+
+    def list_dataset(dataset):
         try:
-            tables = client.list_tables(dataset.reference, self.list_tables_page_size)
+            tables = client.list_tables(dataset, self.list_tables_page_size)
 
-            for table in tables:
-                result.append(TableName(table.project, table.reference.dataset_id, table.table_id))
+            return [
+                TableName(table.project, table.reference.dataset_id, table.table_id)
+                for table in tables
+            ]
         except exceptions.NotFound:
-            pass
+            return []
+
+    # each dataset needs its own api calls, so list them concurrently.
+    # note that executor.map returns results in the same order as datasets.
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        result = list(itertools.chain.from_iterable(executor.map(list_dataset, datasets)))
+
+    # the api lists every table in a dataset
+    return _filter_result(result, like=like, regex=regex)
+
+
+# list_columns generic ========================================================
+#
+# Each implementation fetches every column in a schema (or, if schema is None, in
+# the whole database) using a single catalog query. Dialects without an
+# implementation raise a NotImplementedError, so callers can fall back to
+# reflecting tables one at a time.
+
+list_columns = SingleGeneric("list_columns")
+
+def _none_if_empty(x):
+    return x if x else None
+
+
+@list_columns.register("sqlite")
+def _list_columns_sqlite(self: Dialect, conn, schema=None) -> Sequence[ColumnInfo]:
+    schemas = self.get_schema_names(conn) if schema is None else [schema]
+
+    queries = []
+    for schema_name in schemas:
+        qschema = self.identifier_preparer.quote_identifier(schema_name)
+        lit_schema = schema_name.replace("'", "''")
+        queries.append(f"""
+            SELECT '{lit_schema}', m.name, p.name, p.type
+            FROM {qschema}.sqlite_master m
+            JOIN pragma_table_info(m.name, '{lit_schema}') p
+            WHERE m.type IN ('table', 'view')
+        """)
+
+    q = conn.exec_driver_sql(" UNION ALL ".join(queries))
+
+    return [ColumnInfo(*row) for row in q]
+
+
+@list_columns.register("mysql")
+def _list_columns_mysql(self: Dialect, conn, schema=None) -> Sequence[ColumnInfo]:
+    where = "AND c.table_schema = :schema" if schema is not None else ""
+    q = conn.execute(sql.text(f"""
+        SELECT
+            c.table_schema, c.table_name, c.column_name, c.column_type,
+            c.column_comment, t.table_comment
+        FROM information_schema.columns c
+        JOIN information_schema.tables t
+            ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+        WHERE
+            c.table_schema NOT IN ('mysql', 'performance_schema', 'sys')
+            {where}
+        ORDER BY c.table_schema, c.table_name, c.ordinal_position
+    """), {"schema": schema} if schema is not None else {})
+
+    return [
+        ColumnInfo(*row[:4], _none_if_empty(row[4]), _none_if_empty(row[5]))
+        for row in q
+    ]
+
+
+@list_columns.register("postgresql")
+def _list_columns_pg(self: Dialect, conn, schema=None) -> Sequence[ColumnInfo]:
+    # system schemas are left out unless asked for, as in list_tables
+    if schema is not None:
+        where = "AND n.nspname = :schema"
+    else:
+        where = "AND n.nspname NOT IN ('pg_catalog', 'information_schema')"
+
+    q = conn.execute(sql.text(f"""
+        SELECT
+            n.nspname, c.relname, a.attname, format_type(a.atttypid, a.atttypmod),
+            col_description(c.oid, a.attnum), obj_description(c.oid, 'pg_class')
+        FROM pg_attribute a
+        JOIN pg_class c ON c.oid = a.attrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE
+            c.relkind in ('r', 'p', 'v')
+            AND a.attnum > 0
+            AND NOT a.attisdropped
+            {where}
+        ORDER BY n.nspname, c.relname, a.attnum
+    """), {"schema": schema} if schema is not None else {})
+
+    return [ColumnInfo(*row) for row in q]
+
+
+@list_columns.register("duckdb")
+def _list_columns_duckdb(self: Dialect, conn, schema=None) -> Sequence[ColumnInfo]:
+    where = "AND c.schema_name = :schema" if schema is not None else ""
+    q = conn.execute(sql.text(f"""
+        SELECT
+            c.schema_name, c.table_name, c.column_name, c.data_type,
+            c.comment, t.comment
+        FROM duckdb_columns() c
+        LEFT JOIN duckdb_tables() t
+            ON t.database_name = c.database_name
+            AND t.schema_name = c.schema_name
+            AND t.table_name = c.table_name
+        WHERE
+            NOT c.internal
+            AND c.database_name = current_database()
+            {where}
+        ORDER BY c.schema_name, c.table_name, c.column_index
+    """), {"schema": schema} if schema is not None else {})
+
+    return [ColumnInfo(*row) for row in q]
+
+
+@list_columns.register("snowflake")
+def _list_columns_sf(self: Dialect, conn, schema=None) -> Sequence[ColumnInfo]:
+    # a single SHOW command covers the schema, the default database, or (if no
+    # database is set) the whole account
+    db_name, in_clause = _snowflake_scope(conn, schema)
+    q = conn.execute(sql.text("SHOW COLUMNS " + in_clause))
+
+    # columns are table_name, schema_name, column_name, data_type, null?, default,
+    # kind, expression, comment, database_name, autoincrement. Note that data_type
+    # is json, like {"type": "FIXED", "precision": 38, ...}.
+    result = []
+    for row in q:
+        if row[1] == "INFORMATION_SCHEMA":
+            continue
+
+        col_type = json.loads(row[3]).get("type") if row[3] else None
+
+        # without a default database, tables are listed with their database (see
+        # _list_tables_sf), so columns are too
+        database = None if db_name else row[9]
+        result.append(
+            ColumnInfo(row[1], row[0], row[2], col_type, _none_if_empty(row[8]), database=database)
+        )
+
+    return result
+
+
+@list_columns.register("bigquery")
+def _list_columns_bq(self: Dialect, conn, schema=None, max_workers=None) -> Sequence[ColumnInfo]:
+    if max_workers is None:
+        max_workers = BIGQUERY_LIST_WORKERS
+
+    client = conn.connection._client
+
+    # schema is either "<dataset>" or "<project>.<dataset>"
+    if schema is not None:
+        datasets = [schema]
+    else:
+        datasets = [f"{ds.project}.{ds.dataset_id}" for ds in client.list_datasets()]
+
+    def list_dataset(dataset):
+        qdataset = ".".join(f"`{part}`" for part in dataset.split("."))
+        rows = client.query(f"""
+            SELECT table_catalog, table_schema, table_name, column_name, data_type
+            FROM {qdataset}.INFORMATION_SCHEMA.COLUMNS
+            ORDER BY table_name, ordinal_position
+        """).result()
+
+        # table_catalog is the project, which tables are listed with
+        return [
+            ColumnInfo(schema, table, name, type_, database=project)
+            for project, schema, table, name, type_ in (row.values() for row in rows)
+        ]
+
+    # INFORMATION_SCHEMA.COLUMNS is per dataset, and datasets may be in different
+    # regions, so they are queried concurrently (as in list_tables). Queries go
+    # through the client, since sqlalchemy connections can't be shared by threads.
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(itertools.chain.from_iterable(executor.map(list_dataset, datasets)))
+
+
+# table_stats generic =========================================================
+#
+# Each implementation returns approximate row counts and sizes for the tables in
+# a schema (or, if schema is None, the whole database), using statistics the
+# database keeps in its catalog. Table data is never scanned, so counts may be
+# out of date (e.g. until postgres next analyzes a table). Dialects without
+# catalog statistics raise a NotImplementedError.
+
+table_stats = SingleGeneric("table_stats")
+
+def _none_if_negative(x):
+    return None if x is None or x < 0 else int(x)
+
+
+@table_stats.register("mysql")
+def _table_stats_mysql(self: Dialect, conn, schema=None) -> Sequence[TableStats]:
+    where = "AND table_schema = :schema" if schema is not None else ""
+    q = conn.execute(sql.text(f"""
+        SELECT table_schema, table_name, table_rows, data_length + index_length
+        FROM information_schema.tables
+        WHERE
+            table_type = 'BASE TABLE'
+            AND table_schema NOT IN ('mysql', 'performance_schema', 'sys')
+            {where}
+    """), {"schema": schema} if schema is not None else {})
+
+    return [TableStats(*row) for row in q]
+
+
+@table_stats.register("postgresql")
+def _table_stats_pg(self: Dialect, conn, schema=None) -> Sequence[TableStats]:
+    # reltuples is -1 for tables that were never vacuumed or analyzed
+    where = "AND n.nspname = :schema" if schema is not None else ""
+    q = conn.execute(sql.text(f"""
+        SELECT n.nspname, c.relname, c.reltuples, pg_total_relation_size(c.oid)
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE
+            c.relkind in ('r', 'p', 'm')
+            AND n.nspname NOT IN ('information_schema', 'pg_catalog')
+            {where}
+    """), {"schema": schema} if schema is not None else {})
+
+    return [TableStats(row[0], row[1], _none_if_negative(row[2]), row[3]) for row in q]
+
+
+@table_stats.register("duckdb")
+def _table_stats_duckdb(self: Dialect, conn, schema=None) -> Sequence[TableStats]:
+    # duckdb estimates row counts, but not the size of each table
+    where = "AND schema_name = :schema" if schema is not None else ""
+    q = conn.execute(sql.text(f"""
+        SELECT schema_name, table_name, estimated_size
+        FROM duckdb_tables()
+        WHERE
+            NOT internal
+            AND database_name = current_database()
+            {where}
+    """), {"schema": schema} if schema is not None else {})
+
+    return [TableStats(*row) for row in q]
+
+
+@table_stats.register("snowflake")
+def _table_stats_sf(self: Dialect, conn, schema=None) -> Sequence[TableStats]:
+    # SHOW TABLES includes row counts and bytes from table metadata, and (unlike
+    # information_schema.tables) does not need a running warehouse
+    db_name, in_clause = _snowflake_scope(conn, schema)
+    q = conn.execute(sql.text("SHOW TABLES " + in_clause))
+
+    results = []
+    for row in q.mappings():
+        if row["schema_name"] == "INFORMATION_SCHEMA":
+            continue
+
+        # stats are keyed by the same schema as table accessors, which include
+        # the database when no default database is set (see _list_tables_sf)
+        parts = (row["schema_name"], row["name"])
+        ident = _identify_snowflake_parts(self, parts if db_name else (row["database_name"], *parts))
+        results.append(TableStats(ident.schema, ident.table, row["rows"], row["bytes"]))
+
+    return results
+
+
+@table_stats.register("bigquery")
+def _table_stats_bq(self: Dialect, conn, schema=None, max_workers=None) -> Sequence[TableStats]:
+    if max_workers is None:
+        max_workers = BIGQUERY_LIST_WORKERS
+
+    client = conn.connection._client
+
+    # schema is either "<dataset>" or "<project>.<dataset>"
+    if schema is not None:
+        datasets = [schema]
+    else:
+        datasets = [f"{ds.project}.{ds.dataset_id}" for ds in client.list_datasets()]
+
+    def list_dataset(dataset):
+        # __TABLES__ is table metadata, so querying it is free
+        qdataset = ".".join(f"`{part}`" for part in dataset.split("."))
+        rows = client.query(f"""
+            SELECT project_id, dataset_id, table_id, row_count, size_bytes
+            FROM {qdataset}.__TABLES__
+        """).result()
+
+        # schemas include the project, like table accessors (see _identify_table_bigquery)
+        return [
+            TableStats(f"{project}.{dataset_id}", table_id, row_count, size_bytes)
+            for project, dataset_id, table_id, row_count, size_bytes in (row.values() for row in rows)
+        ]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(itertools.chain.from_iterable(executor.map(list_dataset, datasets)))
+
+
+_TYPE_PATTERN = re.compile(
+    r"^\s*(?P<name>[^(\[]*)(?:\((?P<args>.*)\))?\s*(?P<modifiers>[^(\[]*?)"
+    r"\s*(?P<array>(?:\[\d*\]\s*)*)$"
+)
+
+# names with time zone information, other than those ending in "with time zone"
+_TIMEZONE_TYPES = {"timestamptz", "timetz"}
+
+
+def _lookup_type(dialect: Dialect, words: "list[str]"):
+    """Return the type class for the longest leading run of words, and the rest."""
+
+    type_names = getattr(dialect, "ischema_names", {})
+
+    for ii in range(len(words), 0, -1):
+        name = " ".join(words[:ii])
+        for key in (name, name.lower(), name.upper()):
+            if key in type_names:
+                return type_names[key], words[ii:]
+
+    # fall back to sqlalchemy's generic types (e.g. DECIMAL), for dialects whose
+    # catalog names differ from those used by their reflection (e.g. duckdb)
+    name = " ".join(words).upper()
+    if name in ("DOUBLE", "DOUBLE PRECISION") and not hasattr(sqltypes, "DOUBLE"):
+        return sqltypes.FLOAT, []
+
+    type_cls = getattr(sqltypes, name, None)
+    if isinstance(type_cls, type) and issubclass(type_cls, sqltypes.TypeEngine):
+        return type_cls, []
+
+    return None, words
+
+
+def _create_type(type_cls, args, **flags):
+    """Create a type, passing args to its leading positional parameters.
+
+    Flags like timezone and unsigned are passed as keywords, when the type takes them.
+    """
+
+    try:
+        params = list(signature(type_cls.__init__).parameters.values())[1:]
+    except (TypeError, ValueError):
+        params = []
+
+    if any(p.kind == p.VAR_POSITIONAL for p in params):
+        # e.g. mysql ENUM, which takes its values
+        positional, kwargs = args, {}
+    else:
+        slots = [
+            p.name for p in params
+            if p.kind == p.POSITIONAL_OR_KEYWORD and p.name not in flags
+        ]
+        positional, kwargs = [], dict(zip(slots, args))
+
+    takes_kwargs = any(p.kind == p.VAR_KEYWORD for p in params)
+    names = {p.name for p in params}
+    kwargs.update(
+        {k: v for k, v in flags.items() if v and (k in names or takes_kwargs)}
+    )
+
+    try:
+        return type_cls(*positional, **kwargs)
+    except TypeError:
+        return type_cls()
+
+
+def resolve_type(dialect: Dialect, type_str: str):
+    """Return a sqlalchemy type for a type name from a catalog, like "VARCHAR(100)".
+
+    This handles names with several words (e.g. "double precision"), arguments
+    (e.g. "DECIMAL(18,3)" or "datetime(6)"), modifiers (e.g. "with time zone" or
+    "unsigned"), and array suffixes (e.g. "integer[]"). Unknown types are returned
+    as a sqlalchemy NullType.
+    """
+
+    m = _TYPE_PATTERN.match(type_str or "")
+    if m is None:
+        return NullType()
+
+    type_cls, rest = _lookup_type(dialect, m.group("name").split())
+    if type_cls is None:
+        return NullType()
+
+    modifiers = " ".join([*rest, *m.group("modifiers").split()]).lower()
+    name = m.group("name").lower()
+
+    raw_args = m.group("args") or ""
+    strings = re.findall(r"'((?:[^']|'')*)'", raw_args)
+    if strings:
+        args = [x.replace("''", "'") for x in strings]
+    else:
+        args = [int(x) for x in raw_args.split(",") if x.strip().isdigit()]
+
+    col_type = _create_type(
+        type_cls,
+        args,
+        timezone=name in _TIMEZONE_TYPES or "with time zone" in f"{name} {modifiers}",
+        unsigned="unsigned" in modifiers.split(),
+        zerofill="zerofill" in modifiers.split(),
+    )
+
+    dimensions = m.group("array").count("[")
+    if dimensions:
+        array_cls = getattr(dialect, "ischema_names", {}).get("_array", sqltypes.ARRAY)
+        return array_cls(col_type, dimensions=dimensions if dimensions > 1 else None)
+
+    return col_type
+
+
+# describe_query generic ======================================================
+#
+# Each implementation returns the names of the columns a query would return. Where
+# the driver supports it, this is done without executing the query.
+
+describe_query = SingleGeneric("describe_query")
+
+@describe_query.register_default
+def _describe_query_default(self: Dialect, conn, query: str) -> Sequence[str]:
+    q = conn.execute(sql.text(f"SELECT * FROM (\n{query}\n) WHERE 1 = 0"))
+    return list(q.keys())
+
+
+@describe_query.register("postgresql")
+@describe_query.register("mysql")
+def _describe_query_limit(self: Dialect, conn, query: str) -> Sequence[str]:
+    # the planner short-circuits LIMIT 0, so the inner query is never scanned
+    q = conn.execute(sql.text(f"SELECT * FROM (\n{query}\n) AS dbcooper_q LIMIT 0"))
+    return list(q.keys())
+
+
+@describe_query.register("duckdb")
+def _describe_query_duckdb(self: Dialect, conn, query: str) -> Sequence[str]:
+    # DESCRIBE binds the query to get its result types, but does not run it
+    q = conn.execute(sql.text(f"DESCRIBE {query}"))
+    return [row[0] for row in q]
+
+
+@describe_query.register("snowflake")
+def _describe_query_sf(self: Dialect, conn, query: str) -> Sequence[str]:
+    # the snowflake connector can fetch result metadata without executing
+    cursor = conn.connection.cursor()
+    try:
+        return [col.name for col in cursor.describe(query)]
+    finally:
+        cursor.close()
+
+
+@describe_query.register("bigquery")
+def _describe_query_bq(self: Dialect, conn, query: str) -> Sequence[str]:
+    # a dry run validates the query and returns its schema, without billing
+    from google.cloud.bigquery import QueryJobConfig
+
+    client = conn.connection._client
+    job = client.query(query, job_config=QueryJobConfig(dry_run=True, use_query_cache=False))
+    return [field.name for field in job.schema]
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace in a query, leaving quoted strings and names alone."""
+
+    return re.sub(
+        r"""('(?:[^']|'')*'|"(?:[^"]|"")*")|\s+""",
+        lambda m: m.group(1) or " ",
+        query,
+    ).strip()
+
+
+# sample_table generic ========================================================
+#
+# Each implementation returns a selectable with a random sample of a table's rows,
+# using the database's own sampling clause where it has one. Arguments are
+#
+# * fraction: sample roughly this fraction of rows (from 0 to 1). This usually picks
+#   random blocks of storage, so only part of the table is read, but rows come in
+#   clumps (and small tables may return no rows).
+# * n: return at most n rows. When fraction is also given, rows are limited after
+#   sampling. Otherwise every row is a candidate, so the whole table may be read.
+#   (Table accessors avoid this by setting fraction from table_stats.)
+# * seed: makes the sample repeatable, on databases that support it.
+
+sample_table = SingleGeneric("sample_table")
+
+def _check_sample_args(fraction, n):
+    if fraction is None and n is None:
+        raise ValueError("Either fraction or n must be specified.")
+
+    if fraction is not None and not 0 < fraction <= 1:
+        raise ValueError(f"fraction must be between 0 and 1, but was {fraction!r}.")
+
+    if n is not None and n < 0:
+        raise ValueError(f"n must not be negative, but was {n!r}.")
+
+
+def _no_seed(dialect, seed, when=""):
+    if seed is not None:
+        raise NotImplementedError(f"The {dialect.name} dialect does not support a seed{when}.")
+
+
+def _sample_text(dialect, table, sample_clause: str, n=None) -> sql.Subquery:
+    # sampling clauses go after the table name, so are added to the query text.
+    # Numbers in the clause have already been converted with float or int.
+    name = dialect.identifier_preparer.format_table(table)
+    limit = "" if n is None else f" LIMIT {int(n)}"
+
+    query = sql.text(f"SELECT * FROM {name} {sample_clause}{limit}")
+    return query.columns(*[sql.column(col.name) for col in table.columns]).subquery()
+
+
+def _sample_random(table, fraction, n, random) -> sql.Subquery:
+    query = sql.select(table)
+    if fraction is not None:
+        query = query.where(random < fraction)
+
+    if n is not None:
+        query = query.order_by(random).limit(n) if fraction is None else query.limit(n)
+
+    return query.subquery()
+
+
+@sample_table.register_default
+def _sample_table_default(self: Dialect, table, fraction=None, n=None, seed=None) -> sql.Subquery:
+    # with no sampling clause, every row gets a random number, so the whole
+    # table is read
+    _check_sample_args(fraction, n)
+    _no_seed(self, seed)
+
+    return _sample_random(table, fraction, n, sql.func.random())
+
+
+@sample_table.register("sqlite")
+def _sample_table_sqlite(self: Dialect, table, fraction=None, n=None, seed=None) -> sql.Subquery:
+    _check_sample_args(fraction, n)
+    _no_seed(self, seed)
+
+    # sqlite's random() returns a 64-bit integer, rather than a number from 0 to 1
+    random = sql.func.abs(sql.func.random() % 1_000_000) / 1_000_000.0
+    return _sample_random(table, fraction, n, random)
+
+
+@sample_table.register("mysql")
+def _sample_table_mysql(self: Dialect, table, fraction=None, n=None, seed=None) -> sql.Subquery:
+    _check_sample_args(fraction, n)
+
+    random = sql.func.rand() if seed is None else sql.func.rand(int(seed))
+    return _sample_random(table, fraction, n, random)
+
+
+@sample_table.register("postgresql")
+def _sample_table_pg(self: Dialect, table, fraction=None, n=None, seed=None) -> sql.Subquery:
+    _check_sample_args(fraction, n)
+
+    if fraction is None:
+        _no_seed(self, seed, " when sampling n rows without a fraction")
+        return _sample_random(table, fraction, n, sql.func.random())
+
+    seed = None if seed is None else sql.literal(int(seed))
+    sampled = sql.tablesample(table, sql.func.system(100 * float(fraction)), seed=seed)
+    return sql.select(sampled).limit(n).subquery()
+
+
+@sample_table.register("duckdb")
+def _sample_table_duckdb(self: Dialect, table, fraction=None, n=None, seed=None) -> sql.Subquery:
+    _check_sample_args(fraction, n)
+
+    seed_arg = "" if seed is None else f", {int(seed)}"
+
+    if fraction is None:
+        # a reservoir sample reads every row, but only holds n rows in memory
+        repeatable = "" if seed is None else f" REPEATABLE ({int(seed)})"
+        return _sample_text(self, table, f"USING SAMPLE reservoir({int(n)} ROWS){repeatable}")
+
+    clause = f"USING SAMPLE {100 * float(fraction)} PERCENT (system{seed_arg})"
+    return _sample_text(self, table, clause, n)
+
+
+@sample_table.register("snowflake")
+def _sample_table_sf(self: Dialect, table, fraction=None, n=None, seed=None) -> sql.Subquery:
+    _check_sample_args(fraction, n)
+
+    if fraction is None:
+        _no_seed(self, seed, " when sampling n rows without a fraction")
+        return _sample_text(self, table, f"SAMPLE ({int(n)} ROWS)")
+
+    seed_clause = "" if seed is None else f" SEED ({int(seed)})"
+    return _sample_text(self, table, f"SAMPLE SYSTEM ({100 * float(fraction)}){seed_clause}", n)
+
+
+@sample_table.register("bigquery")
+def _sample_table_bq(self: Dialect, table, fraction=None, n=None, seed=None) -> sql.Subquery:
+    _check_sample_args(fraction, n)
+    _no_seed(self, seed)
 
-    return _filter_result(result, exclude)
+    if fraction is None:
+        return _sample_random(table, fraction, n, sql.func.rand())
 
-def _filter_result(result: Sequence[TableName], exclude: "Sequence | set") -> Sequence[TableName]:
-    exclude_set = set(exclude)
-    return [entry for entry in result if entry.schema not in exclude_set]
+    return _sample_text(self, table, f"TABLESAMPLE SYSTEM ({100 * float(fraction)} PERCENT)", n)
 
 
 # Table formatter =============================================================
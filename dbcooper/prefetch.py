@@ -0,0 +1,269 @@
+"""Warm table metadata in background threads, for tables that are likely to be used.
+
+DbCooper uses this to fetch the columns of tables before they are first accessed
+(see DbCooper.prefetch). Tables are either listed explicitly, or are those used
+most often in past sessions, as recorded by a UsageTracker.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+import weakref
+
+from collections import Counter
+from contextlib import closing
+
+from .cache import _default_cache_dir, _hash_key
+
+from typing import TYPE_CHECKING, Callable, Iterable
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+
+class UsageTracker:
+    """Count how often each table is used, across sessions.
+
+    Uses are counted in memory, so recording one never waits on disk. Counts are
+    added to a sqlite file when flush is called, when the most used tables are
+    requested, and when the tracker is garbage collected (or python exits).
+
+    Parameters
+    ----------
+    path:
+        Location of the sqlite file. Defaults to "usage.db", inside the directory
+        set by the DBCOOPER_CACHE_DIR environment variable (or ~/.cache/dbcooper).
+    timeout:
+        Number of seconds to wait on other processes writing to the file.
+    """
+
+    def __init__(self, path: "str | None" = None, timeout: float = 30):
+        if path is None:
+            path = os.path.join(_default_cache_dir(), "usage.db")
+
+        self.path = os.fspath(path)
+        self.timeout = timeout
+
+        # (engine key, schema, table) -> number of uses not yet written
+        self._pending = Counter()
+        self._lock = threading.Lock()
+
+        self._finalizer = weakref.finalize(
+            self, self._flush_pending, self.path, self.timeout, self._pending, self._lock
+        )
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.path!r})"
+
+    @staticmethod
+    def make_key(engine: Engine) -> str:
+        return _hash_key(engine.url)
+
+    def record(self, engine: Engine, table_name: str, schema: "str | None" = None):
+        """Count a use of a table."""
+
+        # schemas are stored as "" rather than NULL, since NULLs are never
+        # equal in a primary key
+        key = (self.make_key(engine), "" if schema is None else str(schema), str(table_name))
+
+        with self._lock:
+            self._pending[key] += 1
+
+    def flush(self):
+        """Write counted uses to disk."""
+
+        self._flush_pending(self.path, self.timeout, self._pending, self._lock)
+
+    @staticmethod
+    def _flush_pending(path, timeout, pending, lock):
+        # a static method, so the finalizer does not keep the tracker alive
+        with lock:
+            entries = list(pending.items())
+            pending.clear()
+
+        if not entries:
+            return
+
+        now = time.time()
+        with closing(_connect(path, timeout)) as con:
+            con.execute("BEGIN IMMEDIATE")
+            con.executemany(
+                "INSERT INTO usage (engine, schema, name, uses, last_used) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (engine, schema, name) DO UPDATE"
+                " SET uses = uses + excluded.uses, last_used = excluded.last_used",
+                [(*key, n, now) for key, n in entries],
+            )
+            con.execute("COMMIT")
+
+    def most_used(self, engine: Engine, n: int = 10) -> list[tuple[str | None, str]]:
+        """Return (schema, table name) pairs for the n tables used most with engine."""
+
+        self.flush()
+
+        with closing(_connect(self.path, self.timeout)) as con:
+            rows = con.execute(
+                "SELECT schema, name FROM usage WHERE engine = ?"
+                " ORDER BY uses DESC, last_used DESC LIMIT ?",
+                (self.make_key(engine), n),
+            ).fetchall()
+
+        return [(schema or None, name) for schema, name in rows]
+
+
+def _connect(path, timeout):
+    dirname = os.path.dirname(path)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
+
+    con = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute(
+        "CREATE TABLE IF NOT EXISTS usage (engine TEXT NOT NULL, schema TEXT NOT NULL,"
+        " name TEXT NOT NULL, uses INTEGER NOT NULL, last_used REAL NOT NULL,"
+        " PRIMARY KEY (engine, schema, name))"
+    )
+    return con
+
+
+def _pool_has_idle(engine: Engine) -> bool:
+    """Return whether engine's pool can hand out a connection without growing.
+
+    This is only a snapshot, since other threads may check out connections
+    right after it is taken.
+    """
+
+    pool = engine.pool
+    checkedout, size = getattr(pool, "checkedout", None), getattr(pool, "size", None)
+    if not callable(checkedout) or not callable(size):
+        # e.g. NullPool, which opens a new connection each time
+        return True
+
+    return checkedout() < size()
+
+
+class Prefetcher:
+    """Call a function on items in background threads, until done or cancelled.
+
+    Items are found by calling get_items in a background thread too, so that
+    starting a Prefetcher never waits on the database. Workers only take a
+    connection when the engine's pool has one to spare, so that foreground work
+    is not usually left waiting for a connection. Errors raised by warm are kept
+    in the errors attribute, rather than raised.
+
+    Note that checking for a spare connection does not reserve it, so foreground
+    work that checks out a connection at the same moment may still have to wait
+    for one warm call (or use one of the pool's overflow connections). Warming
+    uses the same engine as foreground work, so that connection events (e.g.
+    attaching sqlite databases) apply to both, and so shares its pool.
+
+    Parameters
+    ----------
+    engine:
+        Engine whose connection pool is shared with foreground work.
+    warm:
+        Function called on each item, e.g. to fetch a table's columns. It may
+        return False to skip an item, which is then left out of warmed.
+    get_items:
+        Function returning the items to warm.
+    workers:
+        Number of threads calling warm. Must be at least 1.
+    """
+
+    # seconds to wait before checking again for a spare connection
+    poll_interval = 0.05
+
+    def __init__(
+        self,
+        engine: Engine,
+        warm: Callable,
+        get_items: Callable[[], Iterable],
+        workers: int = 2,
+    ):
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, but received {workers}.")
+
+        self.engine = engine
+        self.warm = warm
+        self.get_items = get_items
+        self.workers = workers
+
+        self.warmed = []
+        self.errors = []
+
+        self._items = None
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._done = threading.Event()
+        self._n_running = 0
+
+    def __repr__(self):
+        status = "done" if self.done else "cancelled" if self.cancelled else "running"
+        return f"{self.__class__.__name__}(<{status}, {len(self.warmed)} warmed>)"
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def start(self) -> "Prefetcher":
+        # daemon threads, so that unfinished work never delays python exiting
+        threading.Thread(target=self._run, name="dbcooper-prefetch", daemon=True).start()
+        return self
+
+    def cancel(self):
+        """Stop warming items. Items already being warmed are finished."""
+
+        self._cancelled.set()
+
+    def wait(self, timeout: "float | None" = None) -> bool:
+        """Wait until every worker has stopped, returning whether they have."""
+
+        return self._done.wait(timeout)
+
+    def _run(self):
+        try:
+            self._items = iter(list(self.get_items()))
+        except Exception as err:
+            self.errors.append(err)
+            self._done.set()
+            return
+
+        self._n_running = self.workers
+        for ii in range(self.workers):
+            threading.Thread(
+                target=self._work, name=f"dbcooper-prefetch-{ii}", daemon=True
+            ).start()
+
+    def _next_item(self):
+        with self._lock:
+            return next(self._items, None)
+
+    def _work(self):
+        try:
+            while not self.cancelled:
+                item = self._next_item()
+                if item is None:
+                    break
+
+                while not _pool_has_idle(self.engine) and not self.cancelled:
+                    time.sleep(self.poll_interval)
+
+                if self.cancelled:
+                    break
+
+                try:
+                    if self.warm(item) is not False:
+                        self.warmed.append(item)
+                except Exception as err:
+                    self.errors.append(err)
+        finally:
+            with self._lock:
+                self._n_running -= 1
+                if self._n_running == 0:
+                    self._done.set()
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import threading
+
+from sqlalchemy import Column, MetaData, Table
+from sqlalchemy.types import NullType
+
+from .collect import connect
+from .inspect import list_columns, resolve_type, table_stats
+from .trace import span
+
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+    from .base import TableStats
+
+
+def _table_key(table_name, schema):
+    # same format as the keys of MetaData.tables
+    return table_name if schema is None else f"{schema}.{table_name}"
+
+
+class SchemaReflector:
+    """Reflect tables a whole schema at a time, into one shared MetaData.
+
+    The first time a table in a schema is requested, the columns of every table in
+    that schema are fetched using a single catalog query (see inspect.list_columns).
+    Dialects without a list_columns implementation fall back to reflecting each
+    table on its own (using sqlalchemy's autoload), as do tables with a column
+    type that inspect.resolve_type does not recognize. Either way, reflected
+    tables are kept in the metadata attribute, and reused on later requests.
+
+    Table statistics (approximate row counts and sizes) are fetched and kept in the
+    same way, a schema at a time (see inspect.table_stats).
+
+    Parameters
+    ----------
+    engine:
+        Engine used to fetch tables.
+    stats_kwargs:
+        Keyword arguments passed to inspect.table_stats, e.g. max_workers for bigquery.
+    """
+
+    def __init__(self, engine: Engine, stats_kwargs: dict | None = None):
+        self.engine = engine
+        self.metadata = MetaData()
+        self.stats_kwargs = {} if stats_kwargs is None else stats_kwargs
+
+        self._loaded_schemas = set()
+
+        # table key -> TableStats, for schemas in _loaded_stats
+        self._stats = {}
+        self._loaded_stats = set()
+
+        self._lock = threading.RLock()
+
+        # incremented whenever anything is invalidated or expired, so results
+        # fetched before then are not stored (see prefetch_schema)
+        self._generation = 0
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.engine!r})"
+
+    def get_table(self, table_name: str, schema: str | None = None) -> Table:
+        key = _table_key(table_name, schema)
+
+        with self._lock:
+            if key not in self.metadata.tables and schema is not None:
+                self.reflect_schema(schema)
+
+            if key in self.metadata.tables:
+                return self.metadata.tables[key]
+
+            with span(self.engine, "reflect", table=table_name, schema=schema):
+                with connect(self.engine) as conn:
+                    return Table(table_name, self.metadata, schema=schema, autoload_with=conn)
+
+    def reflect_schema(self, schema: str):
+        """Fetch every table in a schema, unless it was already fetched."""
+
+        with self._lock:
+            if schema in self._loaded_schemas:
+                return
+
+            self._add_schema(schema, self._fetch_schema_columns(schema))
+
+    def prefetch_schema(self, schema: str):
+        """Like reflect_schema, but without holding the lock while columns are fetched.
+
+        This is meant for background threads, so that other threads using the
+        reflector are not blocked. If another thread fetches the same schema at the
+        same time, the first results stored are kept. Results are dropped if the
+        reflector is invalidated while they are fetched.
+        """
+
+        with self._lock:
+            if schema in self._loaded_schemas:
+                return
+
+            generation = self._generation
+
+        columns = self._fetch_schema_columns(schema)
+
+        with self._lock:
+            if schema not in self._loaded_schemas and generation == self._generation:
+                self._add_schema(schema, columns)
+
+    def _fetch_schema_columns(self, schema: str) -> list:
+        with span(self.engine, "reflect", schema=schema) as attrs:
+            try:
+                with connect(self.engine) as conn:
+                    columns = list_columns(self.engine.dialect, conn, schema)
+            except NotImplementedError:
+                columns = []
+
+            attrs["rows"] = len(columns)
+
+        return columns
+
+    def _add_schema(self, schema: str, columns):
+        by_table = {}
+        for col in columns:
+            by_table.setdefault(col.table, []).append(col)
+
+        for table_name, cols in by_table.items():
+            if _table_key(table_name, schema) in self.metadata.tables:
+                continue
+
+            types = [resolve_type(self.engine.dialect, c.type) for c in cols]
+            if any(isinstance(t, NullType) and c.type for t, c in zip(types, cols)):
+                # types sqlalchemy's own reflection may know (e.g. a dialect's custom
+                # types), so the table is reflected on its own when requested
+                continue
+
+            sqla_cols = [
+                Column(c.name, col_type, comment=c.comment) for c, col_type in zip(cols, types)
+            ]
+            table_comment = cols[0].table_comment
+            Table(table_name, self.metadata, *sqla_cols, schema=schema, comment=table_comment)
+
+        self._loaded_schemas.add(schema)
+
+    def get_stats(self, table_name: str, schema: str | None = None) -> TableStats | None:
+        """Return statistics for a table, or None if the database has none for it."""
+
+        with self._lock:
+            self.load_stats(schema)
+
+            stats = self._stats.get(_table_key(table_name, schema))
+            if stats is None and schema is None:
+                # statistics for the whole database are keyed by schema name
+                default_schema = self.engine.dialect.default_schema_name
+                stats = self._stats.get(_table_key(table_name, default_schema))
+
+            return stats
+
+    def load_stats(self, schema: str | None = None):
+        """Fetch statistics for every table in a schema (or, if None, the database).
+
+        Nothing is fetched if statistics were already fetched for the schema.
+        """
+
+        with self._lock:
+            if schema in self._loaded_stats:
+                return
+
+            with span(self.engine, "table_stats", schema=schema) as attrs:
+                try:
+                    with connect(self.engine) as conn:
+                        results = table_stats(self.engine.dialect, conn, schema, **self.stats_kwargs)
+                except NotImplementedError:
+                    results = []
+
+                attrs["rows"] = len(results)
+
+            for stats in results:
+                self._stats[_table_key(stats.table, stats.schema)] = stats
+
+            self._loaded_stats.add(schema)
+
+    def expire_schema(self, schema: str):
+        """Fetch a schema again when next used, keeping tables already reflected.
+
+        This is useful when tables are added to a schema.
+        """
+
+        with self._lock:
+            self._generation += 1
+            self._loaded_schemas.discard(schema)
+            self._loaded_stats.discard(schema)
+
+    def invalidate(self, table_name: str | None = None, schema: str | None = None):
+        """Forget a reflected table, a whole schema, or (by default) everything."""
+
+        with self._lock:
+            if table_name is not None:
+                self.invalidate_tables([(table_name, schema)])
+                return
+
+            self._generation += 1
+
+            if schema is not None:
+                for table in list(self.metadata.tables.values()):
+                    if table.schema == schema:
+                        self.metadata.remove(table)
+
+                for key in [k for k, stats in self._stats.items() if stats.schema == schema]:
+                    del self._stats[key]
+
+                self._loaded_schemas.discard(schema)
+                self._loaded_stats.discard(schema)
+            else:
+                self.metadata.clear()
+                self._loaded_schemas.clear()
+                self._stats.clear()
+                self._loaded_stats.clear()
+
+    def invalidate_tables(self, tables: Iterable[tuple[str, str | None]]):
+        """Forget reflected tables, given as (table name, schema) pairs."""
+
+        with self._lock:
+            self._generation += 1
+
+            for table_name, schema in tables:
+                key = _table_key(table_name, schema)
+                if key in self.metadata.tables:
+                    self.metadata.remove(self.metadata.tables[key])
+
+                # stats are fetched a schema at a time, so the schema's are fetched again
+                self._stats.pop(key, None)
+                self._loaded_stats.discard(schema)
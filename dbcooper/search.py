@@ -0,0 +1,255 @@
+"""An in-memory index for fuzzy searching table names (and optionally columns).
+
+Text is split into lowercase alphanumeric words, so that lahman_salaries becomes
+the words "lahman" and "salaries". The index maps each word to the entries that
+contain it. Each word in a query matches words in the index that are
+
+* the same word (e.g. salaries),
+* longer words starting with it (e.g. sal matches salaries), or
+* similar words, sharing enough trigrams (e.g. salary matches salaries).
+
+Entries must match every word in a query, and are scored by how closely they match.
+Since a query is only compared to the (much smaller) set of distinct words in the
+index, searches stay fast for catalogs with many tables. The time a search takes
+mostly depends on the number of entries that match it.
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+import threading
+
+from bisect import bisect_left, insort
+from collections import Counter
+from itertools import repeat
+from operator import itemgetter
+
+from typing import Hashable, Iterable
+
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _words(text: str) -> list[str]:
+    return _WORD.findall(text.lower())
+
+
+def _trigrams(word: str) -> set[str]:
+    # padded in the same way as postgres' pg_trgm, so sal has the trigrams
+    # "  s", " sa", "sal", and "al ".
+    padded = f"  {word} "
+    return {padded[ii : ii + 3] for ii in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """A word index over text, which supports adding and removing entries.
+
+    Each entry has a key, and may have text in several fields (e.g. "name" and
+    "column"). Matches in fields with a higher weight score higher.
+
+    Parameters
+    ----------
+    weights:
+        Mapping of field name to weight. Fields not listed have a weight of 1.
+    similarity:
+        Minimum trigram similarity (from 0 to 1) for two words to match.
+    """
+
+    def __init__(self, weights: "dict[str, float] | None" = None, similarity: float = 0.3):
+        self.weights = {"name": 2.0, "column": 1.0} if weights is None else weights
+        self.similarity = similarity
+
+        # (key, field) -> set of words
+        self._docs = {}
+        # key -> fields with text for that key
+        self._fields = {}
+        # word -> set of (key, field)
+        self._postings = {}
+        # sorted list of every word, for prefix matches
+        self._vocab = []
+        # trigram -> set of words, for similar matches
+        self._grams = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(<{len(self)} entries>)"
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __contains__(self, key):
+        return key in self._fields
+
+    def keys(self):
+        return list(self._fields)
+
+    def has_field(self, key: Hashable, field: str) -> bool:
+        return (key, field) in self._docs
+
+    def add(self, key: Hashable, text: "str | Iterable[str]", field: str = "name"):
+        """Add text for key, replacing any text already in that field.
+
+        Text may be a string, or an iterable of strings (e.g. column names).
+        """
+
+        if isinstance(text, str):
+            words = set(_words(text))
+        else:
+            words = {word for part in text for word in _words(part)}
+
+        with self._lock:
+            self._remove_doc(key, field)
+
+            doc_key = (key, field)
+            self._docs[doc_key] = words
+            self._fields.setdefault(key, set()).add(field)
+
+            for word in words:
+                if word not in self._postings:
+                    self._add_word(word)
+
+                self._postings[word].add(doc_key)
+
+    def remove(self, key: Hashable, field: "str | None" = None):
+        """Remove a single field for key, or (by default) all of its text."""
+
+        with self._lock:
+            fields = [field] if field is not None else list(self._fields.get(key, ()))
+            for crnt_field in fields:
+                self._remove_doc(key, crnt_field)
+
+    def remove_field(self, field: str):
+        """Remove text in a field from every entry."""
+
+        with self._lock:
+            for doc_key in [k for k in self._docs if k[1] == field]:
+                self._remove_doc(*doc_key)
+
+    def clear(self):
+        with self._lock:
+            self._docs.clear()
+            self._fields.clear()
+            self._postings.clear()
+            self._vocab.clear()
+            self._grams.clear()
+
+    def _add_word(self, word):
+        self._postings[word] = set()
+        insort(self._vocab, word)
+
+        for gram in _trigrams(word):
+            self._grams.setdefault(gram, set()).add(word)
+
+    def _remove_word(self, word):
+        del self._postings[word]
+        del self._vocab[bisect_left(self._vocab, word)]
+
+        for gram in _trigrams(word):
+            words = self._grams[gram]
+            words.discard(word)
+            if not words:
+                del self._grams[gram]
+
+    def _remove_doc(self, key, field):
+        doc_key = (key, field)
+        words = self._docs.pop(doc_key, None)
+        if words is None:
+            return
+
+        for word in words:
+            entries = self._postings[word]
+            entries.discard(doc_key)
+            if not entries:
+                self._remove_word(word)
+
+        fields = self._fields[key]
+        fields.discard(field)
+        if not fields:
+            del self._fields[key]
+
+    def _match_word(self, query_word) -> dict[str, float]:
+        """Return a mapping of each word in the index matching query_word to a score."""
+
+        # numbers only match exactly, since e.g. 1 and 123 are not similar
+        if query_word.isdigit():
+            return {query_word: 1.0} if query_word in self._postings else {}
+
+        # words starting with the query word, which includes an exact match
+        matches = {}
+        ii = bisect_left(self._vocab, query_word)
+        while ii < len(self._vocab) and self._vocab[ii].startswith(query_word):
+            word = self._vocab[ii]
+            matches[word] = 1.0 if word == query_word else 0.5 + 0.4 * len(query_word) / len(word)
+            ii += 1
+
+        # similar words
+        if len(query_word) < 3:
+            return matches
+
+        query_grams = _trigrams(query_word)
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self._grams.get(gram, ()))
+
+        for word, n_shared in shared.items():
+            if word in matches:
+                continue
+
+            n_word_grams = len(word) + 2
+            sim = n_shared / (len(query_grams) + n_word_grams - n_shared)
+            if sim >= self.similarity:
+                matches[word] = 0.5 * sim
+
+        return matches
+
+    def search(self, query: str, limit: "int | None" = 10) -> list[tuple[Hashable, float]]:
+        """Return up to limit (key, score) pairs matching query, best match first."""
+
+        query_words = list(dict.fromkeys(_words(query)))
+        if not query_words:
+            return []
+
+        with self._lock:
+            all_matches = [self._match_word(word) for word in query_words]
+            if not all(all_matches):
+                return []
+
+            # only entries matching the query word with the fewest matching
+            # entries need to be scored. Scores are set from lowest to highest,
+            # so each entry ends up with the score of its best match.
+            all_matches.sort(key=lambda m: sum(len(self._postings[w]) for w in m))
+            first_matches, *rest = all_matches
+
+            candidates = {}
+            for word, score in sorted(first_matches.items(), key=itemgetter(1)):
+                candidates.update(dict.fromkeys(self._postings[word], score))
+
+            weights = self.weights
+            docs = self._docs
+            n_words = len(all_matches)
+
+            scores = {}
+            for doc_key, total in candidates.items():
+                words = docs[doc_key]
+
+                # entries must also match every other query word
+                for matches in rest:
+                    best = max(map(matches.get, words, repeat(0.0)))
+                    if not best:
+                        break
+                    total += best
+                else:
+                    # among equal matches, prefer entries with fewer words (e.g. a
+                    # table named salaries over one named salaries_history).
+                    score = weights.get(doc_key[1], 1.0) * total / n_words
+                    score -= 1e-6 * len(words)
+
+                    key = doc_key[0]
+                    if score > scores.get(key, -1.0):
+                        scores[key] = score
+
+        if limit is None:
+            return sorted(scores.items(), key=itemgetter(1), reverse=True)
+
+        return heapq.nlargest(limit, scores.items(), key=itemgetter(1))
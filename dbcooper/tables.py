@@ -1,22 +1,70 @@
 from __future__ import annotations
 
-from tabulate import tabulate
+import logging
+import warnings
+
 from typing import TYPE_CHECKING
 from sqlalchemy import Table, MetaData
+from sqlalchemy.exc import SQLAlchemyError
 
-from .collect import name_to_tbl, to_siuba
+from .collect import connect, name_to_tbl, to_siuba
+from .inspect import sample_table, table_stats
+from .trace import span
 
 if TYPE_CHECKING:
     import sqlalchemy as sqla
     from sqlalchemy.engine import Engine
 
+    from .base import TableStats
+    from .cache import LRUCache
+    from .prefetch import UsageTracker
+    from .reflect import SchemaReflector
+
+
+logger = logging.getLogger(__name__)
+
+# when sampling n rows from a table with row count statistics, the fraction
+# sampled is set to return about this many times n rows (but at least
+# SAMPLE_MIN_ROWS), before limiting to n. Sampling picks whole blocks of rows
+# (e.g. 2048 rows in duckdb), so sampling fewer rows often returns none.
+SAMPLE_OVERSAMPLE = 10
+SAMPLE_MIN_ROWS = 100_000
+
+
+def _format_bytes(n: int) -> str:
+    for unit in ["bytes", "KB", "MB", "GB", "TB"]:
+        if n < 1000 or unit == "TB":
+            break
+        n /= 1000
+
+    return f"{n:,.0f} {unit}" if unit == "bytes" else f"{n:,.1f} {unit}"
+
+
 class DbcSimpleTable:
     """Represent a database table."""
-    def __init__(self, engine: Engine, table_name: str, schema: str | None = None, to_frame=to_siuba):
+
+    # statistics fetched when there is no reflector to keep them (see _get_stats)
+    _stats: "tuple[TableStats | None] | None" = None
+
+    def __init__(
+        self,
+        engine: Engine,
+        table_name: str,
+        schema: str | None = None,
+        to_frame=to_siuba,
+        column_cache: LRUCache | None = None,
+        reflector: SchemaReflector | None = None,
+        usage_tracker: UsageTracker | None = None,
+    ):
         self.engine = engine
         self.table_name = table_name
         self.schema = schema
         self.to_frame = to_frame
+        self.column_cache = column_cache
+        # used by subclasses that reflect tables
+        self.reflector = reflector
+        # counts each time the table is fetched or printed
+        self.usage_tracker = usage_tracker
 
     def __repr__(self):
         repr_args = map(repr, [self.table_name, self.schema])
@@ -26,12 +74,108 @@ class DbcSimpleTable:
     def _repr_html_(self):
         raise NotImplementedError()
 
-    def __call__(self):
+    def __call__(self, **kwargs):
+        """Fetch the table, passing any keyword arguments to the to_frame function."""
+
+        self._record_use()
         sqla_tbl = self._create_table()
-        return self.to_frame(self.engine, sqla_tbl)
+
+        with span(self.engine, "collect", table=self.table_name, schema=self.schema):
+            return self.to_frame(self.engine, sqla_tbl, **kwargs)
+
+    def head(self, n: int = 5, **kwargs):
+        """Fetch the first n rows of the table, passing keyword arguments to to_frame."""
+
+        self._record_use()
+        expr = self._create_table().select().limit(n).subquery()
+
+        with span(self.engine, "collect", table=self.table_name, schema=self.schema):
+            return self.to_frame(self.engine, expr, **kwargs)
+
+    def sample(
+        self,
+        fraction: "float | None" = None,
+        n: "int | None" = None,
+        seed: "int | None" = None,
+        **kwargs,
+    ):
+        """Fetch a random sample of rows, passing keyword arguments to to_frame.
+
+        The database's sampling clause (e.g. TABLESAMPLE SYSTEM) is used where
+        possible, so that only part of the table is read. See inspect.sample_table.
+
+        Parameters
+        ----------
+        fraction:
+            Fraction of rows to sample (from 0 to 1).
+        n:
+            Maximum number of rows to return. If fraction is not specified, it is
+            set from the table's approximate row count (see inspect.table_stats),
+            so that about SAMPLE_OVERSAMPLE times n rows are sampled. Tables
+            with fewer than SAMPLE_MIN_ROWS rows are read in full.
+        seed:
+            Seed for a repeatable sample, on databases that support it.
+        """
+
+        self._record_use()
+
+        if fraction is None and n is not None:
+            fraction = self._sample_fraction(n)
+
+        expr = sample_table(self.engine.dialect, self._create_table(), fraction, n, seed)
+
+        with span(self.engine, "collect", table=self.table_name, schema=self.schema):
+            return self.to_frame(self.engine, expr, **kwargs)
+
+    def _sample_fraction(self, n: int) -> "float | None":
+        """Return a fraction that samples a few times n rows, or None to sample every row."""
+
+        try:
+            stats = self._get_stats()
+        except SQLAlchemyError:
+            logger.warning(
+                "Could not fetch statistics for table %s", self.table_name, exc_info=True
+            )
+            stats = None
+
+        rows = None if stats is None else stats.rows
+        if rows is None:
+            warnings.warn(
+                f"No row count is available for table {self.table_name!r}, so sampling "
+                f"{n} rows reads the whole table. Set fraction to only read part of it."
+            )
+            return None
+
+        fraction = max(SAMPLE_OVERSAMPLE * n, SAMPLE_MIN_ROWS) / rows if rows else 1
+
+        # sampling every row gives no benefit, and a limit alone isn't random
+        return fraction if fraction < 1 else None
+
+    def _get_stats(self) -> TableStats | None:
+        if self.reflector is not None:
+            return self.reflector.get_stats(self.table_name, self.schema)
+
+        # without a reflector, stats are kept on the table, as a 1-tuple
+        if self._stats is not None:
+            return self._stats[0]
+
+        try:
+            with connect(self.engine) as conn:
+                results = table_stats(self.engine.dialect, conn, self.schema)
+        except NotImplementedError:
+            results = []
+
+        stats = next((stats for stats in results if stats.table == self.table_name), None)
+        self._stats = (stats,)
+
+        return stats
+
+    def _record_use(self):
+        if self.usage_tracker is not None:
+            self.usage_tracker.record(self.engine, self.table_name, self.schema)
 
     def _create_table(self) -> sqla.sql.TableClause:
-        return name_to_tbl(self.engine, self.table_name, self.schema)
+        return name_to_tbl(self.engine, self.table_name, self.schema, self.column_cache)
 
 
 class DbcDocumentedTable(DbcSimpleTable):
@@ -44,7 +188,11 @@ class DbcDocumentedTable(DbcSimpleTable):
     table_comment_fields = {"name": "name", "type": "type", "description": "comment"}
 
     def _create_table(self) -> sqla.Table:
-        table = Table(self.table_name, MetaData(), schema=self.schema, autoload_with = self.engine)
+        if self.reflector is not None:
+            return self.reflector.get_table(self.table_name, self.schema)
+
+        with connect(self.engine) as conn:
+            table = Table(self.table_name, MetaData(), schema=self.schema, autoload_with = conn)
         return table
 
     # methods for representation ----------------------------------------------
@@ -53,6 +201,9 @@ class DbcDocumentedTable(DbcSimpleTable):
         return {k: getattr(col, v) for k,v in self.table_comment_fields.items()}
 
     def _repr_body(self, table, tablefmt):
+        # imported here, since it is only needed for printing
+        from tabulate import tabulate
+
         rows = [self._col_to_row(col) for col in table.columns]
         return tabulate(rows, headers="keys", tablefmt=tablefmt)
 
@@ -63,26 +214,56 @@ class DbcDocumentedTable(DbcSimpleTable):
         else:
             return table.comment
 
+    def _get_stats_summary(self) -> str:
+        """Return a line like "~1,000 rows, 1.5 MB", or "" if there are no statistics."""
+
+        # statistics are extra information, so failing to fetch them (e.g. from
+        # missing permissions) should not prevent printing the table
+        try:
+            stats = self._get_stats()
+        except SQLAlchemyError:
+            logger.warning(
+                "Could not fetch statistics for table %s", self.table_name, exc_info=True
+            )
+            return ""
+
+        if stats is None:
+            return ""
+
+        parts = []
+        if stats.rows is not None:
+            parts.append(f"~{stats.rows:,} rows")
+        if stats.bytes is not None:
+            parts.append(_format_bytes(stats.bytes))
+
+        return ", ".join(parts)
+
     def _repr_html_(self):
+        self._record_use()
         table = self._create_table()
 
         table_comment = self._get_table_comment(table)
+        stats = self._get_stats_summary()
+        stats_html = f"<p> {stats} </p>\n" if stats else ""
 
         return f"""\
 <h3> {table.name} </h3>
 <p> {table_comment} </p>
-{self._repr_body(table, "html")}\
+{stats_html}{self._repr_body(table, "html")}\
 """
 
     def __repr__(self):
+        self._record_use()
         table = self._create_table()
 
         table_comment = self._get_table_comment(table)
+        stats = self._get_stats_summary()
+        stats_line = f"{stats}\n" if stats else ""
 
         return f"""\
 {table.name}
 {table_comment}
-
+{stats_line}
 {self._repr_body(table, "simple")}\
 """
 
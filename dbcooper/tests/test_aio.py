@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from polars import DataFrame as PlDataFrame
+
+from dbcooper.aio import AsyncDbCooper
+
+
+async def _example_dbc(tmp_path):
+    dbc = AsyncDbCooper(f"sqlite+aiosqlite:///{tmp_path / 'example.db'}")
+
+    async with dbc._engine.begin() as conn:
+        await conn.exec_driver_sql("CREATE TABLE some_table (x INTEGER, y TEXT)")
+        await conn.exec_driver_sql("INSERT INTO some_table VALUES (1, 'a'), (2, 'b')")
+
+    await dbc.reset()
+    return dbc
+
+
+# queries and samples are selected from, rather than executed as subqueries
+@pytest.mark.filterwarnings("error:Executing a subquery")
+def test_async_dbcooper(tmp_path):
+    async def main():
+        dbc = await _example_dbc(tmp_path)
+
+        assert await dbc.list() == ["main.some_table"]
+
+        df = await dbc.main_some_table()
+        assert isinstance(df, PlDataFrame)
+        assert df.columns == ["x", "y"]
+
+        res_tbl, res_query = await asyncio.gather(
+            dbc.tbl("some_table"),
+            dbc.query("SELECT x FROM some_table"),
+        )
+        assert res_tbl.shape == (2, 2)
+        assert res_query.columns == ["x"]
+
+        await dbc._engine.dispose()
+
+    asyncio.run(main())
+
+
+def test_async_dbcooper_search_and_reset(tmp_path):
+    async def main():
+        dbc = await _example_dbc(tmp_path)
+
+        assert await dbc.search("some_table") == ["main_some_table"]
+        assert await dbc.tables_with_column("y") == ["main_some_table"]
+
+        async with dbc._engine.begin() as conn:
+            await conn.exec_driver_sql("CREATE TABLE other_table (z INTEGER)")
+
+        await dbc.reset()
+        assert "main_other_table" in dir(dbc)
+        assert await dbc.search("z", columns=True) == ["main_other_table"]
+        assert await dbc.tables_with_column("z") == ["main_other_table"]
+
+        await dbc._engine.dispose()
+
+    asyncio.run(main())
+
+
+def test_async_dbcooper_requires_reset(tmp_path):
+    async def main():
+        dbc = AsyncDbCooper(f"sqlite+aiosqlite:///{tmp_path / 'example.db'}")
+
+        with pytest.raises(RuntimeError, match="reset"):
+            await dbc.search("some_table")
+
+        await dbc._engine.dispose()
+
+    asyncio.run(main())
+
+
+# queries and samples are selected from, rather than executed as subqueries
+@pytest.mark.filterwarnings("error:Executing a subquery")
+def test_async_table_head_and_sample(tmp_path):
+    async def main():
+        dbc = await _example_dbc(tmp_path)
+
+        assert (await dbc.main_some_table.head(1)).shape == (1, 2)
+        assert (await dbc.main_some_table.sample(fraction=1)).shape == (2, 2)
+
+        # sqlite has no row counts, so the whole table is sampled
+        with pytest.warns(UserWarning, match="No row count"):
+            assert (await dbc.main_some_table.sample(n=1)).shape == (1, 2)
+
+        await dbc._engine.dispose()
+
+    asyncio.run(main())
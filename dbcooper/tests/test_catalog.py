@@ -0,0 +1,96 @@
+from sqlalchemy.sql.elements import quoted_name
+
+from dbcooper.base import ColumnInfo, TableName, TableIdentity
+from dbcooper.catalog import ColumnCatalog, TableCatalog
+
+
+COLUMNS = [
+    ColumnInfo("main", "salaries", "playerID", "TEXT"),
+    ColumnInfo("main", "salaries", "salary", "INTEGER"),
+    ColumnInfo("main", "batting", "playerID", "TEXT"),
+    ColumnInfo("other", "batting", "PLAYERID", None),
+]
+
+
+def test_column_catalog_roundtrip():
+    catalog = ColumnCatalog(COLUMNS)
+
+    assert len(catalog) == 4
+    assert list(catalog) == COLUMNS
+
+    # each distinct string is stored once
+    assert catalog._pool.strings.count("playerID") == 1
+
+
+def test_column_catalog_lookup():
+    catalog = ColumnCatalog(COLUMNS)
+
+    assert catalog.lookup("salary") == [COLUMNS[1]]
+    assert catalog.lookup("playerid") == [COLUMNS[0], COLUMNS[2], COLUMNS[3]]
+    assert catalog.lookup("playerID", case_sensitive=True) == [COLUMNS[0], COLUMNS[2]]
+    assert catalog.lookup("missing") == []
+
+
+def test_column_catalog_tables_with_column():
+    catalog = ColumnCatalog(COLUMNS + [ColumnInfo("main", "salaries", "PlayerId", "TEXT")])
+
+    assert catalog.tables_with_column("playerid") == [
+        (None, "main", "salaries"),
+        (None, "main", "batting"),
+        (None, "other", "batting"),
+    ]
+
+
+def test_column_catalog_keeps_databases():
+    # e.g. snowflake, listing tables across every database in an account
+    columns = [
+        ColumnInfo("PUBLIC", "T", "X", "TEXT", database="DB1"),
+        ColumnInfo("PUBLIC", "T", "X", "TEXT", database="DB2"),
+    ]
+    catalog = ColumnCatalog(columns)
+
+    assert list(catalog) == columns
+    assert catalog.tables_with_column("x") == [("DB1", "PUBLIC", "T"), ("DB2", "PUBLIC", "T")]
+
+
+TABLE_MAP = {
+    TableName(None, "main", "a"): TableIdentity("main", "a"),
+    TableName(None, "main", "b"): TableIdentity("main", "b"),
+    TableName("db", "other", "a"): TableIdentity("db.other", "a"),
+}
+
+
+def test_table_catalog_matches_dict():
+    catalog = TableCatalog(TABLE_MAP.items())
+
+    assert len(catalog) == 3
+    assert list(catalog) == list(TABLE_MAP)
+    assert dict(catalog.items()) == TABLE_MAP
+    assert list(catalog.values()) == list(TABLE_MAP.values())
+
+    assert catalog[TableName("db", "other", "a")] == TableIdentity("db.other", "a")
+    assert TableName("db", "main", "a") not in catalog
+    assert ("main", "a") not in catalog
+    assert catalog.get(TableName(None, "main", "c")) is None
+
+
+def test_table_catalog_overwrite():
+    catalog = TableCatalog(TABLE_MAP.items())
+    catalog[TableName(None, "main", "a")] = TableIdentity("main2", "a2")
+
+    assert len(catalog) == 3
+    assert catalog[TableName(None, "main", "a")] == TableIdentity("main2", "a2")
+
+
+def test_table_catalog_keeps_quoted_names():
+    ident = TableIdentity(quoted_name("MAIN", True), quoted_name("a", True))
+    catalog = TableCatalog([
+        (TableName(None, "MAIN", "a"), ident),
+        (TableName(None, "other", "b"), TableIdentity("MAIN", "b")),
+    ])
+
+    res = catalog[TableName(None, "MAIN", "a")]
+    assert isinstance(res.schema, quoted_name) and res.schema.quote
+    assert isinstance(res.table, quoted_name) and res.table.quote
+
+    assert type(catalog[TableName(None, "other", "b")].schema) is str
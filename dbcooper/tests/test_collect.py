@@ -0,0 +1,116 @@
+import pytest
+
+from siuba import collect
+
+from sqlalchemy import Numeric, create_engine, sql
+
+from dbcooper import DbcSimpleTable
+from dbcooper.collect import name_to_tbl, to_batches, to_polars, to_siuba
+
+
+@pytest.fixture(params=["sqlite", "duckdb"])
+def file_engine(request, tmp_path):
+    # partitions are read on separate connections, so in-memory databases won't do
+    ext = {"sqlite": "db", "duckdb": "duckdb"}[request.param]
+    engine = create_engine(f"{request.param}:///{tmp_path / 'example'}.{ext}")
+
+    with engine.begin() as con:
+        con.exec_driver_sql("CREATE TABLE facts (id INTEGER, value DOUBLE, day DATE)")
+        con.exec_driver_sql("""
+            INSERT INTO facts VALUES
+                (1, 0.5, '2024-01-01'),
+                (2, 1.5, '2024-01-15'),
+                (3, 2.5, '2024-02-01'),
+                (10, 10.5, '2024-03-01'),
+                (NULL, NULL, NULL)
+        """)
+
+    yield engine
+
+    engine.dispose()
+
+
+@pytest.mark.parametrize("partition_on", ["id", "value", "day"])
+@pytest.mark.parametrize("partitions", [1, 3, 20])
+def test_to_polars_partitioned(file_engine, partition_on, partitions):
+    tbl = name_to_tbl(file_engine, "facts")
+
+    if file_engine.name == "sqlite" and partition_on == "day":
+        # sqlite stores dates as strings, which can't be split into ranges
+        with pytest.raises(TypeError, match="numeric or a date"):
+            to_polars(file_engine, tbl, partition_on=partition_on, partitions=partitions)
+
+        return
+
+    res = to_polars(file_engine, tbl, partition_on=partition_on, partitions=partitions)
+    assert res.height == 5
+    assert sorted(res["id"].drop_nulls().to_list()) == [1, 2, 3, 10]
+
+
+def test_to_polars_partitioned_from_accessor(file_engine):
+    accessor = DbcSimpleTable(file_engine, "facts", to_frame=to_polars)
+
+    res = accessor(partition_on="id", partitions=2)
+    assert res.height == 5
+
+
+@pytest.fixture
+def large_engine(file_engine):
+    with file_engine.begin() as con:
+        con.exec_driver_sql("CREATE TABLE large (id INTEGER)")
+        con.exec_driver_sql("""
+            INSERT INTO large
+            WITH RECURSIVE r(id) AS (SELECT 1 UNION ALL SELECT id + 1 FROM r WHERE id < 100000)
+            SELECT id FROM r
+        """)
+
+    return file_engine
+
+
+@pytest.mark.parametrize("to_frame", [to_polars, to_siuba])
+def test_accessor_head(file_engine, to_frame):
+    accessor = DbcSimpleTable(file_engine, "facts", to_frame=to_frame)
+
+    res = accessor.head(2)
+    if to_frame is to_siuba:
+        res = res >> collect()
+
+    assert list(res["id"]) == [1, 2]
+
+
+# sqlite has no row count statistics, so sampling n rows warns about a full read
+@pytest.mark.filterwarnings("ignore:No row count")
+def test_accessor_sample(large_engine):
+    accessor = DbcSimpleTable(large_engine, "large", to_frame=to_polars)
+
+    assert accessor.sample(n=10).height == 10
+    assert 0 < accessor.sample(fraction=0.2).height < 100_000
+    assert accessor.sample(fraction=0.5, n=10).height == 10
+
+    if large_engine.name == "duckdb":
+        # only some databases support repeatable samples
+        first = accessor.sample(fraction=0.1, seed=1)["id"].to_list()
+        assert accessor.sample(fraction=0.1, seed=1)["id"].to_list() == first
+
+
+@pytest.mark.filterwarnings("ignore:Dialect sqlite")
+@pytest.mark.parametrize("kind", ["arrow", "polars"])
+def test_to_batches_widens_types(kind):
+    from decimal import Decimal
+
+    engine = create_engine("sqlite://")
+    engine.execute("CREATE TABLE facts (amount NUMERIC, n)")
+    engine.execute("INSERT INTO facts VALUES ('1.5', 1), ('100.25', 2.5)")
+
+    # sqlite returns strings for the numeric column, so convert them to decimals
+    tbl = name_to_tbl(engine, "facts")
+    expr = sql.select(sql.cast(tbl.c.amount, Numeric(asdecimal=True)).label("amount"), tbl.c.n)
+
+    first, second = to_batches(engine, expr, batch_size=1, kind=kind)
+
+    if kind == "arrow":
+        assert second.column(0).to_pylist() == [Decimal("100.25")]
+        assert second.column(1).to_pylist() == [2.5]
+    else:
+        assert second["amount"].to_list() == [Decimal("100.25")]
+        assert second["n"].to_list() == [2.5]
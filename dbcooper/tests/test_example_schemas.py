@@ -1,27 +1,39 @@
 import pytest
 
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+
+from functools import partial
+
+from sqlalchemy import event
+
 from polars import DataFrame as PlDataFrame
 from duckdb import DuckDBPyConnection
 
 from dbcooper import DbCooper
 from dbcooper.tests.helpers import EXAMPLE_SCHEMAS, EXAMPLE_DATA, assert_frame_sort_equal
 from dbcooper.tables import DbcSimpleTable
-from dbcooper.finder import TableFinder, AccessorBuilder
-from dbcooper.collect import to_polars, to_duckdb, name_to_tbl
+from dbcooper.finder import TableFinder, AccessorBuilder, AccessorHierarchyBuilder
+from dbcooper.collect import to_polars, to_duckdb, to_batches, to_arrow, name_to_tbl
 
 from siuba import collect
 
-@pytest.fixture
-def tbl(backend):
+def create_dbc(backend, **kwargs):
     if backend.name == "snowflake":
         # snowflake can't do reflection on schemas that aren't uppercase, see
         # see https://github.com/snowflakedb/snowflake-sqlalchemy/issues/276
-        tbl = DbCooper(backend.engine, table_factory=DbcSimpleTable)
+        return DbCooper(backend.engine, table_factory=DbcSimpleTable, **kwargs)
     elif backend.name == "duckdb":
         # tests currently assume database name isn't used in accessor
-        tbl = DbCooper(backend.engine, accessor_builder=AccessorBuilder(format_from_part="schema"))
-    else:
-        tbl = DbCooper(backend.engine)
+        return DbCooper(backend.engine, accessor_builder=AccessorBuilder(format_from_part="schema"), **kwargs)
+
+    return DbCooper(backend.engine, **kwargs)
+
+
+@pytest.fixture
+def tbl(backend):
+    tbl = create_dbc(backend)
 
     tbl._init()
     return tbl
@@ -42,15 +54,174 @@ def test_example_repr_exists(tbl):
         assert table_name in repr(table)
     
 
+def test_example_repr_reflects_schema_once(tbl):
+    if tbl._engine.name == "snowflake":
+        # see https://github.com/snowflakedb/snowflake-sqlalchemy/issues/276
+        pytest.xfail()
+
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(tbl._engine, "before_cursor_execute", listener)
+
+    try:
+        documented = [getattr(tbl, attr_name) for attr_name in EXAMPLE_SCHEMAS.values()]
+        first = [repr(table) for table in documented]
+        n_queries = len(statements)
+
+        assert [repr(table) for table in documented] == first
+        assert [table._repr_html_() for table in documented]
+        assert len(statements) == n_queries
+    finally:
+        event.remove(tbl._engine, "before_cursor_execute", listener)
+
+    for table in documented:
+        assert [col.name for col in table._create_table().columns] == list(EXAMPLE_DATA.columns)
+
+    if tbl._engine.name == "duckdb":
+        # catalog type names differ from those duckdb's reflection uses
+        with tbl._engine.begin() as conn:
+            conn.exec_driver_sql("CREATE SCHEMA typed")
+            conn.exec_driver_sql(
+                "CREATE TABLE typed.some_table"
+                " (a DOUBLE, b DECIMAL(18,3), c INTEGER[], d TIMESTAMPTZ)"
+            )
+            conn.exec_driver_sql("CREATE TABLE typed.nested (a DOUBLE, e STRUCT(x INTEGER))")
+
+        def col_types(table):
+            return [str(col.type) for col in table._create_table().columns]
+
+        try:
+            tbl.reset()
+            assert "NULL" not in repr(tbl.typed_some_table)
+
+            dialect = tbl._engine.dialect
+            columns = tbl.typed_some_table._create_table().columns
+            types = [col.type.compile(dialect=dialect) for col in columns]
+
+            # tables with types that can't be resolved are reflected on their own
+            with pytest.warns(Warning, match="struct"):
+                nested_types = col_types(tbl.typed_nested)
+        finally:
+            with tbl._engine.begin() as conn:
+                conn.exec_driver_sql("DROP SCHEMA typed CASCADE")
+
+        assert types == ["FLOAT", "DECIMAL(18, 3)", "INTEGER[]", "TIMESTAMP WITH TIME ZONE"]
+        assert nested_types == ["FLOAT", "NULL"]
+
+
 def test_example_data_roundtrip_siuba(tbl):
     for (schema, table_name), attr_name in EXAMPLE_SCHEMAS.items():
         table = getattr(tbl, attr_name)
         assert_frame_sort_equal(collect(table()), EXAMPLE_DATA)
 
+def test_lazy_accessors(backend):
+    dbc = create_dbc(backend, lazy=True)
+    assert not dbc._accessors.is_loaded
+
+    for (schema, table_name), attr_name in EXAMPLE_SCHEMAS.items():
+        assert attr_name in dir(dbc)
+
+    assert dbc._accessors.is_loaded
+    assert len(dbc._accessors) == len(EXAMPLE_SCHEMAS)
+
+    # table objects are only created once, on first access
+    assert getattr(dbc, "mai_lower") is getattr(dbc, "mai_lower")
+    assert_frame_sort_equal(collect(dbc.mai_lower()), EXAMPLE_DATA)
+
+
+def test_lazy_hierarchy_accessors(backend):
+    dbc = DbCooper(
+        backend.engine,
+        table_factory=DbcSimpleTable,
+        accessor_builder=AccessorHierarchyBuilder(omit_database=backend.name != "duckdb"),
+        lazy=True,
+    )
+
+    accessors = dbc._accessors.memory.mai if backend.name == "duckdb" else dbc._accessors.mai
+    assert not accessors.is_loaded
+    assert set(accessors) == {"lower", "UPPER", "MiXeD"}
+    assert_frame_sort_equal(collect(accessors.lower()), EXAMPLE_DATA)
+
+
+def test_query_describes_columns_once(tbl):
+    ip = tbl._engine.dialect.identifier_preparer
+    query = f"SELECT * FROM {ip.quote_identifier('mai')}.{ip.quote_identifier('lower')}"
+
+    assert_frame_sort_equal(collect(tbl.query(query)), EXAMPLE_DATA)
+
+    # whitespace differences do not matter
+    tbl.query(f"  {query}\n")
+    assert tbl.cache_info()["queries"]["misses"] == 1
+    assert tbl.cache_info()["queries"]["hits"] == 1
+
+
+def test_session_reuses_connection(backend):
+    if backend.name == "snowflake":
+        pytest.skip("table reflection on snowflake needs uppercase schemas")
+
+    dbc = create_dbc(backend, to_frame=to_polars, initialize=False)
+
+    checkouts = []
+
+    def listener(dbapi_con, con_record, con_proxy):
+        checkouts.append(dbapi_con)
+
+    event.listen(dbc._engine, "checkout", listener)
+
+    try:
+        with dbc.session():
+            dbc.reset()
+            for attr_name in EXAMPLE_SCHEMAS.values():
+                repr(getattr(dbc, attr_name))
+                assert isinstance(getattr(dbc, attr_name)(), PlDataFrame)
+
+            dbc.list()
+            dbc.tbl("lower", "mai")
+    finally:
+        event.remove(dbc._engine, "checkout", listener)
+
+    assert len(checkouts) == 1
+
+
 def test_to_polars(tbl):
     res = to_polars(tbl._engine, name_to_tbl(tbl._engine, "lower", "mai"))
     assert isinstance(res, PlDataFrame)
 
+def test_to_arrow(tbl):
+    sqla_tbl = name_to_tbl(tbl._engine, "lower", "mai")
+
+    res = to_arrow(tbl._engine, sqla_tbl)
+    assert isinstance(res, pa.Table)
+    assert_frame_sort_equal(res.to_pandas(), EXAMPLE_DATA)
+
+    # bound parameters are passed to the driver
+    res_filtered = to_arrow(tbl._engine, sqla_tbl.select().where(sqla_tbl.c.y == "b"))
+    assert res_filtered.num_rows == 2
+
+
+@pytest.mark.parametrize("kind", ["arrow", "pandas", "polars"])
+def test_to_batches(tbl, kind):
+    batch_size = len(EXAMPLE_DATA) - 1
+    accessor = DbcSimpleTable(
+        tbl._engine, "lower", "mai", to_frame=partial(to_batches, batch_size=batch_size, kind=kind)
+    )
+
+    batches = list(accessor())
+    assert [len(batch) for batch in batches] == [batch_size, 1]
+
+    if kind == "arrow":
+        res = pa.Table.from_batches(batches).to_pandas()
+    elif kind == "polars":
+        res = pl.concat(batches).to_pandas()
+    else:
+        res = pd.concat(batches, ignore_index=True)
+
+    assert_frame_sort_equal(res, EXAMPLE_DATA)
+
+
 def test_to_duckdb(tbl):
     if tbl._engine.name != "duckdb":
         pytest.skip("to_duckdb only works with duckdb engines")
@@ -58,3 +229,21 @@ def test_to_duckdb(tbl):
     res = to_duckdb(tbl._engine, name_to_tbl(tbl._engine, "lower", "mai"))
     assert isinstance(res, DuckDBPyConnection)
 
+
+
+def test_example_tables_with_column(tbl):
+    assert sorted(tbl.tables_with_column("x")) == sorted(EXAMPLE_SCHEMAS.values())
+    assert sorted(tbl.tables_with_column("X")) == sorted(EXAMPLE_SCHEMAS.values())
+    assert tbl.tables_with_column("X", case_sensitive=True) == []
+    assert tbl.tables_with_column("not_a_column") == []
+
+
+@pytest.mark.parametrize("filters, attr_names", [
+    (dict(include_schemas=["mai"]), ["mai_MiXeD", "mai_UPPER", "mai_lower"]),
+    (dict(include_schemas=["mai", "MAIN_UPPER"], table_like="lo%"), ["mai_lower"]),
+    (dict(table_regex="^some"), ["MAIN_UPPER_some_table"]),
+])
+def test_example_table_finder_filters(backend, filters, attr_names):
+    dbc = create_dbc(backend, table_finder=TableFinder(**filters))
+
+    assert sorted(dbc._accessors) == attr_names
@@ -0,0 +1,114 @@
+import threading
+import time
+
+import pytest
+
+from concurrent.futures import TimeoutError
+
+from sqlalchemy import create_engine
+
+from dbcooper import DbCooper, FederatedDbCooper, TableFinder
+
+
+class BlockingFinder(TableFinder):
+    """Wait on an event before listing tables."""
+
+    def __init__(self, event, *args, **kwargs):
+        self.event = event
+        super().__init__(*args, **kwargs)
+
+    def map_tables(self, dialect, conn, refresh=False):
+        self.event.wait(5)
+        return super().map_tables(dialect, conn, refresh)
+
+
+class FailingFinder(TableFinder):
+    def map_tables(self, dialect, conn, refresh=False):
+        raise ValueError("no catalog")
+
+
+@pytest.fixture
+def make_engine(tmp_path):
+    # tables are listed in other threads, so each engine needs a file database
+    # (an in-memory one is empty on connections from other threads).
+    def create(*tables):
+        engine = create_engine(f"sqlite:///{tmp_path / '_'.join(tables)}.db")
+        for table in tables:
+            engine.execute(f"CREATE TABLE {table} (x INTEGER)")
+
+        return engine
+
+    return create
+
+
+def test_federated_accessors(make_engine):
+    engines = {"sales": make_engine("orders"), "hr": make_engine("people", "teams")}
+    dbc = FederatedDbCooper(engines)
+
+    assert sorted(dir(dbc)) == ["errors", "hr", "reset", "sales"]
+    assert sorted(dbc.hr.main) == ["people", "teams"]
+    assert dbc.sales.main.orders.table_name == "orders"
+    assert dbc["sales"] is dbc.sales
+    assert dbc.errors == {}
+
+    with pytest.raises(AttributeError):
+        dbc.finance
+
+
+def test_federated_accepts_dbcooper(make_engine):
+    member = DbCooper(make_engine("orders"), initialize=False)
+    dbc = FederatedDbCooper({"sales": member})
+
+    assert dbc.sales is member
+    assert list(member._accessors) == ["main_orders"]
+
+
+def test_federated_timeout_does_not_block_others(make_engine):
+    event = threading.Event()
+    slow = DbCooper(make_engine("a"), initialize=False, table_finder=BlockingFinder(event))
+
+    start = time.monotonic()
+    with pytest.warns(UserWarning, match="slow"):
+        dbc = FederatedDbCooper({"slow": slow, "fast": make_engine("b")}, timeout={"slow": 0.1})
+
+    assert time.monotonic() - start < 2
+    event.set()
+
+    assert isinstance(dbc.errors["slow"], TimeoutError)
+    assert sorted(dbc.fast.main) == ["b"]
+
+    # the listing that timed out is not used
+    assert slow._table_map is None
+
+    dbc.reset(names=["slow"])
+    assert dbc.errors == {}
+    assert list(slow._accessors) == ["main_a"]
+
+
+def test_federated_records_errors(make_engine):
+    failing = DbCooper(make_engine("a"), initialize=False, table_finder=FailingFinder())
+
+    with pytest.warns(UserWarning):
+        dbc = FederatedDbCooper({"bad": failing, "good": make_engine("b")})
+
+    assert isinstance(dbc.errors["bad"], ValueError)
+    assert sorted(dbc.good.main) == ["b"]
+
+
+def test_federated_lists_tables_concurrently(make_engine):
+    barrier = threading.Barrier(2, timeout=5)
+
+    class BarrierFinder(TableFinder):
+        def map_tables(self, dialect, conn, refresh=False):
+            # fails unless both engines list tables at the same time
+            barrier.wait()
+            return super().map_tables(dialect, conn, refresh)
+
+    engines = {
+        name: DbCooper(make_engine(name), initialize=False, table_finder=BarrierFinder())
+        for name in ["a", "b"]
+    }
+    dbc = FederatedDbCooper(engines)
+
+    assert dbc.errors == {}
+    assert list(dbc.a._accessors) == ["main_a"]
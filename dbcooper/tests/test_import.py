@@ -0,0 +1,63 @@
+import subprocess
+import sys
+
+import pytest
+
+import dbcooper
+
+
+# microseconds "import dbcooper" may take, including any modules it imports
+IMPORT_BUDGET_US = 50_000
+
+HEAVY_MODULES = ["sqlalchemy", "tabulate", "siuba", "pandas", "polars", "pyarrow"]
+
+
+def _import_times(code):
+    """Return a mapping of module name to cumulative import time, using -X importtime."""
+
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in res.stderr.splitlines():
+        # lines look like "import time:       658 |        658 | dbcooper"
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            times[parts[2].strip()] = int(parts[1])
+
+    return times
+
+
+def test_import_does_not_load_heavy_modules():
+    times = _import_times("import dbcooper")
+
+    assert "dbcooper" in times
+    assert [name for name in HEAVY_MODULES if name in times] == []
+
+
+def test_import_time_budget():
+    times = _import_times("import dbcooper")
+
+    assert times["dbcooper"] < IMPORT_BUDGET_US
+
+
+def test_import_tables_does_not_load_tabulate():
+    times = _import_times("import dbcooper.tables")
+
+    assert "dbcooper.tables" in times
+    assert "tabulate" not in times
+
+
+def test_lazy_attributes():
+    from dbcooper.dbcooper import DbCooper
+
+    assert dbcooper.DbCooper is DbCooper
+    assert set(dbcooper.__all__) <= set(dir(dbcooper))
+    assert isinstance(dbcooper.__version__, str)
+
+    with pytest.raises(AttributeError):
+        dbcooper.not_an_attribute
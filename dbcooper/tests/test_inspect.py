@@ -0,0 +1,357 @@
+import threading
+import time
+
+from types import SimpleNamespace
+
+import pytest
+
+from sqlalchemy import create_engine, event
+
+from dbcooper.base import TableName
+from dbcooper.inspect import list_tables
+
+
+# sqlite ======================================================================
+
+def test_list_tables_sqlite_attached(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'main.db'}")
+
+    @event.listens_for(engine, "connect")
+    def attach(dbapi_con, con_record):
+        for ii in range(3):
+            dbapi_con.execute(f"ATTACH DATABASE '{tmp_path}/shard_{ii}.db' AS shard_{ii}")
+
+    engine.execute("CREATE TABLE b (x INTEGER)")
+    engine.execute("CREATE VIEW a AS SELECT * FROM b")
+    for ii in range(3):
+        engine.execute(f"CREATE TABLE shard_{ii}.t (x INTEGER)")
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    with engine.connect() as conn:
+        res = list_tables(engine.dialect, conn)
+
+    assert res == [
+        TableName(None, "main", "a"),
+        TableName(None, "main", "b"),
+        *[TableName(None, f"shard_{ii}", "t") for ii in range(3)],
+    ]
+
+    # one query for schema names, and one for all tables
+    assert len(statements) == 2
+
+
+# bigquery ====================================================================
+
+class FakeBigqueryClient:
+    """Stand-in for a google.cloud.bigquery.Client, listing made up datasets."""
+
+    def __init__(self, n_datasets, n_concurrent):
+        self.n_datasets = n_datasets
+        # every call to list_tables waits until n_concurrent calls are in progress,
+        # so listing datasets one at a time fails
+        self.barrier = threading.Barrier(n_concurrent, timeout=5)
+
+    def list_datasets(self):
+        return [
+            SimpleNamespace(reference=f"dataset_{ii}", dataset_id=f"dataset_{ii}")
+            for ii in range(self.n_datasets)
+        ]
+
+    def list_tables(self, dataset_ref, page_size):
+        from google.api_core import exceptions
+
+        self.barrier.wait()
+
+        ii = int(dataset_ref.split("_")[-1])
+
+        # finish in reverse order, to check results keep the order of datasets
+        time.sleep((self.n_datasets - ii) * 0.01)
+
+        if ii == 1:
+            raise exceptions.NotFound("dataset was deleted")
+
+        return [
+            SimpleNamespace(
+                project="some_project",
+                reference=SimpleNamespace(dataset_id=dataset_ref),
+                table_id=f"table_{jj}",
+            )
+            for jj in range(2)
+        ]
+
+
+def test_list_tables_bigquery_concurrent():
+    pytest.importorskip("google.api_core")
+
+    client = FakeBigqueryClient(n_datasets=4, n_concurrent=4)
+    dialect = SimpleNamespace(name="bigquery", list_tables_page_size=100)
+    conn = SimpleNamespace(connection=SimpleNamespace(_client=client))
+
+    res = list_tables(dialect, conn, max_workers=4)
+
+    assert res == [
+        TableName("some_project", f"dataset_{ii}", f"table_{jj}")
+        for ii in [0, 2, 3]
+        for jj in range(2)
+    ]
+
+
+
+def test_table_finder_max_workers_only_for_bigquery():
+    from dbcooper import DbCooper, TableFinder
+
+    finder = TableFinder(max_workers=4)
+    assert finder._dialect_kwargs(SimpleNamespace(name="bigquery")) == {"max_workers": 4}
+
+    # other dialects list tables in a single query, so don't take max_workers
+    engine = create_engine("sqlite://")
+    engine.execute("CREATE TABLE some_table (x INTEGER)")
+
+    dbc = DbCooper(engine, table_finder=finder)
+    assert list(dbc._accessors) == ["main_some_table"]
+    assert dbc.tables_with_column("x") == ["main_some_table"]
+
+def test_list_tables_bigquery_filters():
+    pytest.importorskip("google.api_core")
+
+    client = FakeBigqueryClient(n_datasets=4, n_concurrent=1)
+    dialect = SimpleNamespace(name="bigquery", list_tables_page_size=100)
+    conn = SimpleNamespace(connection=SimpleNamespace(_client=client))
+
+    res = list_tables(dialect, conn, exclude=["dataset_3"], like="%_1")
+    assert res == [TableName("some_project", f"dataset_{ii}", "table_1") for ii in [0, 2]]
+
+    # included datasets are listed without listing every dataset
+    client.list_datasets = None
+    res = list_tables(dialect, conn, include=["dataset_2"], regex="0$")
+    assert res == [TableName("some_project", "dataset_2", "table_0")]
+
+
+def test_table_stats_bigquery_keys_include_project():
+    from dbcooper.base import TableStats
+    from dbcooper.inspect import table_stats
+
+    row = SimpleNamespace(values=lambda: ("some_project", "dataset_0", "table_0", 10, 100))
+    client = SimpleNamespace(query=lambda q: SimpleNamespace(result=lambda: [row]))
+
+    dialect = SimpleNamespace(name="bigquery")
+    conn = SimpleNamespace(connection=SimpleNamespace(_client=client))
+
+    # keyed like table accessors, whose schema is "<project>.<dataset>"
+    res = table_stats(dialect, conn, "some_project.dataset_0", max_workers=1)
+    assert res == [TableStats("some_project.dataset_0", "table_0", 10, 100)]
+
+
+def test_table_stats_snowflake_keys_include_database(monkeypatch):
+    from sqlalchemy.engine import default
+    from dbcooper import inspect
+    from dbcooper.base import TableStats
+
+    rows = [
+        dict(database_name="DB", schema_name="SCHEMA", name="SOME_TABLE", rows=1, bytes=2),
+        dict(database_name="DB", schema_name="INFORMATION_SCHEMA", name="X", rows=1, bytes=2),
+    ]
+    conn = SimpleNamespace(execute=lambda q: SimpleNamespace(mappings=lambda: rows))
+    dialect = default.DefaultDialect()
+    dialect.name = "snowflake"
+
+    # no default database, so tables are listed IN ACCOUNT
+    monkeypatch.setattr(inspect, "_snowflake_scope", lambda conn, schema=None: (None, "IN ACCOUNT"))
+    assert inspect.table_stats(dialect, conn) == [TableStats('"DB"."SCHEMA"', "SOME_TABLE", 1, 2)]
+
+    monkeypatch.setattr(inspect, "_snowflake_scope", lambda conn, schema=None: ("DB", "IN DATABASE DB"))
+    assert inspect.table_stats(dialect, conn) == [TableStats("SCHEMA", "SOME_TABLE", 1, 2)]
+
+
+def test_filter_result():
+    from dbcooper.inspect import _filter_result
+
+    tables = [TableName(None, "a", "x_1"), TableName(None, "a", "X.1"), TableName(None, "b", "y_2")]
+
+    assert _filter_result(tables, exclude=["b"]) == tables[:2]
+    assert _filter_result(tables, include=["b"]) == tables[2:]
+    assert _filter_result(tables, like="x_1") == tables[:1]
+    assert _filter_result(tables, like="%_2") == tables[2:]
+    assert _filter_result(tables, regex="[xy]_") == [tables[0], tables[2]]
+
+
+@pytest.mark.parametrize("dialect_name, type_str, expected", [
+    ("postgresql", "timestamp(3) without time zone", "TIMESTAMP(3) WITHOUT TIME ZONE"),
+    ("postgresql", "timestamp with time zone", "TIMESTAMP WITH TIME ZONE"),
+    ("postgresql", "integer[]", "INTEGER[]"),
+    ("postgresql", "character varying(100)", "VARCHAR(100)"),
+    ("postgresql", "double precision", "DOUBLE PRECISION"),
+    ("mysql", "datetime(6)", "DATETIME(6)"),
+    ("mysql", "int unsigned", "INTEGER UNSIGNED"),
+    ("mysql", "decimal(10,2) unsigned", "DECIMAL(10, 2) UNSIGNED"),
+    ("mysql", "enum('a','b')", "ENUM('a','b')"),
+])
+def test_resolve_type(dialect_name, type_str, expected):
+    from sqlalchemy.dialects import registry
+    from dbcooper.inspect import resolve_type
+
+    dialect = registry.load(dialect_name)()
+    assert resolve_type(dialect, type_str).compile(dialect=dialect) == expected
+
+
+def test_resolve_type_unknown():
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.types import NullType
+    from dbcooper.inspect import resolve_type
+
+    assert isinstance(resolve_type(postgresql.dialect(), "some_custom_type"), NullType)
+    assert isinstance(resolve_type(postgresql.dialect(), "some_custom_type[]"), NullType)
+
+
+def _compile_sample(dialect, **kwargs):
+    from sqlalchemy import sql
+    from dbcooper.inspect import sample_table
+
+    table = sql.table("some_table", sql.column("x"), schema="some_schema")
+    expr = sample_table(dialect, table, **kwargs).select()
+
+    compiled = expr.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+    return " ".join(str(compiled).split())
+
+
+def test_sample_table_pushes_down_sampling():
+    from sqlalchemy.dialects import postgresql, mysql
+
+    pg = postgresql.dialect()
+    duckdb = create_engine("duckdb://").dialect
+
+    assert "TABLESAMPLE system(10.0) REPEATABLE (1)" in _compile_sample(pg, fraction=0.1, seed=1)
+    assert "ORDER BY random() LIMIT" in _compile_sample(pg, n=5)
+
+    assert "USING SAMPLE 10.0 PERCENT (system, 1)" in _compile_sample(duckdb, fraction=0.1, seed=1)
+    assert "USING SAMPLE reservoir(5 ROWS)" in _compile_sample(duckdb, n=5)
+    assert "PERCENT (system) LIMIT 5" in _compile_sample(duckdb, fraction=0.1, n=5)
+
+    assert "WHERE rand(1) < 0.1" in _compile_sample(mysql.dialect(), fraction=0.1, seed=1)
+
+
+def test_sample_table_bad_arguments():
+    from sqlalchemy.dialects import sqlite
+
+    with pytest.raises(ValueError, match="fraction or n"):
+        _compile_sample(sqlite.dialect())
+
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        _compile_sample(sqlite.dialect(), fraction=10)
+
+    with pytest.raises(NotImplementedError, match="seed"):
+        _compile_sample(sqlite.dialect(), n=5, seed=1)
+
+
+@pytest.fixture
+def duckdb_engine(tmp_path):
+    engine = create_engine(f"duckdb:///{tmp_path / 'stats.duckdb'}")
+    with engine.begin() as con:
+        con.exec_driver_sql("CREATE SCHEMA other")
+        con.exec_driver_sql("CREATE TABLE main.large AS SELECT range AS id FROM range(10000)")
+        con.exec_driver_sql("CREATE TABLE other.small (id INTEGER)")
+
+    yield engine
+
+    engine.dispose()
+
+
+def test_table_stats_duckdb(duckdb_engine):
+    from dbcooper.base import TableStats
+    from dbcooper.inspect import table_stats
+
+    with duckdb_engine.connect() as con:
+        assert table_stats(duckdb_engine.dialect, con, "other") == [TableStats("other", "small", 0)]
+        assert len(table_stats(duckdb_engine.dialect, con)) == 2
+
+
+def test_dbcooper_stats_for(duckdb_engine):
+    from dbcooper import DbCooper
+
+    statements = []
+    event.listen(duckdb_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    dbc = DbCooper(duckdb_engine)
+    statements.clear()
+
+    assert dbc.stats_for("large", "main").rows == 10000
+    assert dbc.stats_for("small", "main") is None
+    assert "~10,000 rows" in repr(dbc.stats_main_large)
+    assert "~0 rows" in repr(dbc.stats_other_small)
+
+    # statistics are fetched once per schema, without scanning tables
+    stat_queries = [stmt for stmt in statements if "estimated_size" in stmt]
+    assert len(stat_queries) == 2
+    assert not any("count(" in stmt.lower() for stmt in statements)
+
+
+def test_dbcooper_stats_for_unsupported():
+    from dbcooper import DbCooper
+
+    engine = create_engine("sqlite://")
+    engine.execute("CREATE TABLE some_table (x INTEGER)")
+
+    dbc = DbCooper(engine)
+    assert dbc.stats_for("some_table", "main") is None
+    assert repr(dbc.main_some_table).startswith("some_table\n(No table description.)\n\n")
+
+
+def test_documented_table_stats_without_reflector(duckdb_engine):
+    from dbcooper import DbcDocumentedTable
+
+    statements = []
+    event.listen(duckdb_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    tbl = DbcDocumentedTable(duckdb_engine, "large", "main")
+    assert "~10,000 rows" in repr(tbl)
+    assert "~10,000 rows" in repr(tbl)
+
+    # statistics are kept on the table after the first repr
+    assert len([stmt for stmt in statements if "estimated_size" in stmt]) == 1
+
+
+def test_documented_table_repr_skips_stats_errors(duckdb_engine, caplog):
+    from sqlalchemy.exc import OperationalError
+    from dbcooper import DbCooper
+
+    dbc = DbCooper(duckdb_engine)
+
+    def fail(*args):
+        raise OperationalError("SELECT ...", {}, Exception("permission denied"))
+
+    dbc._reflector.get_stats = fail
+
+    res = repr(dbc.stats_main_large)
+    assert res.startswith("large\n(No table description.)\n\n")
+    assert "Could not fetch statistics" in caplog.text
+
+
+def test_sample_n_uses_row_count(duckdb_engine):
+    from dbcooper import DbcSimpleTable
+    from dbcooper.base import TableStats
+
+    def to_sql(engine, expr):
+        compiled = expr.select().compile(engine, compile_kwargs={"literal_binds": True})
+        return " ".join(str(compiled).split())
+
+    # tables with fewer rows than SAMPLE_MIN_ROWS are read in full
+    large = DbcSimpleTable(duckdb_engine, "large", "main", to_frame=to_sql)
+    assert "reservoir(5 ROWS)" in large.sample(n=5)
+
+    # otherwise, enough blocks are sampled for about SAMPLE_MIN_ROWS rows
+    large._stats = (TableStats("main", "large", rows=10_000_000),)
+    assert "USING SAMPLE 1.0 PERCENT (system) LIMIT 5" in large.sample(n=5)
+    assert "USING SAMPLE 10.0 PERCENT (system) LIMIT 100000" in large.sample(n=100_000)
+
+
+def test_sample_n_warns_without_row_count():
+    from dbcooper import DbcSimpleTable
+
+    engine = create_engine("sqlite://")
+    engine.execute("CREATE TABLE some_table (x INTEGER)")
+
+    tbl = DbcSimpleTable(engine, "some_table", "main", to_frame=lambda engine, expr: expr)
+    with pytest.warns(UserWarning, match="reads the whole table"):
+        tbl.sample(n=5)
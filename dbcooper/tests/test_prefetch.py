@@ -0,0 +1,176 @@
+import threading
+
+import pytest
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import QueuePool
+
+from dbcooper import DbCooper, DbcSimpleTable, UsageTracker
+from dbcooper.prefetch import Prefetcher
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # prefetching happens in other threads, so an in-memory database won't do
+    engine = create_engine(f"sqlite:///{tmp_path / 'example.db'}")
+    engine.execute("CREATE TABLE a (x INTEGER)")
+    engine.execute("CREATE TABLE b (x INTEGER, y TEXT)")
+
+    yield engine
+
+    engine.dispose()
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    return UsageTracker(tmp_path / "usage.db")
+
+
+def test_usage_tracker_most_used(engine, tracker, tmp_path):
+    other_engine = create_engine("sqlite://")
+
+    tracker.record(engine, "a", "main")
+    tracker.record(engine, "b", "main")
+    tracker.record(engine, "b", "main")
+    tracker.record(other_engine, "d", "main")
+
+    assert tracker.most_used(engine, 2) == [("main", "b"), ("main", "a")]
+
+    # counts are kept across sessions
+    tracker.record(engine, "a", "main")
+    tracker.record(engine, "a", "main")
+    tracker.record(engine, "c")
+    tracker.flush()
+
+    new_tracker = UsageTracker(tmp_path / "usage.db")
+    assert new_tracker.most_used(engine) == [("main", "a"), ("main", "b"), (None, "c")]
+
+
+def test_prefetch_tables(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    dbc = DbCooper(engine, table_factory=DbcSimpleTable, prefetch=["main_b"])
+    assert dbc._prefetcher.wait(5)
+    assert dbc._prefetcher.warmed == [("main", "b")]
+    assert ("main", "b") in dbc._column_cache
+    assert ("main", "a") not in dbc._column_cache
+
+    # columns are already known, so fetching the table does not probe them
+    statements.clear()
+    dbc.main_b._create_table()
+    assert statements == []
+
+
+def test_prefetch_documented_tables_reflects_schema(engine):
+    dbc = DbCooper(engine)
+    prefetcher = dbc.prefetch(["main_a"])
+
+    assert prefetcher.wait(5)
+    assert "main" in dbc._reflector._loaded_schemas
+    assert prefetcher.errors == []
+
+
+def test_prefetch_most_used_tables(engine, tracker):
+    dbc = DbCooper(engine, table_factory=DbcSimpleTable, usage_tracker=tracker)
+    dbc.main_b()
+    dbc.main_b.head()
+    dbc.main_a()
+
+    # a new session prefetches the most used table
+    new_dbc = DbCooper(engine, table_factory=DbcSimpleTable, usage_tracker=tracker, prefetch=1)
+    assert new_dbc._prefetcher.wait(5)
+    assert new_dbc._prefetcher.warmed == [("main", "b")]
+
+
+def test_prefetch_requires_tracker_for_most_used(engine):
+    dbc = DbCooper(engine, table_factory=DbcSimpleTable)
+
+    with pytest.raises(ValueError, match="usage_tracker"):
+        dbc.prefetch(n=5)
+
+
+def test_prefetcher_cancel():
+    started, release = threading.Event(), threading.Event()
+
+    def warm(item):
+        started.set()
+        release.wait(5)
+
+    engine = create_engine("sqlite://")
+    prefetcher = Prefetcher(engine, warm, lambda: range(1, 100), workers=1).start()
+
+    assert started.wait(5)
+    prefetcher.cancel()
+    release.set()
+
+    assert prefetcher.wait(5)
+    assert prefetcher.warmed == [1]
+
+
+def test_prefetcher_waits_for_spare_connection(engine):
+    pool_engine = create_engine(engine.url, poolclass=QueuePool, pool_size=1, max_overflow=1)
+    warmed = []
+
+    with pool_engine.connect():
+        # the only pooled connection is in use, so prefetching waits
+        prefetcher = Prefetcher(pool_engine, warmed.append, lambda: [1], workers=1).start()
+        assert not prefetcher.wait(0.2)
+        assert warmed == []
+
+    assert prefetcher.wait(5)
+    assert warmed == [1]
+
+
+def test_prefetch_schema_dropped_after_invalidate(engine):
+    dbc = DbCooper(engine)
+    reflector = dbc._reflector
+    fetch = reflector._fetch_schema_columns
+
+    def fetch_then_invalidate(schema):
+        columns = fetch(schema)
+        # e.g. reset() removing tables while the schema was being fetched
+        reflector.invalidate(schema=schema)
+        return columns
+
+    reflector._fetch_schema_columns = fetch_then_invalidate
+    reflector.prefetch_schema("main")
+
+    assert "main" not in reflector._loaded_schemas
+    assert not reflector.metadata.tables
+
+
+def test_prefetch_skips_documented_tables_without_schema(engine):
+    dbc = DbCooper(engine)
+
+    assert dbc._prefetch_table((None, "a")) is False
+    assert not dbc._reflector.metadata.tables
+
+
+def test_reset_stops_prefetch(engine):
+    started, release = threading.Event(), threading.Event()
+
+    dbc = DbCooper(engine, table_factory=DbcSimpleTable, prefetch_workers=1)
+
+    def warm(item):
+        started.set()
+        release.wait(5)
+
+    dbc._prefetch_table = warm
+    prefetcher = dbc.prefetch(["main_a", "main_b"])
+    assert started.wait(5)
+
+    threading.Timer(0.1, release.set).start()
+    dbc.reset()
+
+    # reset waited for the item being warmed, and the rest were cancelled
+    assert prefetcher.done and prefetcher.cancelled
+    assert len(prefetcher.warmed) == 1
+    assert dbc._prefetcher is None
+
+
+def test_prefetcher_requires_a_worker():
+    engine = create_engine("sqlite://")
+
+    with pytest.raises(ValueError, match="at least 1"):
+        Prefetcher(engine, print, lambda: [1], workers=0)
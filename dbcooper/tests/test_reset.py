@@ -0,0 +1,144 @@
+import pytest
+
+from sqlalchemy import create_engine, event
+
+from dbcooper import DbCooper, AccessorHierarchyBuilder, DbcSimpleTable
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'main.db'}")
+
+    @event.listens_for(engine, "connect")
+    def attach(dbapi_con, con_record):
+        dbapi_con.execute(f"ATTACH DATABASE '{tmp_path / 'other.db'}' AS other")
+
+    engine.execute("CREATE TABLE a (x INTEGER)")
+    engine.execute("CREATE TABLE b (x INTEGER)")
+    engine.execute("CREATE TABLE other.c (x INTEGER)")
+
+    yield engine
+
+    engine.dispose()
+
+
+def test_reset_only_updates_changed_accessors(engine):
+    dbc = DbCooper(engine, table_factory=DbcSimpleTable)
+    a = dbc.main_a
+
+    engine.execute("DROP TABLE b")
+    engine.execute("CREATE TABLE d (x INTEGER)")
+    dbc.reset()
+
+    assert sorted(dbc._accessors) == ["main_a", "main_d", "other_c"]
+    assert dbc.main_a is a
+
+
+def test_reset_keeps_cached_columns_for_unchanged_tables(engine):
+    dbc = DbCooper(engine, table_factory=DbcSimpleTable)
+    dbc.main_a._create_table()
+    dbc.main_b._create_table()
+
+    engine.execute("DROP TABLE b")
+    dbc.reset()
+
+    assert ("main", "a") in dbc._column_cache
+    assert ("main", "b") not in dbc._column_cache
+
+
+def test_reset_invalidates_removed_tables_at_once(engine):
+    dbc = DbCooper(engine, table_factory=DbcSimpleTable)
+    for name in ["main_a", "main_b", "other_c"]:
+        dbc[name]._create_table()
+
+    calls = []
+    invalidate_tables = dbc._reflector.invalidate_tables
+
+    def record(tables):
+        calls.append(sorted(tables))
+        invalidate_tables(calls[-1])
+
+    dbc._reflector.invalidate_tables = record
+
+    engine.execute("DROP TABLE a")
+    engine.execute("DROP TABLE b")
+    dbc.reset()
+
+    assert calls == [[("a", "main"), ("b", "main")]]
+    assert ("main", "a") not in dbc._column_cache
+    assert ("main", "b") not in dbc._column_cache
+    assert ("other", "c") in dbc._column_cache
+
+
+def test_reset_hierarchy(engine):
+    dbc = DbCooper(engine, accessor_builder=AccessorHierarchyBuilder())
+    main_node, a = dbc.main, dbc.main.a
+
+    engine.execute("DROP TABLE other.c")
+    engine.execute("CREATE TABLE d (x INTEGER)")
+    dbc.reset()
+
+    assert list(dbc._accessors) == ["main"]
+    assert sorted(dbc.main) == ["a", "b", "d"]
+    assert dbc.main is main_node
+    assert dbc.main.a is a
+
+    engine.execute("CREATE TABLE other.e (x INTEGER)")
+    dbc.reset()
+
+    assert sorted(dbc.other) == ["e"]
+
+
+def test_reset_schemas(engine):
+    dbc = DbCooper(engine, table_factory=DbcSimpleTable)
+    dbc.main_a._create_table()
+    dbc.other_c._create_table()
+
+    engine.execute("CREATE TABLE d (x INTEGER)")
+    engine.execute("CREATE TABLE other.e (x INTEGER)")
+    dbc.reset(schemas=["other"])
+
+    assert sorted(dbc._accessors) == ["main_a", "main_b", "other_c", "other_e"]
+
+    # columns are cleared for tables in the schemas reset
+    assert ("main", "a") in dbc._column_cache
+    assert ("other", "c") not in dbc._column_cache
+
+
+def test_reset_schemas_only_lists_those_schemas(engine):
+    dbc = DbCooper(engine)
+
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        dbc.reset(schemas=["other"])
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    listings = [s for s in statements if "sqlite_master" in s]
+    assert listings and all('"main".sqlite_master' not in s for s in listings)
+    assert sorted(dbc._accessors) == ["main_a", "main_b", "other_c"]
+
+
+def test_reset_lazy(engine):
+    dbc = DbCooper(engine, lazy=True)
+    assert sorted(dbc._accessors) == ["main_a", "main_b", "other_c"]
+
+    engine.execute("CREATE TABLE d (x INTEGER)")
+    dbc.reset()
+
+    assert sorted(dbc._accessors) == ["main_a", "main_b", "main_d", "other_c"]
+
+
+def test_reset_updates_tables_with_column(engine):
+    dbc = DbCooper(engine)
+    assert sorted(dbc.tables_with_column("x")) == ["main_a", "main_b", "other_c"]
+
+    engine.execute("CREATE TABLE d (x INTEGER)")
+    dbc.reset()
+
+    assert sorted(dbc.tables_with_column("x")) == ["main_a", "main_b", "main_d", "other_c"]
@@ -0,0 +1,103 @@
+import pytest
+
+from sqlalchemy import create_engine
+
+from dbcooper import DbCooper, AccessorHierarchyBuilder
+from dbcooper.search import SearchIndex
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    index.add("salaries", "lahman_salaries")
+    index.add("salaries_history", "lahman_salaries_history")
+    index.add("batting", "lahman_batting")
+    index.add("batting", ["playerID", "salary"], field="column")
+
+    return index
+
+
+def _keys(results):
+    return [key for key, score in results]
+
+
+def test_search_index_exact_and_prefix(index):
+    assert _keys(index.search("salaries"))[:2] == ["salaries", "salaries_history"]
+    assert _keys(index.search("bat")) == ["batting"]
+    assert _keys(index.search("lahman sal")) == ["salaries", "salaries_history"]
+
+
+def test_search_index_similar_words(index):
+    assert set(_keys(index.search("salary"))) == {"batting", "salaries", "salaries_history"}
+    assert _keys(index.search("battin")) == ["batting"]
+    assert index.search("pitching") == []
+
+
+def test_search_index_names_outrank_columns(index):
+    index.add("payroll", "payroll_salary")
+
+    assert _keys(index.search("salary"))[:2] == ["payroll", "batting"]
+
+
+def test_search_index_remove(index):
+    index.remove("batting", "column")
+    assert "salary" not in index._postings
+
+    index.remove("salaries")
+    assert "salaries" not in index
+    assert _keys(index.search("salaries")) == ["salaries_history"]
+
+    index.remove("salaries_history")
+    assert "salaries" not in index._postings
+    assert "salaries" not in index._vocab
+
+
+def test_search_index_limit(index):
+    assert len(index.search("lahman", limit=2)) == 2
+    assert len(index.search("lahman", limit=None)) == 3
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    engine.execute("CREATE TABLE salaries (player_id TEXT, salary INTEGER)")
+    engine.execute("CREATE TABLE salaries_archive (player_id TEXT, salary INTEGER)")
+    engine.execute("CREATE TABLE batting (player_id TEXT, hits INTEGER)")
+
+    return engine
+
+
+def test_dbcooper_search(engine):
+    dbc = DbCooper(engine)
+
+    assert dbc.search("salary") == ["main_salaries", "main_salaries_archive"]
+    assert dbc.search("hits") == []
+    assert dbc.search("hits", columns=True) == ["main_batting"]
+
+
+def test_dbcooper_search_hierarchy(engine):
+    dbc = DbCooper(engine, accessor_builder=AccessorHierarchyBuilder())
+
+    assert dbc.search("batting") == ["main.batting"]
+
+
+def test_dbcooper_search_lazy(engine):
+    dbc = DbCooper(engine, lazy=True)
+
+    assert dbc.search("batting") == ["main_batting"]
+    assert not dbc._accessors.is_loaded
+
+
+def test_dbcooper_search_reset_updates_index(engine):
+    dbc = DbCooper(engine)
+    dbc.search("batting", columns=True)
+    index = dbc._search_index
+
+    engine.execute("DROP TABLE batting")
+    engine.execute("CREATE TABLE pitching (player_id TEXT, strikeouts INTEGER)")
+    dbc.reset()
+
+    assert dbc._search_index is index
+    assert dbc.search("batting") == []
+    assert dbc.search("pitching") == ["main_pitching"]
+    assert dbc.search("strikeouts", columns=True) == ["main_pitching"]
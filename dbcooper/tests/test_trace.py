@@ -0,0 +1,63 @@
+from sqlalchemy import create_engine
+
+from dbcooper import DbCooper, StatsTracer, Tracer
+from dbcooper.trace import get_tracer, set_tracer, span
+
+
+def _example_engine():
+    engine = create_engine("sqlite://")
+    engine.execute("CREATE TABLE some_table (x INTEGER, y TEXT)")
+    return engine
+
+
+def test_stats_tracer_summary():
+    engine = _example_engine()
+    dbc = DbCooper(engine, to_frame=lambda engine, expr: expr, tracer=StatsTracer())
+
+    dbc.main_some_table()
+    dbc.main_some_table()
+    repr(dbc.main_some_table)
+    dbc.query("SELECT x FROM some_table")
+
+    stats = dbc.stats()
+
+    assert stats["list_tables"]["count"] == 1
+    assert stats["list_tables"]["rows"] == 1
+    assert stats["create_accessors"]["count"] == 1
+    assert stats["reflect"]["count"] == 1
+    assert stats["describe_query"]["misses"] == 1
+    assert stats["collect"]["count"] == 3
+    assert stats["sql"]["count"] >= 3
+
+    # documented tables reflect, rather than probe, so the cache is only used by tbl()
+    dbc.tbl("some_table", "main")
+    dbc.tbl("some_table", "main")
+    assert dbc.stats()["probe"]["misses"] == 1
+    assert dbc.stats()["probe"]["hits"] == 1
+
+
+def test_tracer_callback_receives_sql():
+    engine = _example_engine()
+
+    spans = []
+    DbCooper(engine, tracer=Tracer(spans.append))
+
+    sql_spans = [s for s in spans if s.name == "sql"]
+    assert sql_spans
+    assert all(s.attrs["dialect"] == "sqlite" for s in sql_spans)
+    assert any("sqlite_master" in s.attrs["sql"] for s in sql_spans)
+
+
+def test_span_is_noop_without_tracer():
+    engine = _example_engine()
+
+    with span(engine, "probe") as attrs:
+        attrs["rows"] = 1
+
+    # each span gets its own attributes
+    with span(engine, "probe") as attrs:
+        assert attrs == {}
+
+    set_tracer(engine, Tracer())
+    set_tracer(engine, None)
+    assert get_tracer(engine) is None
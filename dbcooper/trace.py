@@ -0,0 +1,174 @@
+"""Timed spans for the work dbcooper does, like listing tables or probing columns.
+
+Tracers are registered per engine (DbCooper does this when passed a tracer), so
+that table accessors and collect functions can report spans without being passed
+a tracer. When no tracer is registered, span() returns a shared no-op context
+manager, and no sqlalchemy event listeners are installed.
+
+Spans have one of these names:
+
+* list_tables: listing tables in the catalog (or reading a cached listing).
+* identify_tables: turning listed table names into table identities.
+* create_accessors: creating table accessors from the listed tables.
+* probe: discovering the columns of a table, for name_to_tbl.
+* describe_query: discovering the columns of a query, for query_to_tbl.
+* reflect: reflecting the tables of a schema (or a single table).
+* list_columns: listing every column in the database, for tables_with_column.
+* table_stats: fetching approximate row counts and sizes for a schema's tables.
+* collect: fetching data with a to_frame function.
+* result_cache: looking up results in a ResultCache (and, when missing, fetching
+  and storing them).
+* sql: a statement executed through sqlalchemy.
+"""
+
+from __future__ import annotations
+
+import threading
+
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from time import perf_counter
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import event
+
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+
+@dataclass
+class Span:
+    name: str
+    duration: float
+    attrs: dict = field(default_factory=dict)
+
+
+class Tracer:
+    """Receive timed spans, by passing each to a callback function.
+
+    Subclasses may override on_span instead of using a callback.
+    """
+
+    def __init__(self, callback: "Callable[[Span], None] | None" = None):
+        self.callback = callback
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        # code inside the with block may add attributes (e.g. rows) to attrs
+        start = perf_counter()
+        try:
+            yield attrs
+        finally:
+            self.on_span(Span(name, perf_counter() - start, attrs))
+
+    def on_span(self, span: Span):
+        if self.callback is not None:
+            self.callback(span)
+
+
+class StatsTracer(Tracer):
+    """Keep recent spans, and summarize all spans by name.
+
+    Parameters
+    ----------
+    max_spans:
+        Number of most recent spans to keep in the spans attribute.
+    """
+
+    def __init__(self, max_spans: int = 1000):
+        super().__init__()
+        self.spans = deque(maxlen=max_spans)
+
+        self._summary = {}
+        self._lock = threading.Lock()
+
+    def on_span(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+            entry = self._summary.setdefault(
+                span.name,
+                {"count": 0, "total": 0.0, "max": 0.0, "rows": 0, "hits": 0, "misses": 0},
+            )
+            entry["count"] += 1
+            entry["total"] += span.duration
+            entry["max"] = max(entry["max"], span.duration)
+
+            rows = span.attrs.get("rows")
+            if rows is not None and rows > 0:
+                entry["rows"] += rows
+
+            cache = span.attrs.get("cache")
+            if cache == "hit":
+                entry["hits"] += 1
+            elif cache == "miss":
+                entry["misses"] += 1
+
+    def summary(self) -> dict:
+        """Return the count, total and max duration, rows, and cache hits per span name."""
+
+        with self._lock:
+            return {name: {**entry} for name, entry in self._summary.items()}
+
+    def reset(self):
+        with self._lock:
+            self.spans.clear()
+            self._summary.clear()
+
+
+# Registering tracers =========================================================
+
+_tracers: "WeakKeyDictionary[Engine, Tracer]" = WeakKeyDictionary()
+
+def set_tracer(engine: Engine, tracer: "Tracer | None"):
+    """Send spans for work done with engine to tracer (or stop, if tracer is None)."""
+
+    if tracer is None:
+        if _tracers.pop(engine, None) is not None:
+            event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+            event.remove(engine, "after_cursor_execute", _after_cursor_execute)
+
+        return
+
+    if engine not in _tracers:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    _tracers[engine] = tracer
+
+
+def get_tracer(engine: Engine) -> "Tracer | None":
+    if not _tracers:
+        return None
+
+    return _tracers.get(engine)
+
+
+def span(engine: Engine, name: str, **attrs):
+    """Return a context manager that times a span, if engine has a tracer."""
+
+    # without a tracer, code in the with block still gets a dict to add
+    # attributes to. This is a new one each time, so threads don't share it.
+    tracer = _tracers.get(engine) if _tracers else None
+    if tracer is None:
+        return nullcontext({})
+
+    return tracer.span(name, dialect=engine.dialect.name, **attrs)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._dbcooper_start = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    tracer = get_tracer(conn.engine)
+    start = getattr(context, "_dbcooper_start", None)
+
+    if tracer is None or start is None:
+        return
+
+    attrs = {"dialect": conn.dialect.name, "sql": statement, "rows": cursor.rowcount}
+    tracer.on_span(Span("sql", perf_counter() - start, attrs))